@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+
+'''Headless benchmark suite of the patchbay,
+a fake JACK graph is fed to a PatchbayManager through
+PatchEngineOuter callbacks, then main operations are timed.
+
+usage: python3 source/benchmarks [--clients N] [--ports M]
+                                 [--connections K] [--json FILE]'''
+
+import argparse
+from datetime import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import canvas_env
+
+from qtpy import API_NAME, QT_VERSION
+
+from patchbay import PatchbayManager
+from patchbay.patchcanvas import patchcanvas
+from patchbay.patchcanvas.init_values import canvas
+from patchbay.patchcanvas.scene.scene_anims import _MoveTime
+from patchbay.patchcanvas.theme import theme_cache
+
+from fake_graph import BenchEngineOuter, FakeGraph
+
+
+def _finish_animations():
+    '''make the boxes move animation reach its end now'''
+    if canvas.scene.move_boxes:
+        _MoveTime.started_at = _MoveTime.last_time = 0.0
+        canvas.scene.move_boxes_animation()
+    canvas_env.get_app().processEvents()
+
+
+class Bench:
+    def __init__(self, mng: PatchbayManager, graph: FakeGraph, repeat: int):
+        self.mng = mng
+        self.graph = graph
+        self.repeat = repeat
+        self.peo = BenchEngineOuter(mng)
+        self.timings = dict[str, list[float]]()
+
+        themes = [t.ref_id for t in patchcanvas.list_themes()]
+        self._themes = [canvas_env.DEFAULT_THEME] + [
+            t for t in themes if t != canvas_env.DEFAULT_THEME][:1]
+        self._theme_index = 0
+
+    def _measure(self, name: str, func: Callable[[], None],
+                 prepare: Callable[[], None] | None = None):
+        durations = self.timings[name] = list[float]()
+
+        for i in range(self.repeat):
+            if prepare is not None:
+                prepare()
+                _finish_animations()
+
+            start = time.perf_counter()
+            func()
+            _finish_animations()
+            durations.append(time.perf_counter() - start)
+
+    def initial_load(self):
+        self.graph.feed(self.peo)
+        self.mng.apply_delayed_changes_now()
+
+    def next_theme(self):
+        self._theme_index = (self._theme_index + 1) % len(self._themes)
+        self.mng.change_theme(self._themes[self._theme_index])
+
+    def filter_groups(self):
+        self.mng.filter_groups('system')
+        self.mng.filter_groups('')
+
+    def arrange(self):
+        self.mng.arrange_follow_signal()
+        self.mng.arrange_face_to_face()
+
+    def run(self):
+        self._measure('initial_load', self.initial_load,
+                      prepare=self.mng.clear_all)
+        self._measure('remove_and_add_all', self.mng.remove_and_add_all)
+        self._measure('redraw_all_groups', patchcanvas.redraw_all_groups)
+        self._measure('change_theme', self.next_theme)
+        self._measure('filter_groups', self.filter_groups)
+        self._measure('zoom_fit', self.mng.zoom_fit)
+        self._measure('arrange', self.arrange)
+        self._measure('repulse', patchcanvas.repulse_all_boxes)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='benchmarks', description=__doc__.partition('\n')[0])
+    parser.add_argument('-c', '--clients', type=int, default=40)
+    parser.add_argument('-p', '--ports', type=int, default=8,
+                        help='ports per client')
+    parser.add_argument('-k', '--connections', type=int, default=200)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-j', '--json', type=Path,
+                        help='write results to this JSON file')
+    args = parser.parse_args()
+
+    mng = canvas_env.init_manager()
+
+    graph = FakeGraph(args.clients, args.ports, args.connections,
+                      seed=args.seed)
+    bench = Bench(mng, graph, args.repeat)
+    bench.run()
+
+    results = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'qt_api': API_NAME,
+            'qt': QT_VERSION,
+            'clients': args.clients,
+            'ports_per_client': args.ports,
+            'ports': len(graph.ports),
+            'connections': len(graph.connections),
+            'groups': len(mng.groups),
+            'repeat': args.repeat,
+        },
+        'text_cache': {
+            'hits': theme_cache.stats.hits,
+            'misses': theme_cache.stats.misses,
+            'hit_rate': theme_cache.stats.hit_rate,
+            'evictions': theme_cache.stats.evictions,
+            'loaded_fonts': theme_cache.stats.loaded_fonts,
+        },
+        'timings': {
+            name: {'min': min(durations),
+                   'median': statistics.median(durations),
+                   'runs': durations}
+            for name, durations in bench.timings.items()}
+    }
+
+    print(f"{len(mng.groups)} groups, {len(graph.ports)} ports, "
+          f"{len(graph.connections)} connections")
+    for name, timing in results['timings'].items():
+        print(f"{name:<20} min {timing['min'] * 1000:9.2f} ms"
+              f"   median {timing['median'] * 1000:9.2f} ms")
+
+    print(f"text cache hit rate {theme_cache.stats.hit_rate:.1%}")
+
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+
+'''Replays synthetic ALSA sequencer event streams in AlsaManager,
+(MIDI hubs subscribing then unplugged), with connections stored
+in an indexed AlsaConnections and in a plain list (as before).'''
+
+import time
+
+import canvas_env
+
+from pyalsa.alsaseq import (
+    SEQ_PORT_CAP_READ,
+    SEQ_PORT_CAP_SUBS_READ,
+    SEQ_PORT_CAP_WRITE,
+    SEQ_PORT_CAP_SUBS_WRITE,
+    SEQ_PORT_TYPE_APPLICATION,
+    SEQ_EVENT_CLIENT_START,
+    SEQ_EVENT_CLIENT_EXIT,
+    SEQ_EVENT_PORT_START,
+    SEQ_EVENT_PORT_EXIT,
+    SEQ_EVENT_PORT_SUBSCRIBED,
+    SEQ_EVENT_PORT_UNSUBSCRIBED,
+)
+
+from patch_engine import PatchEngineOuter
+import patch_engine.alsa_manager as alsa_manager
+from patch_engine.alsa_manager import AlsaConn, AlsaManager
+
+
+HUB_SIZES = (8, 16, 32, 64)
+'number of ports of each plugged MIDI hub'
+N_HUBS = 4
+SINKS = 16
+'number of ports of the program receiving all hub ports'
+
+_CAPS = (SEQ_PORT_CAP_READ | SEQ_PORT_CAP_SUBS_READ
+         | SEQ_PORT_CAP_WRITE | SEQ_PORT_CAP_SUBS_WRITE)
+
+
+class FakeSequencer:
+    def __init__(self, clientname=''):
+        self.client_id = 128
+
+    def create_simple_port(self, name, type, caps) -> int:
+        return 0
+
+    def connect_ports(self, *args):
+        ...
+
+    def get_port_info(self, port_id: int, client_id: int) -> dict:
+        return {'name': f'port {port_id}', 'capability': _CAPS,
+                'type': SEQ_PORT_TYPE_APPLICATION}
+
+    def get_client_info(self, client_id: int) -> dict:
+        return {'name': f'client {client_id}'}
+
+
+class FakeSeqEvent:
+    def __init__(self, type: int, data: dict):
+        self.type = type
+        self._data = data
+
+    def get_data(self) -> dict:
+        return self._data
+
+
+class FakePatchEngine:
+    def __init__(self):
+        self.peo = PatchEngineOuter()
+
+
+class ListAlsaConnections(list[AlsaConn]):
+    '''connections stored as AlsaManager stored them before'''
+    def append(self, conn: AlsaConn) -> bool:
+        super().append(conn)
+        return True
+
+    def remove(self, conn: AlsaConn) -> bool:
+        for i, c in enumerate(self):
+            if c == conn:
+                del self[i]
+                return True
+        return False
+
+    def remove_port(self, client_id: int, port_id: int) -> list[AlsaConn]:
+        conns = [c for c in self
+                 if (client_id, port_id) in (
+                     (c.source_client_id, c.source_port_id),
+                     (c.dest_client_id, c.dest_port_id))]
+        for conn in conns:
+            self.remove(conn)
+        return conns
+
+
+def port_event(type: int, client_id: int, port_id: int) -> FakeSeqEvent:
+    return FakeSeqEvent(type, {'addr.client': client_id,
+                               'addr.port': port_id})
+
+def sub_event(type: int, src: tuple[int, int],
+              dest: tuple[int, int]) -> FakeSeqEvent:
+    return FakeSeqEvent(type, {
+        'connect.sender.client': src[0], 'connect.sender.port': src[1],
+        'connect.dest.client': dest[0], 'connect.dest.port': dest[1]})
+
+def event_stream(hub_size: int) -> list[FakeSeqEvent]:
+    '''hubs are plugged, all their ports are connected to all sink ports,
+    some connections are toggled, then hubs are unplugged.'''
+    sink = 129
+    hubs = [130 + i for i in range(N_HUBS)]
+    events = [FakeSeqEvent(SEQ_EVENT_CLIENT_START, {'addr.client': sink})]
+    events += [port_event(SEQ_EVENT_PORT_START, sink, p)
+               for p in range(SINKS)]
+
+    for hub in hubs:
+        events.append(
+            FakeSeqEvent(SEQ_EVENT_CLIENT_START, {'addr.client': hub}))
+        for p in range(hub_size):
+            events.append(port_event(SEQ_EVENT_PORT_START, hub, p))
+            for s in range(SINKS):
+                events.append(
+                    sub_event(SEQ_EVENT_PORT_SUBSCRIBED, (hub, p), (sink, s)))
+
+    for hub in hubs:
+        for p in range(hub_size):
+            for type in (SEQ_EVENT_PORT_UNSUBSCRIBED,
+                         SEQ_EVENT_PORT_SUBSCRIBED):
+                events.append(sub_event(type, (hub, p), (sink, p % SINKS)))
+
+    for hub in hubs:
+        events += [port_event(SEQ_EVENT_PORT_EXIT, hub, p)
+                   for p in range(hub_size)]
+        events.append(
+            FakeSeqEvent(SEQ_EVENT_CLIENT_EXIT, {'addr.client': hub}))
+
+    return events
+
+def replay(events: list[FakeSeqEvent], indexed: bool) -> tuple[float, int]:
+    alsa_mng = AlsaManager(FakePatchEngine()) # type:ignore
+    if not indexed:
+        alsa_mng._connections = ListAlsaConnections() # type:ignore
+
+    start = time.perf_counter()
+    for event in events:
+        alsa_mng._process_event(event) # type:ignore
+    duration = time.perf_counter() - start
+
+    return duration, len(alsa_mng._connections)
+
+def main():
+    alsa_manager.Sequencer = FakeSequencer # type:ignore
+
+    for hub_size in HUB_SIZES:
+        events = event_stream(hub_size)
+        print(f'{N_HUBS} hubs of {hub_size:3} ports, '
+              f'{len(events):6} events')
+        for label, indexed in (('list', False), ('indexed', True)):
+            duration, remaining = replay(events, indexed)
+            assert remaining == 0
+            print(f'  {label:<8} {duration * 1000:9.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
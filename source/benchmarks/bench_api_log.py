@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+
+'''Measures the per call overhead of the patchbay_api decorator,
+with API logs disabled and enabled.'''
+
+import logging
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from patchbay.patchcanvas.api_log import (
+    patchbay_api, _logger as api_logger)
+
+
+N_CALLS = 200_000
+
+
+class _Item:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f'_Item({self.name})'
+
+
+def _raw(group_id: int, port_id: int, name: str, item: _Item, split=False):
+    return group_id
+
+
+_decorated = patchbay_api(_raw)
+
+
+def _legacy_wrapper(func):
+    '''the decorator as it was, stringifying arguments at each call'''
+    def wrapper(*args, **kwargs):
+        args_strs = [str(arg) for arg in args]
+        args_strs += [f"{k}={v}" for k, v in kwargs.items()]
+        func_args = f"{func.__name__}({', '.join(args_strs)})"
+        api_logger.debug(func_args)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+_legacy = _legacy_wrapper(_raw)
+
+
+def _per_call_ns(func) -> float:
+    item = _Item('system:playback_1')
+    timer = timeit.Timer(
+        lambda: func(12, 45, 'playback_1', item, split=True))
+    return min(timer.repeat(repeat=5, number=N_CALLS)) / N_CALLS * 1e9
+
+
+def main():
+    logging.basicConfig(stream=sys.stdout)
+    results = dict[str, float]()
+
+    api_logger.setLevel(logging.INFO)
+    results['undecorated'] = _per_call_ns(_raw)
+    results['legacy, logs disabled'] = _per_call_ns(_legacy)
+    results['patchbay_api, logs disabled'] = _per_call_ns(_decorated)
+
+    # enabled, but with a handler writing nowhere
+    api_logger.setLevel(logging.DEBUG)
+    api_logger.propagate = False
+    api_logger.addHandler(logging.NullHandler())
+    results['legacy, logs enabled'] = _per_call_ns(_legacy)
+    results['patchbay_api, logs enabled'] = _per_call_ns(_decorated)
+
+    for key, value in results.items():
+        print(f'{key:<30} {value:8.1f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
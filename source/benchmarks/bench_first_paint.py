@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+
+'''Measures the time from the start of a bulk load (boxes creation)
+to the first paint of the view, with all boxes drawn
+and with options.lazy_boxes (boxes out of the view drawn later).
+Boxes are randomly placed with a constant density.'''
+
+import math
+import random
+import time
+
+import canvas_env
+
+from patshared import (
+    BoxType, GroupPos, PortMode, PortType, PortSubType)
+from patchbay.patchcanvas import patchcanvas
+from patchbay.patchcanvas.init_values import canvas, options
+
+
+BOX_COUNTS = (100, 250, 500, 1000)
+PORTS_PER_BOX = 8
+
+
+def _add_boxes(n_boxes: int):
+    rand = random.Random(n_boxes)
+    side = int(math.sqrt(n_boxes) * 300)
+
+    for group_id in range(n_boxes):
+        gpos = GroupPos()
+        gpos.boxes[PortMode.BOTH].pos = (
+            rand.randrange(side), rand.randrange(side))
+        patchcanvas.add_group(
+            group_id, f'client_{group_id}', False,
+            BoxType.APPLICATION, 'application-x-executable', gpos)
+
+        for port_id in range(PORTS_PER_BOX):
+            port_mode = PortMode.OUTPUT if port_id % 2 else PortMode.INPUT
+            patchcanvas.add_port(
+                group_id, port_id, f'port_{port_id}', port_mode,
+                PortType.AUDIO_JACK, PortSubType.REGULAR)
+
+def first_paint_time(view, n_boxes: int,
+                     lazy: bool) -> tuple[float, float, int]:
+    options.lazy_boxes = lazy
+    patchcanvas.clear_all()
+    view.centerOn(0.0, 0.0)
+
+    start = time.perf_counter()
+    patchcanvas.set_loading_items(True)
+    _add_boxes(n_boxes)
+    patchcanvas.set_loading_items(
+        False, auto_redraw=True, prevent_overlap=False)
+    view.grab()
+    duration = time.perf_counter() - start
+    placeholders = len(canvas.placeholder_boxes)
+
+    # then the user shows the whole scene
+    start = time.perf_counter()
+    patchcanvas.zoom_fit()
+    # placeholders entering the view are drawn from the event loop
+    canvas_env.get_app().processEvents()
+    view.grab()
+    fit_duration = time.perf_counter() - start
+
+    return duration, fit_duration, placeholders
+
+def main():
+    view = canvas_env.init_canvas()
+    view.show()
+
+    for n_boxes in BOX_COUNTS:
+        print(f'{n_boxes:>5} boxes')
+        for label, lazy in (('all drawn', False), ('lazy', True)):
+            duration, fit_duration, placeholders = first_paint_time(
+                view, n_boxes, lazy)
+            print(f'  {label:<10} first paint {duration * 1000:9.1f} ms, '
+                  f'then zoom fit {fit_duration * 1000:9.1f} ms  '
+                  f'({placeholders} placeholders)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+
+'''Measures a bulk rewrite of JACK metadatas, as a session manager does
+when it sets pretty names and icons for all its clients at once.'''
+
+import time
+import timeit
+
+import canvas_env
+
+from patshared import JackMetadata
+
+from fake_graph import BenchEngineOuter, FakeGraph
+
+
+CLIENT_COUNTS = (50, 100, 200, 400)
+PORTS_PER_CLIENT = 4
+
+
+def rewrite_time(n_clients: int) -> tuple[float, float]:
+    '''returns the duration of metadata_update calls,
+    the duration including the batch application,
+    and durations of all groups lookups by scan and by index.'''
+    mng = canvas_env.init_manager()
+    peo = BenchEngineOuter(mng)
+    graph = FakeGraph(n_clients, PORTS_PER_CLIENT, 0)
+    graph.feed(peo)
+    mng.apply_delayed_changes_now()
+
+    start = time.perf_counter()
+    for client_name, uuid in graph.client_uuids.items():
+        peo.metadata_updated(
+            uuid, JackMetadata.PRETTY_NAME, f'Pretty {client_name}')
+        peo.metadata_updated(
+            uuid, JackMetadata.ICON_NAME, 'audio-card')
+    updates_end = time.perf_counter()
+    mng.apply_delayed_changes_now()
+    end = time.perf_counter()
+
+    uuids = list(graph.client_uuids.values())
+    scan = timeit.timeit(
+        lambda: [next((g for g in mng.groups if g.uuid == uuid), None)
+                 for uuid in uuids], number=5) / 5
+    index = timeit.timeit(
+        lambda: [mng.get_group_from_uuid(uuid) for uuid in uuids],
+        number=5) / 5
+
+    mng.clear_all()
+    return updates_end - start, end - start, scan, index
+
+def main():
+    for n_clients in CLIENT_COUNTS:
+        updates, total, scan, index = rewrite_time(n_clients)
+        print(f'{n_clients:5} clients, {n_clients * 2:5} metadatas: '
+              f'calls {updates * 1000:8.2f} ms, '
+              f'with batch {total * 1000:8.2f} ms, '
+              f'lookups scan {scan * 1000:7.3f} ms '
+              f'index {index * 1000:7.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
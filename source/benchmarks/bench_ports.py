@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+
+'''Measures memory per object and attribute access time
+of PortData and Port, for many JACK and ALSA ports.'''
+
+import timeit
+import tracemalloc
+
+import canvas_env
+
+from patshared import (
+    CustomNames, JackMetadata, JackMetadatas, Naming, PortType)
+from patch_engine.port_data import PortData
+from patchbay.bases.port import Port
+from patchbay.bases.elements import JackPortFlag
+
+
+N_PORTS = 10_000
+N_ACCESS = 200_000
+
+
+class _DictPortData:
+    'PortData as it was, without __slots__'
+    def __init__(self, name: str, type: PortType, flags: int, uuid: int):
+        self.name = name
+        self.type = type
+        self.flags = flags
+        self.uuid = uuid
+
+
+class _FakeManager:
+    def __init__(self):
+        self.naming = Naming.ALL
+        self.jack_metadatas = JackMetadatas()
+        self.custom_names = CustomNames()
+
+
+def _port_args(i: int) -> tuple[str, PortType, int, int]:
+    if i % 4 == 3:
+        return (f':ALSA_OUT:{i % 64 + 20}:{i % 4}:Device {i % 64}:port {i}',
+                PortType.MIDI_ALSA, JackPortFlag.IS_OUTPUT, 0)
+    if i % 4 == 2:
+        return (f'a2j:Device {i % 64} [{i % 64 + 20}] (capture): '
+                f'Device {i % 64} Port-{i}',
+                PortType.MIDI_JACK, JackPortFlag.IS_OUTPUT, 0x1000 + i)
+    return (f'client_{i % 100}:playback_{i}',
+            PortType.AUDIO_JACK, JackPortFlag.IS_INPUT, 0x1000 + i)
+
+def _bytes_per_object(factory) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(N_PORTS)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+    return total / N_PORTS
+
+def _ns_per_access(stmt, port: Port) -> float:
+    timer = timeit.Timer(lambda: stmt(port))
+    return min(timer.repeat(repeat=5, number=N_ACCESS)) / N_ACCESS * 1e9
+
+def main():
+    mng = _FakeManager()
+    for i in range(N_PORTS):
+        args = _port_args(i)
+        if args[3]:
+            mng.jack_metadatas.add(
+                args[3], JackMetadata.PRETTY_NAME, f'Pretty {i}')
+
+    # names are built before measuring, they are not part of the objects
+    all_args = [_port_args(i) for i in range(N_PORTS)]
+
+    print(f'memory, {N_PORTS} objects')
+    for label, factory in (
+            ('PortData, dict', lambda i: _DictPortData(*all_args[i])),
+            ('PortData, slots', lambda i: PortData(*all_args[i])),
+            ('Port', lambda i: Port(mng, i, *all_args[i]))):
+        print(f'  {label:<28} {_bytes_per_object(factory):8.1f} bytes/object')
+
+    print('attribute access')
+    for i in (0, 2, 3):
+        port = Port(mng, i, *all_args[i])
+        print(f'  {port.full_name}')
+        for label, stmt in (
+                ('short_name (parsing)', lambda p: p._get_short_name()),
+                ('short_name', lambda p: p.short_name),
+                ('full_name_id_free', lambda p: p.full_name_id_free),
+                ('mdata_pretty_name', lambda p: p.mdata_pretty_name),
+                ('mode', lambda p: p.mode),
+                ('cnv_name', lambda p: p.cnv_name)):
+            print(f'    {label:<26} {_ns_per_access(stmt, port):8.1f} ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+
+'''Compares file I/O of a bulk rename of pretty-names,
+saved after each rename, between the whole JSON file rewrite
+(as PatchEngine did before) and the UuidPrettyNames journal.'''
+
+import json
+from pathlib import Path
+import tempfile
+import time
+
+import canvas_env
+
+from patch_engine.pretty_names_store import UuidPrettyNames
+
+
+RENAME_COUNTS = (100, 1000, 5000)
+EXISTING = 2000
+'number of pretty-names already saved before the renames'
+
+
+def whole_rewrite(path: Path, n_renames: int) -> tuple[float, int, str]:
+    pretty_names = {i: f'Existing {i}' for i in range(EXISTING)}
+    written = 0
+
+    start = time.perf_counter()
+    for i in range(n_renames):
+        pretty_names[i % EXISTING] = f'Renamed {i}'
+        contents = json.dumps(pretty_names)
+        with open(path, 'w') as f:
+            f.write(contents)
+        written += len(contents)
+
+    return time.perf_counter() - start, written, ''
+
+def journal(path: Path, n_renames: int) -> tuple[float, int, str]:
+    pretty_names = UuidPrettyNames(path)
+    for i in range(EXISTING):
+        pretty_names[i] = f'Existing {i}'
+    pretty_names.save()
+    pretty_names.written_bytes = 0
+
+    start = time.perf_counter()
+    for i in range(n_renames):
+        pretty_names[i % EXISTING] = f'Renamed {i}'
+        pretty_names.save()
+    duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reloaded = UuidPrettyNames(path)
+    reloaded.load()
+    load_duration = time.perf_counter() - start
+    assert reloaded == pretty_names
+
+    return (duration, pretty_names.written_bytes,
+            f'{pretty_names.compactions - 1} compactions, '
+            f'load {load_duration * 1000:.2f} ms')
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_renames in RENAME_COUNTS:
+            print(f'{n_renames:6} renames, {EXISTING} existing pretty-names')
+            for label, func in (('whole rewrite', whole_rewrite),
+                                ('journal', journal)):
+                path = Path(tmp_dir) / f'{label}_{n_renames}.json'
+                duration, written, info = func(path, n_renames)
+                print(f'  {label:<14} {duration * 1000:9.2f} ms, '
+                      f'{written / 1024:10.1f} KiB written  {info}')
+
+
+if __name__ == '__main__':
+    main()
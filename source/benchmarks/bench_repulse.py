@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+
+'''Measures full_repulse time versus the number of boxes,
+boxes being randomly placed with a constant density.'''
+
+import math
+import random
+import time
+
+import canvas_env
+
+from patshared import (
+    BoxType, GroupPos, PortMode, PortType, PortSubType)
+from patchbay.patchcanvas import patchcanvas
+from patchbay.patchcanvas.init_values import canvas, options
+
+
+BOX_COUNTS = (25, 50, 100, 200, 400, 800)
+PORTS_PER_BOX = 4
+
+
+def _add_boxes(n_boxes: int):
+    rand = random.Random(n_boxes)
+    side = int(math.sqrt(n_boxes) * 200)
+
+    patchcanvas.set_loading_items(True)
+
+    for group_id in range(n_boxes):
+        gpos = GroupPos()
+        gpos.boxes[PortMode.BOTH].pos = (
+            rand.randrange(side), rand.randrange(side))
+        patchcanvas.add_group(
+            group_id, f'client_{group_id}', False,
+            BoxType.APPLICATION, 'application-x-executable', gpos)
+
+        for port_id in range(PORTS_PER_BOX):
+            port_mode = PortMode.OUTPUT if port_id % 2 else PortMode.INPUT
+            patchcanvas.add_port(
+                group_id, port_id, f'port_{port_id}', port_mode,
+                PortType.AUDIO_JACK, PortSubType.REGULAR)
+
+    patchcanvas.set_loading_items(False)
+    patchcanvas.redraw_all_groups(force_no_prevent_overlap=True)
+
+def repulse_time(n_boxes: int) -> float:
+    patchcanvas.clear_all()
+    _add_boxes(n_boxes)
+
+    start = time.perf_counter()
+    canvas.scene.full_repulse()
+    duration = time.perf_counter() - start
+
+    canvas.scene.move_boxes.clear()
+    return duration
+
+def main():
+    canvas_env.init_canvas()
+    options.prevent_overlap = True
+
+    for n_boxes in BOX_COUNTS:
+        print(f'{n_boxes:>5} boxes: '
+              f'{repulse_time(n_boxes) * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+
+'''Measures Group.sort_ports_in_canvas on an Ardour like group
+of increasing size, with connections to the other groups.
+Time per port should stay about the same whatever the group size.'''
+
+import time
+
+import canvas_env
+
+from fake_graph import BenchEngineOuter, FakeGraph
+
+
+PORT_COUNTS = (50, 100, 200, 400, 800)
+REPEAT = 5
+
+
+def sort_time(n_ports: int) -> float:
+    mng = canvas_env.init_manager()
+    peo = BenchEngineOuter(mng)
+
+    # clients are system, a2j device and Ardour session
+    graph = FakeGraph(3, n_ports, n_ports, seed=n_ports)
+    graph.feed(peo)
+    mng.apply_delayed_changes_now()
+
+    group = next(g for g in mng.groups if g.name.startswith('ardour-'))
+
+    durations = list[float]()
+    for i in range(REPEAT):
+        start = time.perf_counter()
+        group.sort_ports_in_canvas()
+        durations.append(time.perf_counter() - start)
+
+    mng.clear_all()
+    return min(durations)
+
+def main():
+    for n_ports in PORT_COUNTS:
+        duration = sort_time(n_ports)
+        print(f'{n_ports:5} ports: {duration * 1000:8.2f} ms, '
+              f'{duration / n_ports * 1e6:7.1f} µs/port')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+'''Headless patchcanvas environment for benchmarks.
+Import this module before any other Qt import.'''
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from qtpy.QtCore import QSettings
+from qtpy.QtWidgets import QApplication
+
+from patchbay import PatchbayManager
+from patchbay.patchcanvas import patchcanvas
+from patchbay.patchcanvas.proto_callbacker import ProtoCallbacker
+from patchbay.patchcanvas.scene_view import PatchGraphicsView
+
+
+THEMES_PATH = Path(__file__).parents[2] / 'themes'
+DEFAULT_THEME = 'Black Gold'
+
+
+def get_app() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app # type:ignore
+
+def init_canvas() -> PatchGraphicsView:
+    '''init the patchcanvas with a not shown view
+    and a callbacker doing nothing.'''
+    get_app()
+    view = PatchGraphicsView(None)
+    view.resize(1600, 900)
+    patchcanvas.init(
+        view, ProtoCallbacker(), (THEMES_PATH,), DEFAULT_THEME)
+    return view
+
+def init_manager() -> PatchbayManager:
+    '''init a PatchbayManager with a not shown view
+    and settings in a temporary directory.'''
+    get_app()
+    settings_dir = tempfile.mkdtemp(prefix='patchbay_bench_')
+    settings = QSettings(str(Path(settings_dir) / 'bench.conf'),
+                         QSettings.Format.IniFormat)
+
+    view = PatchGraphicsView(None)
+    view.resize(1600, 900)
+    mng = PatchbayManager(settings)
+    mng.app_init(view, (THEMES_PATH,), default_theme_name=DEFAULT_THEME)
+    return mng
@@ -0,0 +1,220 @@
+'''Synthetic JACK graph generator, feeding a PatchEngineOuter
+the same way PatchEngine does at startup.'''
+
+from dataclasses import dataclass
+import random
+from typing import TYPE_CHECKING
+
+from patshared import PortType
+from patch_engine import PatchEngineOuter
+
+if TYPE_CHECKING:
+    from patchbay import PatchbayManager
+
+
+IS_INPUT = 0x01
+IS_OUTPUT = 0x02
+IS_PHYSICAL = 0x04
+IS_TERMINAL = 0x10
+
+_PW_APPS = ('Firefox', 'Chromium', 'mpv', 'VLC media player',
+            'Zoom', 'Discord', 'speech-dispatcher')
+_PW_DEVICES = ('Built-in Audio Analog Stereo', 'USB Audio Pro',
+               'HDMI Audio Digital Stereo', 'Scarlett 18i20 Multichannel')
+_A2J_DEVICES = ('Midi Through', 'Arturia KeyStep 37', 'nanoKONTROL2',
+                'Launchpad Mini', 'MPK mini 3')
+_SURROUND = ('FL', 'FR', 'FC', 'LFE', 'RL', 'RR', 'SL', 'SR')
+
+
+class BenchEngineOuter(PatchEngineOuter):
+    '''Forwards graph callbacks to the manager,
+    as host applications do.'''
+    def __init__(self, mng: 'PatchbayManager'):
+        self.mng = mng
+
+    def associate_client_name_and_uuid(self, client_name: str, uuid: int):
+        self.mng.set_group_uuid_from_name(client_name, uuid)
+
+    def port_added(self, pname: str, ptype: PortType, pflags: int, puuid: int):
+        self.mng.add_port(pname, ptype, pflags, puuid)
+
+    def port_renamed(self, ex_name: str, new_name: str, uuid=0):
+        self.mng.rename_port(ex_name, new_name, uuid)
+
+    def port_removed(self, port_name: str):
+        self.mng.remove_port(port_name)
+
+    def metadata_updated(self, uuid: int, key: str, value: str):
+        self.mng.metadata_update(uuid, key, value)
+
+    def connection_added(self, connection: tuple[str, str]):
+        self.mng.add_connection(*connection)
+
+    def connection_removed(self, connection: tuple[str, str]):
+        self.mng.remove_connection(*connection)
+
+
+@dataclass
+class FakePort:
+    name: str
+    type: PortType
+    flags: int
+    uuid: int
+
+    @property
+    def is_output(self) -> bool:
+        return bool(self.flags & IS_OUTPUT)
+
+    @property
+    def client_name(self) -> str:
+        return self.name.partition(':')[0]
+
+
+class FakeGraph:
+    '''A JACK graph with n_clients clients (groups in the patchbay),
+    ports_per_client ports for each client and n_connections
+    connections between them.
+
+    Clients are, in turn, system hardware, a2j devices,
+    Ardour sessions and PipeWire nodes (devices and applications).'''
+    def __init__(self, n_clients: int, ports_per_client: int,
+                 n_connections: int, seed=0):
+        self._rand = random.Random(seed)
+        self._next_uuid = 0x100
+        self.client_uuids = dict[str, int]()
+        self.ports = list[FakePort]()
+        self.connections = list[tuple[str, str]]()
+
+        for i in range(n_clients):
+            self._add_client(i, ports_per_client)
+
+        self._add_connections(n_connections)
+
+    def _new_uuid(self) -> int:
+        self._next_uuid += 1
+        return self._next_uuid
+
+    def _add_port(self, name: str, port_type: PortType, flags: int):
+        client_name = name.partition(':')[0]
+        if client_name not in self.client_uuids:
+            self.client_uuids[client_name] = self._new_uuid()
+
+        self.ports.append(
+            FakePort(name, port_type, flags, self._new_uuid()))
+
+    def _add_client(self, index: int, n_ports: int):
+        n_outs = n_ports // 2
+        n_ins = n_ports - n_outs
+
+        if index == 0:
+            hw = IS_PHYSICAL | IS_TERMINAL
+            for i in range(n_outs):
+                self._add_port(f'system:capture_{i + 1}',
+                               PortType.AUDIO_JACK, IS_OUTPUT | hw)
+            for i in range(n_ins):
+                self._add_port(f'system:playback_{i + 1}',
+                               PortType.AUDIO_JACK, IS_INPUT | hw)
+            return
+
+        match index % 4:
+            case 1:
+                # a2j, all devices are ports of the same 'a2j' client,
+                # but each device is a group in the patchbay.
+                device = (f'{_A2J_DEVICES[index % len(_A2J_DEVICES)]}'
+                          f' {index}')
+                flags = IS_PHYSICAL | IS_TERMINAL
+                for i in range(n_outs):
+                    self._add_port(
+                        f'a2j:{device} [{index + 15}] (capture): '
+                        f'{device} Port-{i}',
+                        PortType.MIDI_JACK, IS_OUTPUT | flags)
+                for i in range(n_ins):
+                    self._add_port(
+                        f'a2j:{device} [{index + 15}] (playback): '
+                        f'{device} Port-{i}',
+                        PortType.MIDI_JACK, IS_INPUT | flags)
+
+            case 2:
+                # Ardour session, stereo tracks
+                client_name = f'ardour-{index:03}'
+                for i in range(n_outs):
+                    self._add_port(
+                        f'{client_name}:Audio {i // 2 + 1}'
+                        f'/audio_out {i % 2 + 1}',
+                        PortType.AUDIO_JACK, IS_OUTPUT)
+                for i in range(n_ins):
+                    self._add_port(
+                        f'{client_name}:Audio {i // 2 + 1}'
+                        f'/audio_in {i % 2 + 1}',
+                        PortType.AUDIO_JACK, IS_INPUT)
+
+            case 3:
+                # PipeWire device node
+                client_name = (f'{_PW_DEVICES[index % len(_PW_DEVICES)]}'
+                               f' {index}')
+                flags = IS_PHYSICAL | IS_TERMINAL
+                for i in range(n_outs):
+                    self._add_port(
+                        f'{client_name}:capture_{self._channel(i)}',
+                        PortType.AUDIO_JACK, IS_OUTPUT | flags)
+                for i in range(n_ins):
+                    self._add_port(
+                        f'{client_name}:playback_{self._channel(i)}',
+                        PortType.AUDIO_JACK, IS_INPUT | flags)
+
+            case _:
+                # PipeWire application node
+                client_name = f'{_PW_APPS[index % len(_PW_APPS)]} {index}'
+                for i in range(n_outs):
+                    self._add_port(
+                        f'{client_name}:output_{self._channel(i)}',
+                        PortType.AUDIO_JACK, IS_OUTPUT)
+                for i in range(n_ins):
+                    self._add_port(
+                        f'{client_name}:input_{self._channel(i)}',
+                        PortType.AUDIO_JACK, IS_INPUT)
+
+    @staticmethod
+    def _channel(i: int) -> str:
+        if i < len(_SURROUND):
+            return _SURROUND[i]
+        return f'AUX{i - len(_SURROUND)}'
+
+    def _add_connections(self, n_connections: int):
+        outs = dict[PortType, list[FakePort]]()
+        ins = dict[PortType, list[FakePort]]()
+
+        for port in self.ports:
+            side = outs if port.is_output else ins
+            side.setdefault(port.type, []).append(port)
+
+        port_types = [pt for pt in outs if pt in ins]
+        if not port_types:
+            return
+
+        conns = dict[tuple[str, str], None]()
+        attempts = 0
+
+        while len(conns) < n_connections and attempts < n_connections * 10:
+            attempts += 1
+            port_type = self._rand.choice(port_types)
+            port_out = self._rand.choice(outs[port_type])
+            port_in = self._rand.choice(ins[port_type])
+            if port_out.client_name == port_in.client_name:
+                continue
+            conns[(port_out.name, port_in.name)] = None
+
+        self.connections = list(conns)
+
+    def feed(self, peo: PatchEngineOuter):
+        '''send all the graph to peo,
+        in the order PatchEngine collects a graph.'''
+        for client_name, uuid in self.client_uuids.items():
+            peo.jack_client_added(client_name)
+            peo.associate_client_name_and_uuid(client_name, uuid)
+
+        for port in self.ports:
+            peo.port_added(port.name, port.type, port.flags, port.uuid)
+
+        for conn in self.connections:
+            peo.connection_added(conn)
@@ -1,6 +1,7 @@
 
 from dataclasses import dataclass
 import logging
+import sys
 import time
 from typing import TYPE_CHECKING, Iterator, Optional
 from threading import Thread
@@ -18,6 +19,7 @@ from pyalsa.alsaseq import (
     SEQ_PORT_SYSTEM_ANNOUNCE,
     SEQ_EVENT_CLIENT_START,
     SEQ_EVENT_CLIENT_EXIT,
+    SEQ_EVENT_CLIENT_CHANGE,
     SEQ_EVENT_PORT_START,
     SEQ_EVENT_PORT_EXIT,
     SEQ_EVENT_PORT_SUBSCRIBED,
@@ -44,6 +46,75 @@ PORT_IS_PHYSICAL = 0x4
 _PORT_READS = SEQ_PORT_CAP_READ | SEQ_PORT_CAP_SUBS_READ
 _PORT_WRITES = SEQ_PORT_CAP_WRITE | SEQ_PORT_CAP_SUBS_WRITE
 
+EVENTS_BATCH = 64
+'max number of sequencer events read at each wakeup'
+READ_TIMEOUT_MIN = 10
+'''read timeout (in ms) just after events,
+or while a new client has not its name yet.'''
+READ_TIMEOUT_MAX = 128
+'''max read timeout (in ms) while nothing happens,
+it is also the max time needed to stop the events loop.'''
+CLIENT_NAME_DELAY = 0.050
+'''max time (in seconds) to wait for a new client to get its name,
+after this delay, client is added with its default name.'''
+
+
+@dataclass
+class AlsaReadStats:
+    '''Counters of the sequencer events reading'''
+    wakeups: int = 0
+    'number of receive_events calls'
+    batches: int = 0
+    'number of receive_events calls returning events'
+    events: int = 0
+    'number of events read'
+    max_batch: int = 0
+    'max number of events read at once'
+    client_name_waits: int = 0
+    'number of new clients added later because their name was not ready'
+
+    @property
+    def events_per_wakeup(self) -> float:
+        if not self.wakeups:
+            return 0.0
+        return self.events / self.wakeups
+
+    @property
+    def events_per_batch(self) -> float:
+        if not self.batches:
+            return 0.0
+        return self.events / self.batches
+
+    def reset(self):
+        self.wakeups = 0
+        self.batches = 0
+        self.events = 0
+        self.max_batch = 0
+        self.client_name_waits = 0
+
+
+@dataclass
+class AlsaRefreshStats:
+    '''Counters and timings of the sequencer graph refreshes'''
+    refreshes: int = 0
+    'number of refreshes'
+    snapshot_time: float = 0.0
+    'duration (in seconds) of the last sequencer graph reading'
+    max_snapshot_time: float = 0.0
+    'max duration (in seconds) of a sequencer graph reading'
+    diff_time: float = 0.0
+    '''duration (in seconds) of the last comparison
+    with the cached graph, including sent changes.'''
+    changes: int = 0
+    'number of changes sent by the last refresh'
+
+    def reset(self):
+        self.refreshes = 0
+        self.snapshot_time = 0.0
+        self.max_snapshot_time = 0.0
+        self.diff_time = 0.0
+        self.changes = 0
+
 
 @dataclass
 class AlsaPort:
@@ -58,7 +129,7 @@ class AlsaPort:
             f"{client.name}:{self.name}")
 
 
-@dataclass
+@dataclass(frozen=True)
 class AlsaConn:
     source_client_id: int
     source_port_id: int
@@ -66,8 +137,8 @@ class AlsaConn:
     dest_port_id: int
 
     def as_port_names(
-            self, clients: dict[int, 'AlsaClient']) \
-                -> Optional[tuple[str, str]]:
+            self, clients: dict[int, 'AlsaClient'],
+            port_names: 'AlsaPortNames') -> Optional[tuple[str, str]]:
         src_client = clients.get(self.source_client_id)
         dest_client = clients.get(self.dest_client_id)
 
@@ -80,8 +151,108 @@ class AlsaConn:
         if src_port is None or dest_port is None:
             return None
 
-        return (src_port.pb_name('OUT', src_client),
-                dest_port.pb_name('IN', dest_client))
+        return (port_names.name('OUT', src_client, src_port),
+                port_names.name('IN', dest_client, dest_port))
+
+
+class AlsaPortNames:
+    '''Cache of patchbay names of ALSA ports,
+    and of (client_id, port_id) of each patchbay name,
+    so that a port name has never to be parsed.'''
+    def __init__(self):
+        self._names = dict[tuple[str, int, int], str]()
+        '(mode_str, client_id, port_id): patchbay port name'
+        self._keys = dict[str, tuple[int, int]]()
+        'patchbay port name: (client_id, port_id)'
+
+    def name(self, mode_str: str, client: 'AlsaClient',
+             port: AlsaPort) -> str:
+        '''patchbay name of the port, mode_str is "OUT" or "IN"'''
+        name = self._names.get((mode_str, client.id, port.id))
+        if name is None:
+            name = sys.intern(port.pb_name(mode_str, client))
+            self._names[(mode_str, client.id, port.id)] = name
+            self._keys[name] = (client.id, port.id)
+        return name
+
+    def key(self, name: str) -> Optional[tuple[int, int]]:
+        '''(client_id, port_id) of the port named name,
+        or None if this name has not been given.'''
+        return self._keys.get(name)
+
+    def forget_port(self, client_id: int, port_id: int):
+        for mode_str in ('OUT', 'IN'):
+            name = self._names.pop((mode_str, client_id, port_id), None)
+            if name is not None:
+                self._keys.pop(name, None)
+
+    def clear(self):
+        self._names.clear()
+        self._keys.clear()
+
+
+class AlsaConnections(dict[AlsaConn, None]):
+    '''Insertion ordered set of ALSA connections.
+    Connections of a port are indexed by (client_id, port_id),
+    for both source and destination ports.'''
+    def __init__(self):
+        super().__init__()
+        self._ports = dict[tuple[int, int], dict[AlsaConn, None]]()
+        '(client_id, port_id): dict of connections of this port'
+
+    def _index(self, port: tuple[int, int]) -> dict[AlsaConn, None]:
+        conns = self._ports.get(port)
+        if conns is None:
+            conns = self._ports[port] = dict[AlsaConn, None]()
+        return conns
+
+    def _unindex(self, port: tuple[int, int], conn: AlsaConn):
+        conns = self._ports[port]
+        del conns[conn]
+        if not conns:
+            del self._ports[port]
+
+    def append(self, conn: AlsaConn) -> bool:
+        '''add the connection if not already present.
+
+        return False if the connection was already present.'''
+        if conn in self:
+            return False
+
+        super().__setitem__(conn, None)
+        self._index((conn.source_client_id, conn.source_port_id))[conn] = None
+        self._index((conn.dest_client_id, conn.dest_port_id))[conn] = None
+        return True
+
+    def remove(self, conn: AlsaConn) -> bool:
+        '''remove the connection if present.
+
+        return False if the connection was not present.'''
+        if conn not in self:
+            return False
+
+        super().__delitem__(conn)
+        self._unindex((conn.source_client_id, conn.source_port_id), conn)
+        if (conn.dest_client_id, conn.dest_port_id) \
+                != (conn.source_client_id, conn.source_port_id):
+            self._unindex((conn.dest_client_id, conn.dest_port_id), conn)
+        return True
+
+    def clear(self):
+        self._ports.clear()
+        super().clear()
+
+    def with_port(self, client_id: int, port_id: int) -> list[AlsaConn]:
+        'list all connections from or to the port'
+        return list(self._ports.get((client_id, port_id), ()))
+
+    def remove_port(self, client_id: int, port_id: int) -> list[AlsaConn]:
+        '''remove all connections from or to the port,
+        and return them.'''
+        conns = self.with_port(client_id, port_id)
+        for conn in conns:
+            self.remove(conn)
+        return conns
 
 
 class AlsaClient:
@@ -118,10 +289,16 @@ class AlsaManager:
         self.pbe = jack_mng.peo
         self.seq = Sequencer(clientname='raysession')
 
-        self._all_alsa_connections = list[AlsaConn]()
-        self._connections = list[AlsaConn]()
+        self._connections = AlsaConnections()
+        self._port_names = AlsaPortNames()
         self._clients = dict[int, AlsaClient]()
-        self._clients_names = dict[int, str]()
+        self._waiting_clients = dict[int, float]()
+        'client_id: deadline of new clients waiting for their name'
+
+        self.read_stats = AlsaReadStats()
+        'counters of the sequencer events reading'
+        self.refresh_stats = AlsaRefreshStats()
+        'counters and timings of the sequencer graph refreshes'
 
         self._stopping = False
         self._event_thread = Thread(target=self.read_events)
@@ -138,30 +315,24 @@ class AlsaManager:
             (SEQ_CLIENT_SYSTEM, SEQ_PORT_SYSTEM_ANNOUNCE),
             (self.seq.client_id, input_id))
 
-    def get_the_graph(self):
-        if self.seq is None:
-            return
+    def _read_graph(self) -> tuple[dict[int, AlsaClient], list[AlsaConn]]:
+        '''read all clients, ports and connections of the sequencer'''
+        clients = dict[int, AlsaClient]()
+        conns = list[AlsaConn]()
 
-        clients = self.seq.connection_list()
-
-        self._clients_names.clear()
-        self._clients.clear()
-        self._all_alsa_connections.clear()
-
-        for client in clients:
-            client_name, client_id, port_list = client
-            self._clients_names[client_id] = client_name
-            self._clients[client_id] = AlsaClient(
+        for client_name, client_id, port_list in self.seq.connection_list():
+            client = clients[client_id] = AlsaClient(
                 self, client_name, client_id)
             for port_name, port_id, connection_list in port_list:
-                self._clients[client_id].add_port(port_id)
+                client.add_port(port_id)
 
                 connections = connection_list[0]
                 for connection in connections:
                     conn_client_id, conn_port_id = connection[:2]
-                    self._all_alsa_connections.append(
-                        AlsaConn(client_id, port_id,
-                                 conn_client_id, conn_port_id))
+                    conns.append(AlsaConn(client_id, port_id,
+                                          conn_client_id, conn_port_id))
+
+        return clients, conns
 
     def add_client_to_patchbay(self, client_name: str):
         if self.pbe is None:
@@ -183,14 +354,14 @@ class AlsaManager:
 
         if port.caps & _PORT_READS == _PORT_READS:
             self.pbe.port_added(
-                port.pb_name('OUT', client),
+                self._port_names.name('OUT', client, port),
                 PortType.MIDI_ALSA,
                 port_flags | PORT_IS_OUTPUT,
                 client.id * 0x10000 + port.id)
 
         if port.caps & _PORT_WRITES == _PORT_WRITES:
             self.pbe.port_added(
-                port.pb_name('IN', client),
+                self._port_names.name('IN', client, port),
                 PortType.MIDI_ALSA,
                 port_flags | PORT_IS_INPUT,
                 client.id * 0x10000 + port.id)
@@ -201,50 +372,140 @@ class AlsaManager:
 
         if port.caps & _PORT_READS == _PORT_READS:
             self.pbe.port_removed(
-                port.pb_name('OUT', client))
+                self._port_names.name('OUT', client, port))
         if port.caps & _PORT_WRITES == _PORT_WRITES:
             self.pbe.port_removed(
-                port.pb_name('IN', client))
+                self._port_names.name('IN', client, port))
 
     def add_all_ports(self):
+        '''send all the sequencer graph to the patchbay,
+        removing first all ports already sent.'''
         if self.pbe is None:
             raise PatchEngineOuterMissing
 
         if self._event_thread.is_alive():
             self.stop_events_loop()
 
-        self.get_the_graph()
+        self._clients.clear()
+        self._connections.clear()
+        self._port_names.clear()
+        self.refresh()
 
-        for client in self._clients.values():
-            if client.name == 'System':
-                continue
+    def refresh(self):
+        '''read the sequencer graph and send to the patchbay
+        only differences with the graph already sent.'''
+        if self.pbe is None:
+            raise PatchEngineOuterMissing
 
-            self.add_client_to_patchbay(client.name)
+        if self._event_thread.is_alive():
+            self._stop_reading()
 
-            for port in client.ports.values():
-                self.add_port_to_patchbay(client, port)
+        stats = self.refresh_stats
+        start = time.perf_counter()
+        clients, conns = self._read_graph()
+        snapshot_end = time.perf_counter()
 
-        for conn in self._all_alsa_connections:
-            source_client = self._clients.get(conn.source_client_id)
-            dest_client = self._clients.get(conn.dest_client_id)
-            if source_client is None or dest_client is None:
-                continue
+        # clients read here have their name now, or will not have it.
+        for client_id in clients:
+            self._waiting_clients.pop(client_id, None)
 
-            source_port = source_client.ports.get(conn.source_port_id)
-            dest_port = dest_client.ports.get(conn.dest_port_id)
+        changes = 0
 
-            if source_port is None or dest_port is None:
+        # forget removed or changed clients and ports
+        for client_id, client in list(self._clients.items()):
+            new_client = clients.get(client_id)
+            if new_client is None or new_client.name != client.name:
+                changes += self._forget_client(client)
                 continue
 
-            self._connections.append(conn)
+            for port_id, port in list(client.ports.items()):
+                if new_client.ports.get(port_id) != port:
+                    changes += self._forget_port(client, port)
 
-            self.pbe.connection_added(
-                (source_port.pb_name('OUT', source_client),
-                 dest_port.pb_name('IN', dest_client))
-            )
+        # add new clients and ports
+        for client_id, new_client in clients.items():
+            client = self._clients.get(client_id)
+            if client is None:
+                client = self._clients[client_id] = AlsaClient(
+                    self, new_client.name, client_id)
+                if client.name != 'System':
+                    self.add_client_to_patchbay(client.name)
+                    changes += 1
+
+            for port_id, port in new_client.ports.items():
+                if port_id in client.ports:
+                    continue
+
+                client.ports[port_id] = port
+                if client.name != 'System':
+                    self.add_port_to_patchbay(client, port)
+                    changes += 1
+
+        # connections
+        new_conns = dict[AlsaConn, None]()
+        for conn in conns:
+            if conn.as_port_names(self._clients, self._port_names) is not None:
+                new_conns[conn] = None
+
+        for conn in list(self._connections):
+            if conn not in new_conns:
+                self._connections.remove(conn)
+                port_names = conn.as_port_names(
+                    self._clients, self._port_names)
+                if port_names is not None:
+                    self.pbe.connection_removed(port_names)
+                    changes += 1
+
+        for conn in new_conns:
+            if self._connections.append(conn):
+                self.pbe.connection_added(
+                    conn.as_port_names(
+                        self._clients, self._port_names)) # type:ignore
+                changes += 1
+
+        end = time.perf_counter()
+        stats.refreshes += 1
+        stats.snapshot_time = snapshot_end - start
+        stats.max_snapshot_time = max(
+            stats.max_snapshot_time, stats.snapshot_time)
+        stats.diff_time = end - snapshot_end
+        stats.changes = changes
+        _logger.debug(
+            f'ALSA graph read in {stats.snapshot_time:.3f}s, '
+            f'{changes} changes sent in {stats.diff_time:.3f}s')
 
         self._event_thread.start()
 
+    def _forget_port(self, client: AlsaClient, port: AlsaPort) -> int:
+        '''remove the port and its connections from the patchbay,
+        return the number of sent changes.'''
+        changes = 0
+        for conn in self._connections.remove_port(client.id, port.id):
+            port_names = conn.as_port_names(self._clients, self._port_names)
+            if port_names is not None:
+                self.pbe.connection_removed(port_names) # type:ignore
+                changes += 1
+
+        if client.name != 'System':
+            self.remove_port_from_patchbay(client, port)
+            changes += 1
+        self._port_names.forget_port(client.id, port.id)
+        del client.ports[port.id]
+        return changes
+
+    def _forget_client(self, client: AlsaClient) -> int:
+        '''remove the client, its ports and their connections
+        from the patchbay, return the number of sent changes.'''
+        changes = 0
+        for port in list(client.ports.values()):
+            changes += self._forget_port(client, port)
+
+        if client.name != 'System':
+            self.remove_client_from_patchbay(client.name)
+            changes += 1
+        del self._clients[client.id]
+        return changes
+
     def parse_ports_and_flags(self) -> Iterator[PortData]:
         for client_id, client in self._clients.items():
             if client.name == 'System':
@@ -257,14 +518,14 @@ class AlsaManager:
 
                 if port.caps & _PORT_READS == _PORT_READS:
                     yield PortData(
-                        port.pb_name('OUT', client),
+                        self._port_names.name('OUT', client, port),
                         PortType.MIDI_ALSA,
                         port_flags | PORT_IS_OUTPUT,
                         client.id * 0x10000 + port.id)
 
                 if port.caps & _PORT_WRITES == _PORT_WRITES:
                     yield PortData(
-                        port.pb_name('IN', client),
+                        self._port_names.name('IN', client, port),
                         PortType.MIDI_ALSA,
                         port_flags | PORT_IS_INPUT,
                         client.id * 0x10000 + port.id)
@@ -282,48 +543,30 @@ class AlsaManager:
             if src_port is None or dest_port is None:
                 continue
 
-            yield (src_port.pb_name('OUT', src_client),
-                   dest_port.pb_name('IN', dest_client))
+            yield (self._port_names.name('OUT', src_client, src_port),
+                   self._port_names.name('IN', dest_client, dest_port))
 
     def connect_ports(self, port_out_name: str, port_in_name: str,
                       disconnect=False) -> bool:
-        try:
-            _, alsa_key, src_client_id, src_port_id, *rest = \
-                port_out_name.split(':')
-            _, alsa_key, dest_client_id, dest_port_id, *rest = \
-                port_in_name.split(':')
-            src_client_id, src_port_id \
-                = int(src_client_id), int(src_port_id) # type:ignore
-            dest_client_id, dest_port_id \
-                = int(dest_client_id), int(dest_port_id) # type:ignore
+        src = self._port_names.key(port_out_name)
+        dest = self._port_names.key(port_in_name)
 
-        except BaseException as e:
+        if src is None or dest is None:
             if disconnect:
                 _logger.warning(
                     f'Failed to find ALSA ports to disconnect: '
-                    f'{port_out_name} -> {port_in_name}\n{str(e)}')
+                    f'{port_out_name} -> {port_in_name}')
             else:
                 _logger.warning(
                     f'Failed to find ALSA ports to connect: '
-                    f'{port_out_name} -> {port_in_name}\n{str(e)}')
+                    f'{port_out_name} -> {port_in_name}')
             return False
 
         try:
-            if TYPE_CHECKING:
-                assert isinstance(src_client_id, int)
-                assert isinstance(src_port_id, int)
-                assert isinstance(dest_client_id, int)
-                assert isinstance(dest_port_id, int)
-
             if disconnect:
-                self.seq.disconnect_ports(
-                    (src_client_id, src_port_id),
-                    (dest_client_id, dest_port_id))
+                self.seq.disconnect_ports(src, dest)
             else:
-                self.seq.connect_ports(
-                    (src_client_id, src_port_id),
-                    (dest_client_id, dest_port_id),
-                    0, 0, 0, 0)
+                self.seq.connect_ports(src, dest, 0, 0, 0, 0)
 
         except BaseException as e:
             # TODO: investigate
@@ -340,49 +583,42 @@ class AlsaManager:
 
         data = event.get_data()
         if event.type == SEQ_EVENT_CLIENT_START:
-            try:
-                client_id = data['addr.client']
-                client_info = self.seq.get_client_info(client_id)
-            except:
-                return
-
-            n_tries = 0
-            client_outed = False
-
-            # Sometimes client name is not ready
-            while client_info['name'] == f'Client-{client_id}':
-                time.sleep(0.010)
-                try:
-                    client_info = self.seq.get_client_info(client_id)
-                except:
-                    client_outed = True
-                    break
-
-                n_tries += 1
-                if n_tries >= 5:
-                    break
-
-            if client_outed:
-                return
-
-            self._clients[client_id] = AlsaClient(
-                self, client_info['name'], client_id)
-            self.add_client_to_patchbay(self._clients[client_id].name)
+            client_id = data['addr.client']
+            # Sometimes client name is not ready,
+            # the client will be added once it has its name
+            # (CLIENT_CHANGE event), when its first port appears,
+            # or after CLIENT_NAME_DELAY.
+            self._waiting_clients[client_id] = \
+                time.monotonic() + CLIENT_NAME_DELAY
+            self._check_waiting_client(client_id)
+            if client_id in self._waiting_clients:
+                self.read_stats.client_name_waits += 1
+
+        elif event.type == SEQ_EVENT_CLIENT_CHANGE:
+            client_id = data['addr.client']
+            if client_id in self._waiting_clients:
+                self._check_waiting_client(client_id)
 
         elif event.type == SEQ_EVENT_CLIENT_EXIT:
             client_id = data['addr.client']
+            self._waiting_clients.pop(client_id, None)
             client = self._clients.get(client_id)
             if client is not None:
                 for port in client.ports.values():
+                    self._connections.remove_port(client_id, port.id)
                     self.remove_port_from_patchbay(client, port)
+                    self._port_names.forget_port(client_id, port.id)
 
                 self.remove_client_from_patchbay(client.name)
                 del self._clients[client_id]
 
         elif event.type == SEQ_EVENT_PORT_START:
             client_id, port_id = data['addr.client'], data['addr.port']
+            if client_id in self._waiting_clients:
+                self._check_waiting_client(client_id, force=True)
+
             client = self._clients.get(client_id)
-            if client is None:
+            if client is None or port_id in client.ports:
                 return
 
             client.add_port(port_id)
@@ -402,20 +638,15 @@ class AlsaManager:
             if port is None:
                 return
 
-            to_rm_conns = list[AlsaConn]()
-
-            for conn in self._connections:
-                if (client_id, port_id) in (
-                        (conn.source_client_id, conn.source_port_id),
-                        (conn.dest_client_id, conn.dest_port_id)):
-                    to_rm_conns.append(conn)
-
-            for conn in to_rm_conns:
-                port_names = conn.as_port_names(self._clients)
+            for conn in self._connections.remove_port(client_id, port_id):
+                port_names = conn.as_port_names(
+                    self._clients, self._port_names)
                 if port_names is not None:
                     self.pbe.connection_removed(port_names)
 
             self.remove_port_from_patchbay(client, port)
+            self._port_names.forget_port(client_id, port_id)
+            del client.ports[port_id]
 
         elif event.type == SEQ_EVENT_PORT_SUBSCRIBED:
             sender_client = self._clients.get(data['connect.sender.client'])
@@ -429,13 +660,15 @@ class AlsaManager:
             if sender_port is None or dest_port is None:
                 return
 
-            self._connections.append(
-                AlsaConn(sender_client.id, sender_port.id,
-                            dest_client.id, dest_port.id))
+            if not self._connections.append(
+                    AlsaConn(sender_client.id, sender_port.id,
+                             dest_client.id, dest_port.id)):
+                # already read by a refresh
+                return
 
             self.pbe.connection_added(
-                (sender_port.pb_name('OUT', sender_client),
-                    dest_port.pb_name('IN', dest_client)))
+                (self._port_names.name('OUT', sender_client, sender_port),
+                    self._port_names.name('IN', dest_client, dest_port)))
 
         elif event.type == SEQ_EVENT_PORT_UNSUBSCRIBED:
             sender_client = self._clients.get(data['connect.sender.client'])
@@ -449,44 +682,94 @@ class AlsaManager:
             if sender_port is None or dest_port is None:
                 return
 
-            for conn in self._connections:
-                if (conn.source_client_id == sender_client.id
-                        and conn.source_port_id == sender_port.id
-                        and conn.dest_client_id == dest_client.id
-                        and conn.dest_port_id == dest_port.id):
-                    self._connections.remove(conn)
-                    break
+            if not self._connections.remove(
+                    AlsaConn(sender_client.id, sender_port.id,
+                             dest_client.id, dest_port.id)):
+                # already removed by a refresh
+                return
 
             self.pbe.connection_removed(
-                (sender_port.pb_name('OUT', sender_client),
-                    dest_port.pb_name('IN', dest_client))
+                (self._port_names.name('OUT', sender_client, sender_port),
+                    self._port_names.name('IN', dest_client, dest_port))
             )
 
+    def _check_waiting_client(self, client_id: int, force=False):
+        '''add the new client if it has its name,
+        or if force is True or its deadline is passed.'''
+        try:
+            client_info = self.seq.get_client_info(client_id)
+        except:
+            # client has gone
+            self._waiting_clients.pop(client_id, None)
+            return
+
+        if (client_info['name'] == f'Client-{client_id}'
+                and not force
+                and time.monotonic() < self._waiting_clients[client_id]):
+            return
+
+        self._waiting_clients.pop(client_id)
+        if client_id in self._clients:
+            # already read by a refresh
+            return
+
+        self._clients[client_id] = AlsaClient(
+            self, client_info['name'], client_id)
+        self.add_client_to_patchbay(self._clients[client_id].name)
+
     def read_events(self):
         if self.pbe is None:
             raise PatchEngineOuterMissing
 
+        stats = self.read_stats
+        timeout = READ_TIMEOUT_MAX
+
         while True:
             if self._stopping:
                 break
 
-            for event in self.seq.receive_events(timeout=128, maxevents=1):
-                self._process_event(event)
+            events = self.seq.receive_events(
+                timeout=timeout, maxevents=EVENTS_BATCH)
+            stats.wakeups += 1
+
+            if events:
+                stats.batches += 1
+                stats.events += len(events)
+                stats.max_batch = max(stats.max_batch, len(events))
+
+                for event in events:
+                    self._process_event(event)
+
+                # events often come in bursts
+                timeout = READ_TIMEOUT_MIN
+            else:
+                timeout = min(timeout * 2, READ_TIMEOUT_MAX)
+
+            if self._waiting_clients:
+                # add clients which waited too long for their name
+                now = time.monotonic()
+                for client_id, deadline in list(self._waiting_clients.items()):
+                    if deadline <= now:
+                        self._check_waiting_client(client_id)
+                timeout = READ_TIMEOUT_MIN
+
+    def _stop_reading(self):
+        self._stopping = True
+        self._event_thread.join()
+
+        del self._event_thread
+        self._stopping = False
+        self._event_thread = Thread(target=self.read_events)
 
     def stop_events_loop(self):
         if not self._event_thread.is_alive():
             return
 
-        self._stopping = True
-        self._event_thread.join()
+        self._stop_reading()
 
         for client in self._clients.values():
             for port in client.ports.values():
                 self.remove_port_from_patchbay(client, port)
 
-        del self._event_thread
-        self._stopping = False
-        self._event_thread = Thread(target=self.read_events)
-
     def exit(self):
         self.seq.exit()
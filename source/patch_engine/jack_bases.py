@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from enum import Enum, auto
 from queue import Queue
 import time
@@ -31,10 +32,305 @@ class PatchEvent(Enum):
     SAMPLERATE_CHANGED = auto()
 
 
+@dataclass
+class CoalesceStats:
+    '''Counters of a coalescing PatchEventQueue'''
+    received: int = 0
+    'number of events read from the queue'
+    dispatched: int = 0
+    'number of events really yielded after coalescing'
+    elided_ports: int = 0
+    'number of elided PORT_ADDED and PORT_REMOVED events'
+    elided_connections: int = 0
+    'number of elided CONNECTION_ADDED and CONNECTION_REMOVED events'
+
+    @property
+    def elided(self) -> int:
+        return self.elided_ports + self.elided_connections
+
+    def reset(self):
+        self.received = 0
+        self.dispatched = 0
+        self.elided_ports = 0
+        self.elided_connections = 0
+
+
+@dataclass
+class PrettyExportStats:
+    '''Counters of pretty-names batched exports to JACK metadatas'''
+    exports: int = 0
+    'number of batched exports'
+    writes: int = 0
+    'number of pretty-name properties set or removed'
+    unchanged: int = 0
+    'number of pretty-names not written because already in JACK'
+    last_writes: int = 0
+    'number of writes of the last export'
+
+    def reset(self):
+        self.exports = 0
+        self.writes = 0
+        self.unchanged = 0
+        self.last_writes = 0
+
+
+@dataclass
+class PollStats:
+    '''Counters of transport and DSP load polling'''
+    wakeups: int = 0
+    'number of calls to polling methods'
+    transport_queries: int = 0
+    'number of transport_query() really done'
+    transport_sent: int = 0
+    'number of transport positions sent'
+    dsp_queries: int = 0
+    'number of cpu_load() really done'
+    dsp_sent: int = 0
+    'number of DSP loads sent'
+    transport_changes: int = 0
+    'number of transport queries with a new transport state'
+    transport_latency_sum: float = 0.0
+    transport_latency_max: float = 0.0
+    '''max time (in seconds) between a transport query finding a new state
+    and the previous one, it is the max latency of a transport change.'''
+
+    @property
+    def transport_latency_mean(self) -> float:
+        if not self.transport_changes:
+            return 0.0
+        return self.transport_latency_sum / self.transport_changes
+
+    @property
+    def skipped(self) -> int:
+        '''number of polling calls returning without querying JACK'''
+        return self.wakeups - self.transport_queries - self.dsp_queries
+
+    def reset(self):
+        self.wakeups = 0
+        self.transport_queries = 0
+        self.transport_sent = 0
+        self.dsp_queries = 0
+        self.dsp_sent = 0
+        self.transport_changes = 0
+        self.transport_latency_sum = 0.0
+        self.transport_latency_max = 0.0
+
+
+@dataclass
+class RegistrationStats:
+    '''Counters of port registrations and of their
+    deferred connections reconciliations'''
+    registrations: int = 0
+    'number of port registrations and unregistrations'
+    reconciliations: int = 0
+    'number of reconciliations done after a registrations burst'
+    queries: int = 0
+    'number of port connections queried to JACK by reconciliations'
+    connections_fixed: int = 0
+    '''number of connections added or removed by reconciliations,
+    because not reported by JACK connect callbacks.'''
+
+    @property
+    def queries_saved(self) -> int:
+        '''number of port connections queries not done,
+        compared to one query per registration.'''
+        return self.registrations - self.queries
+
+    def reset(self):
+        self.registrations = 0
+        self.reconciliations = 0
+        self.queries = 0
+        self.connections_fixed = 0
+
+
+class AdaptiveInterval:
+    '''Interval between two polls of a value.
+    Each call is a poll while the value changes,
+    the interval grows up to max_interval while the value is steady.'''
+    def __init__(self, start_interval: float, max_interval: float):
+        self.start_interval = start_interval
+        self.max_interval = max_interval
+        self.interval = 0.0
+        self.last_poll = 0.0
+        self.next_poll = 0.0
+
+    def due(self, now: float) -> bool:
+        return now >= self.next_poll
+
+    def polled(self, now: float, changed: bool):
+        if changed:
+            self.interval = 0.0
+        else:
+            self.interval = min(
+                max(self.interval * 2, self.start_interval),
+                self.max_interval)
+
+        self.last_poll = now
+        self.next_poll = now + self.interval
+
+    def wake_up(self):
+        '''make the next call poll, and the following ones
+        until the value is steady.'''
+        self.interval = 0.0
+        self.next_poll = 0.0
+
+
+_PORT_EVENTS = (PatchEvent.PORT_ADDED, PatchEvent.PORT_REMOVED)
+_CONN_EVENTS = (PatchEvent.CONNECTION_ADDED, PatchEvent.CONNECTION_REMOVED)
+_ADD_EVENTS = (PatchEvent.PORT_ADDED, PatchEvent.CONNECTION_ADDED)
+
+
+def _kept_indexes(indexes: list[int], events: list[PatchEvent]) -> set[int]:
+    '''For a sequence of add/remove events concerning the same item,
+    return the indexes of the events to keep:
+    the first one if it is a removal, the last one if it is an addition.
+    Events in between are contradictory or duplicates.'''
+    kept = set[int]()
+    first, last = indexes[0], indexes[-1]
+
+    if events[first] not in _ADD_EVENTS:
+        kept.add(first)
+    if events[last] in _ADD_EVENTS:
+        kept.add(last)
+    return kept
+
+
+def coalesce_events(
+        events: list[tuple[PatchEvent, PatchEventArg | None]],
+        stats: Optional[CoalesceStats]=None) \
+            -> list[tuple[PatchEvent, PatchEventArg | None]]:
+    '''Fold contradictory or duplicate port and connection events
+    of a burst, keeping the order of remaining events.
+
+    Rules, per port name or connection pair:
+    - added ... removed: all events are elided
+    - added ... added: only the last addition is kept
+    - removed ... removed: only the first removal is kept
+    - removed ... added: first removal and last addition are kept for
+      ports. For connections, both are elided (the connection exists
+      before and after) unless one of its ports is removed or re-added
+      in the burst.
+    - all events of a connection are elided if one of its ports
+      is added then removed in the burst.
+    - a connection addition placed before the kept PORT_ADDED event of
+      one of its ports is moved just after it.
+
+    Renamed ports and events around a SHUTDOWN are never coalesced.'''
+    if stats is None:
+        stats = CoalesceStats()
+
+    # coalesce only inside segments separated by SHUTDOWN events
+    for i, (event, _) in enumerate(events):
+        if event is PatchEvent.SHUTDOWN:
+            return (coalesce_events(events[:i], stats)
+                    + [events[i]]
+                    + coalesce_events(events[i+1:], stats))
+
+    kinds = [event for event, _ in events]
+    renamed = set[str]()
+    port_idxs = dict[str, list[int]]()
+    conn_idxs = dict[tuple[str, str], list[int]]()
+
+    for i, (event, arg) in enumerate(events):
+        if event in _PORT_EVENTS:
+            if event is PatchEvent.PORT_ADDED:
+                port_name: str = arg.name # type:ignore
+            else:
+                port_name: str = arg # type:ignore
+            port_idxs.setdefault(port_name, []).append(i)
+
+        elif event in _CONN_EVENTS:
+            conn: tuple[str, str] = arg # type:ignore
+            conn_idxs.setdefault(tuple(conn), []).append(i) # type:ignore
+
+        elif event is PatchEvent.PORT_RENAMED:
+            old, new, _uuid = arg # type:ignore
+            renamed.add(old)
+            renamed.add(new)
+
+    elided = set[int]()
+    touched_ports = set[str]()
+    'names of ports with events still dispatched after coalescing'
+    vanished_ports = set[str]()
+    'names of ports added then removed in the burst'
+    added_at = dict[str, int]()
+    'index of the kept PORT_ADDED event of ports'
+    moved = dict[int, list[int]]()
+    '''indexes of connection additions to dispatch
+    just after the PORT_ADDED event at key index'''
+
+    for port_name, idxs in port_idxs.items():
+        if port_name in renamed:
+            touched_ports.add(port_name)
+            continue
+
+        kept = _kept_indexes(idxs, kinds)
+        if kept:
+            touched_ports.add(port_name)
+        else:
+            vanished_ports.add(port_name)
+        for i in idxs:
+            if i not in kept:
+                elided.add(i)
+                stats.elided_ports += 1
+            elif kinds[i] is PatchEvent.PORT_ADDED:
+                added_at[port_name] = i
+
+    for conn, idxs in conn_idxs.items():
+        port_out, port_in = conn
+        if port_out in renamed or port_in in renamed:
+            continue
+
+        kept = _kept_indexes(idxs, kinds)
+        if port_out in vanished_ports or port_in in vanished_ports:
+            # the port exists neither before nor after the burst
+            kept.clear()
+        elif (len(kept) == 2
+                and port_out not in touched_ports
+                and port_in not in touched_ports):
+            # removed then re-added, connection finally didn't change
+            kept.clear()
+
+        for i in idxs:
+            if i not in kept:
+                elided.add(i)
+                stats.elided_connections += 1
+                continue
+
+            # a connection can not be added before its ports,
+            # it could be if the PORT_ADDED before it has been elided.
+            port_added_at = max(added_at.get(port_out, -1),
+                                added_at.get(port_in, -1))
+            if (kinds[i] is PatchEvent.CONNECTION_ADDED
+                    and port_added_at > i):
+                moved.setdefault(port_added_at, []).append(i)
+
+    if not elided and not moved:
+        return events
+
+    moved_idxs = set[int]()
+    for idxs in moved.values():
+        moved_idxs.update(idxs)
+
+    coalesced = list[tuple[PatchEvent, PatchEventArg | None]]()
+    for i, ev in enumerate(events):
+        if i in elided or i in moved_idxs:
+            continue
+        coalesced.append(ev)
+        for j in moved.get(i, ()):
+            coalesced.append(events[j])
+    return coalesced
+
+
 class PatchEventQueue(Queue[tuple[PatchEvent, PatchEventArg | None]]):
-    def __init__(self, maxsize: int = 0):
+    def __init__(self, maxsize: int = 0, coalesce=False):
         super().__init__(maxsize)
         self.oldies_queue: Queue[tuple[Any, Any, float]] = Queue()
+        self.coalesce = coalesce
+        '''If True, redundant port and connection events
+        waiting in the queue are folded before being iterated.'''
+        self.stats = CoalesceStats()
+        'counters of the coalescing mode'
 
     def add(self, *args):
         nargs = len(args)
@@ -51,10 +347,29 @@ class PatchEventQueue(Queue[tuple[PatchEvent, PatchEventArg | None]]):
         self.oldies_queue.put((event, rest, time.time()))
 
     def __iter__(self) -> Iterator[tuple[PatchEvent, PatchEventArg | None]]:
+        if self.coalesce:
+            yield from self._coalesced()
+            return
+
         while self.qsize():
             event, event_arg = self.get()
             yield (event, event_arg)
 
+    def _coalesced(self) -> Iterator[tuple[PatchEvent, PatchEventArg | None]]:
+        '''Iter all events currently in the queue, coalesced.
+        Events added during iteration are kept for the next time.'''
+        events = list[tuple[PatchEvent, PatchEventArg | None]]()
+        while self.qsize():
+            events.append(self.get())
+
+        if not events:
+            return
+
+        self.stats.received += len(events)
+        events = coalesce_events(events, self.stats)
+        self.stats.dispatched += len(events)
+        yield from events
+
     def oldies(self, required_time: float = 0.200) \
             -> Iterator[tuple[PatchEvent, PatchEventArg]]:
         '''Iter only events older than required_time'''
@@ -66,6 +381,97 @@ class PatchEventQueue(Queue[tuple[PatchEvent, PatchEventArg | None]]):
             yield (event, event_arg)
 
 
+class JackConnections(dict[tuple[str, str], None]):
+    '''Insertion ordered set of JACK connections (port_out, port_in).
+
+    Iterating on it yields connections in the order they have been added.
+    Membership, insertion and removal are O(1), and connections
+    of a given port are indexed by port name.'''
+    def __init__(self):
+        super().__init__()
+        self._outs = dict[str, dict[str, None]]()
+        'port_out name: dict of connected port_in names'
+        self._ins = dict[str, dict[str, None]]()
+        'port_in name: dict of connected port_out names'
+
+    def append(self, conn: tuple[str, str]) -> bool:
+        '''add the connection if not already present.
+
+        return False if the connection was already present.'''
+        if conn in self:
+            return False
+
+        port_out, port_in = conn
+        super().__setitem__(conn, None)
+
+        port_ins = self._outs.get(port_out)
+        if port_ins is None:
+            port_ins = self._outs[port_out] = dict[str, None]()
+        port_ins[port_in] = None
+
+        port_outs = self._ins.get(port_in)
+        if port_outs is None:
+            port_outs = self._ins[port_in] = dict[str, None]()
+        port_outs[port_out] = None
+        return True
+
+    def remove(self, conn: tuple[str, str]) -> bool:
+        '''remove the connection if present.
+
+        return False if the connection was not present.'''
+        if conn not in self:
+            return False
+
+        port_out, port_in = conn
+        super().__delitem__(conn)
+
+        port_ins = self._outs[port_out]
+        del port_ins[port_in]
+        if not port_ins:
+            del self._outs[port_out]
+
+        port_outs = self._ins[port_in]
+        del port_outs[port_out]
+        if not port_outs:
+            del self._ins[port_in]
+        return True
+
+    def clear(self):
+        self._outs.clear()
+        self._ins.clear()
+        super().clear()
+
+    def from_port(self, port_out: str) -> Iterator[tuple[str, str]]:
+        'iter connections from the output port named port_out'
+        port_ins = self._outs.get(port_out)
+        if port_ins is None:
+            return
+
+        for port_in in port_ins:
+            yield (port_out, port_in)
+
+    def to_port(self, port_in: str) -> Iterator[tuple[str, str]]:
+        'iter connections to the input port named port_in'
+        port_outs = self._ins.get(port_in)
+        if port_outs is None:
+            return
+
+        for port_out in port_outs:
+            yield (port_out, port_in)
+
+    def with_port(self, port_name: str) -> list[tuple[str, str]]:
+        'list all connections of the port named port_name'
+        return [*self.from_port(port_name), *self.to_port(port_name)]
+
+    def remove_port(self, port_name: str) -> list[tuple[str, str]]:
+        '''remove all connections of the port named port_name,
+        and return them.'''
+        conns = self.with_port(port_name)
+        for conn in conns:
+            self.remove(conn)
+        return conns
+
+
 class ClientNamesUuids(dict[str, int]):
     def __init__(self):
         super().__init__()
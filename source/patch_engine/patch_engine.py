@@ -4,12 +4,11 @@
 from enum import Enum
 import errno
 import signal
-from typing import Optional
+from typing import Iterator, Optional
 import threading
 import time
 from pathlib import Path
 import logging
-import json
 
 # third party imports
 import jack
@@ -23,9 +22,12 @@ from jack_wa import (
 
 # local imports
 from .jack_bases import (
-    ClientNamesUuids, PatchEngineOuterMissing, PatchEventQueue, PatchEvent)
+    ClientNamesUuids, JackConnections, PatchEngineOuterMissing,
+    PatchEventQueue, PatchEvent, PrettyExportStats, PollStats,
+    AdaptiveInterval, RegistrationStats)
 from .patch_engine_outer import PatchEngineOuter
 from .port_data import PortData, PortDataList
+from .pretty_names_store import UuidPrettyNames
 from .suppress_stdout_stderr import SuppressStdoutStderr
 from .alsa_lib_check import ALSA_LIB_OK
 if ALSA_LIB_OK:
@@ -36,6 +38,19 @@ _logger = logging.getLogger(__name__)
 
 METADATA_LOCKER = 'pretty-name-export.locker'
 
+TRANSPORT_POLL_MAX = 0.25
+'''max interval (in seconds) between two transport queries
+while transport is stopped and not moved.'''
+POLL_BACKOFF_START = 0.05
+'first interval (in seconds) between two polls once a value is steady'
+
+REGISTRATION_BURST_QUIET = 0.050
+'''time (in seconds) without any port registration
+after which a registrations burst is considered as finished.'''
+
+GRAPH_CHUNK = 128
+'number of ports read between two chunks sent while streaming the graph'
+
 
 class AutoExportPretty(Enum):
     NO = 0
@@ -60,17 +75,34 @@ def jack_pretty_name(uuid: int) -> str:
         return ''
     return value_type[0].decode()
 
+def jack_pretty_names() -> dict[int, str]:
+    '''all pretty-name metadatas of JACK, read at once'''
+    try:
+        jack_properties = jack.get_all_properties()
+    except:
+        _logger.warning('Failed to get JACK properties')
+        return {}
+
+    pretty_names = dict[int, str]()
+    for uuid, uuid_dict in jack_properties.items():
+        value_type = uuid_dict.get(JackMetadata.PRETTY_NAME)
+        if value_type is not None:
+            pretty_names[uuid] = value_type[0].decode()
+    return pretty_names
+
 
 class PatchEngine:
     ports = PortDataList()
-    connections = list[tuple[str, str]]()
+    connections = JackConnections()
     metadatas = JackMetadatas()
     'JACK metadatas, r/w in main thread only'
 
     client_name_uuids = ClientNamesUuids()
     patch_event_queue = PatchEventQueue()
     '''JACK events, clients and ports registrations,
-    connections, metadata changes'''
+    connections, metadata changes.
+    Set its `coalesce` attribute to True to fold redundant events
+    (see `patch_event_queue.stats` for elided events counters).'''
     jack_running = False
     alsa_mng: Optional['AlsaManager'] = None
     terminate = False
@@ -106,6 +138,17 @@ class PatchEngine:
     dsp_wanted = True
     transport_wanted = TransportWanted.FULL
 
+    stream_graph = False
+    '''If True, the graph read at startup and at server restart is sent
+    to the outer interface (port_added, connection_added...)
+    chunk by chunk while it is read, so the first ports appear early.
+    `server_restarted` is still called once all the graph is read.'''
+
+    incremental_refresh = False
+    '''If True, `refresh` sends to the outer interface only
+    differences between the JACK (and ALSA) graph and the engine state,
+    instead of calling `server_restarted`.'''
+
     def __init__(
             self, client_name: str, pretty_tmp_path: Optional[Path]=None,
             auto_export_pretty_names=False):
@@ -120,6 +163,19 @@ class PatchEngine:
         self.last_transport_pos = TransportPosition(
             0, False, False, 0, 0, 0, 0.0)
 
+        self.poll_stats = PollStats()
+        'counters of transport and DSP load polling'
+        self._transport_poll = AdaptiveInterval(
+            POLL_BACKOFF_START, TRANSPORT_POLL_MAX)
+
+        self.registration_stats = RegistrationStats()
+        'counters of port registrations and connections reconciliations'
+        self._registered_ports = set[str]()
+        '''names of ports registered since last reconciliation,
+        r/w under _registrations_lock only.'''
+        self._registrations_lock = threading.Lock()
+        self._last_registration = 0.0
+
         if auto_export_pretty_names:
             self.auto_export_pretty_names = AutoExportPretty.YES
         else:
@@ -129,7 +185,7 @@ class PatchEngine:
         '''Contains all internal custom names,
         including some groups and ports not existing now'''
 
-        self.uuid_pretty_names = dict[int, str]()
+        self.uuid_pretty_names = UuidPrettyNames(pretty_tmp_path)
         '''Contains pairs of 'uuid: pretty_name' of all pretty_names
         exported to JACK metadatas by this program.'''
 
@@ -139,6 +195,9 @@ class PatchEngine:
 
         self.pretty_tmp_path = pretty_tmp_path
 
+        self.pretty_export_stats = PrettyExportStats()
+        'counters of pretty-names batched exports'
+
         self._locker_written = False
         self._client_uuid = 0
         self._client_name = ''
@@ -255,6 +314,9 @@ class PatchEngine:
 
                 case PatchEvent.PORT_ADDED:
                     port: PortData = event_arg #type:ignore
+                    if self.ports.from_name(port.name) is not None:
+                        # port already read by a graph reconciliation
+                        continue
                     self.ports.append(port)
                     self.peo.port_added(
                         port.name, port.type, port.flags, port.uuid)
@@ -262,8 +324,7 @@ class PatchEngine:
                 case PatchEvent.PORT_REMOVED:
                     port = self.ports.from_name(event_arg) #type:ignore
                     if port is not None:
-                        self.ports.remove(port)
-                        self.peo.port_removed(port.name)
+                        self._forget_port(port)
 
                 case PatchEvent.PORT_RENAMED:
                     old_new: tuple[str, str, int] = event_arg #type:ignore
@@ -273,14 +334,13 @@ class PatchEngine:
 
                 case PatchEvent.CONNECTION_ADDED:
                     conn: tuple[str, str] = event_arg #type:ignore
-                    self.connections.append(conn)
-                    self.peo.connection_added(conn)
+                    if self.connections.append(conn):
+                        self.peo.connection_added(conn)
 
                 case PatchEvent.CONNECTION_REMOVED:
                     conn: tuple[str, str] = event_arg #type:ignore
-                    if conn in self.connections:
-                        self.connections.remove(conn)
-                    self.peo.connection_removed(conn)
+                    if self.connections.remove(conn):
+                        self.peo.connection_removed(conn)
 
                 case PatchEvent.CLIENT_ADDED:
                     client_name: str = event_arg #type:ignore
@@ -361,6 +421,70 @@ class PatchEngine:
                     self.peo.server_stopped()
                     self.jack_running = False
 
+        self._reconcile_registered_ports()
+
+    def _reconcile_registered_ports(self):
+        '''Once a burst of port registrations is finished, check
+        the connections of all ports registered during the burst.
+
+        With PipeWire, some ports can be added (re-added in reality)
+        with already existing connections, in the case of
+        buffersize (quantum) change, without any connect callback.
+        Connections of each port still existing are queried once,
+        and only differences with the engine state are sent.'''
+        if self.client is None or self.peo is None:
+            return
+
+        with self._registrations_lock:
+            if not self._registered_ports:
+                return
+            if (time.monotonic() - self._last_registration
+                    < REGISTRATION_BURST_QUIET):
+                return
+            port_names = self._registered_ports
+            self._registered_ports = set[str]()
+
+        stats = self.registration_stats
+        stats.reconciliations += 1
+        not_processed = set[str]()
+
+        for port_name in port_names:
+            port = self.ports.from_name(port_name)
+            if port is None:
+                # PORT_ADDED event not processed yet
+                not_processed.add(port_name)
+                continue
+
+            try:
+                jack_port = self.client.get_port_by_name(port_name)
+                stats.queries += 1
+                snapshot = set[tuple[str, str]]()
+                for cport in list_all_connections(self.client, jack_port):
+                    if jack_port.is_output:
+                        snapshot.add((port_name, cport.name))
+                    else:
+                        snapshot.add((cport.name, port_name))
+            except BaseException as e:
+                _logger.debug(
+                    f'Failed to get connections of new port {port_name}\n'
+                    f'{str(e)}')
+                continue
+
+            for conn in self.connections.with_port(port_name):
+                if conn not in snapshot:
+                    self.connections.remove(conn)
+                    stats.connections_fixed += 1
+                    self.peo.connection_removed(conn)
+
+            for conn in snapshot:
+                if self.connections.append(conn):
+                    stats.connections_fixed += 1
+                    self.peo.connection_added(conn)
+
+        if not_processed:
+            with self._registrations_lock:
+                self._registered_ports |= not_processed
+
     def check_pretty_names_export(self):
         client_names = set[str]()
         port_names = set[str]()
@@ -444,16 +568,24 @@ class PatchEngine:
 
         _logger.debug(f'refresh jack running {self.jack_running}')
         if self.jack_running:
-            self._collect_graph()
-            self.peo.server_restarted()
+            if self.incremental_refresh:
+                self._reconcile_graph()
+            else:
+                self._collect_graph()
+                self.peo.server_restarted()
 
         if self.alsa_mng is not None:
-            self.alsa_mng.add_all_ports()
+            if self.incremental_refresh:
+                self.alsa_mng.refresh()
+            else:
+                self.alsa_mng.add_all_ports()
 
     def remember_dsp_load(self):
         if self.client is None:
             return
 
+        self.poll_stats.wakeups += 1
+        self.poll_stats.dsp_queries += 1
         self.max_dsp_since_last_sent = max(
             self.max_dsp_since_last_sent,
             self.client.cpu_load())
@@ -465,6 +597,7 @@ class PatchEngine:
         current_dsp = int(self.max_dsp_since_last_sent + 0.5)
         if current_dsp != self.last_sent_dsp_load:
             self.peo.send_dsp_load(current_dsp)
+            self.poll_stats.dsp_sent += 1
             self.last_sent_dsp_load = current_dsp
         self.max_dsp_since_last_sent = 0.00
 
@@ -478,6 +611,11 @@ class PatchEngine:
         if self.client is None:
             return
 
+        self.poll_stats.wakeups += 1
+        now = time.monotonic()
+        if not self._transport_poll.due(now):
+            return
+
         try:
             state, pos_dict = self.client.transport_query()
         except BaseException as e:
@@ -485,8 +623,13 @@ class PatchEngine:
                             f'transport_query() failed\n{str(e)}')
             return
 
+        stats = self.poll_stats
+        stats.transport_queries += 1
+        last_poll = self._transport_poll.last_poll
+
         if (self.transport_wanted is TransportWanted.STATE_ONLY
                 and bool(state) == self.last_transport_pos.rolling):
+            self._transport_poll.polled(now, False)
             return
 
         transport_position = TransportPosition(
@@ -498,11 +641,23 @@ class PatchEngine:
             pos_dict.get('tick', 0),
             pos_dict.get('beats_per_minute', 0.0))
 
-        if transport_position == self.last_transport_pos:
+        # while rolling, each query gives a new position,
+        # so transport is polled at each call.
+        changed = transport_position != self.last_transport_pos
+        self._transport_poll.polled(now, changed)
+        if not changed:
             return
 
+        if last_poll:
+            latency = now - last_poll
+            stats.transport_changes += 1
+            stats.transport_latency_sum += latency
+            stats.transport_latency_max = max(
+                stats.transport_latency_max, latency)
+
         self.last_transport_pos = transport_position
         self.peo.send_transport_position(transport_position)
+        stats.transport_sent += 1
 
     def connect_ports(self, port_out_name: str, port_in_name: str,
                       disconnect=False) -> bool:
@@ -624,23 +779,9 @@ class PatchEngine:
             self.buffer_size = self.client.blocksize
             self.peo.server_restarted()
 
-        if (self.pretty_tmp_path is not None
-                and self.pretty_tmp_path.exists()):
-            # read the contents of pretty names set by this program
-            # in a previous run (with same daemon osc port).
-            try:
-                with open(self.pretty_tmp_path, 'r') as f:
-                    pretty_dict = json.load(f)
-                    if isinstance(pretty_dict, dict):
-                        self.uuid_pretty_names.clear()
-                        for key, value in pretty_dict.items():
-                            self.uuid_pretty_names[int(key)] = value
-            except ValueError:
-                _logger.warning(
-                    f'{self.pretty_tmp_path} badly written, ignored.')
-            except:
-                _logger.warning(
-                    f'Failed to read {self.pretty_tmp_path}, ignored.')
+        # read the contents of pretty names set by this program
+        # in a previous run (with same daemon osc port).
+        self.uuid_pretty_names.load()
 
         self.peo.is_now_ready()
 
@@ -681,36 +822,17 @@ class PatchEngine:
                 self.patch_event_queue.add(
                     PatchEvent.PORT_REMOVED, port_name)
 
-            # if not register:
-            #     return
-
-            if self.client is None:
-                return
-
-            # With PipeWire, some ports can be added (re-added in reality)
-            # with already existing connections, in the case of
-            # buffersize (quantum) change.
-            # So we check here existing connections of the port
-            try:
-                for cport in self.client.get_all_connections(port):
-                    cport_name = cport.name
-                    if register:
-                        event = PatchEvent.CONNECTION_ADDED
-                    else:
-                        event = PatchEvent.CONNECTION_REMOVED
-
-                    if port.is_output:
-                        event_args = (port_name, cport_name)
-                    else:
-                        event_args = (cport_name, port_name)
-
-                    self.patch_event_queue.add(event, *event_args)
-
-            except BaseException as e:
-                _logger.debug(
-                    f'New port {port_name} seems to already have connections '
-                    f'but getting theses ports failed\n'
-                    f'{str(e)}')
+            # Connections of registered ports are not queried here,
+            # but once the registrations burst is finished,
+            # see _reconcile_registered_ports.
+            # Connections of unregistered ports are already known.
+            with self._registrations_lock:
+                self.registration_stats.registrations += 1
+                self._last_registration = time.monotonic()
+                if register:
+                    self._registered_ports.add(port_name)
+                else:
+                    self._registered_ports.discard(port_name)
 
         @self.client.set_port_connect_callback
         def port_connect(port_a: jack.Port, port_b: jack.Port, connect: bool):
@@ -796,59 +918,61 @@ class PatchEngine:
                 f'It can easily create conflicts, especially for pretty-names'
             )
 
-    def _collect_graph(self):
-        if self.peo is None:
-            raise PatchEngineOuterMissing
-
-        self.ports.clear()
-        self.connections.clear()
-        self.metadatas.clear()
-
-        client_names = set[str]()
-        known_uuids = set[int]()
-
+    def _forget_port(self, port: PortData):
+        self.ports.remove(port)
+        # connections JACK may not have reported
+        # as removed before the port unregistration.
+        for conn in self.connections.remove_port(port.name):
+            self.peo.connection_removed(conn) # type:ignore
+        self.peo.port_removed(port.name) # type:ignore
+
+    def _read_ports(self) -> Iterator[tuple[PortData, Optional[list[str]]]]:
+        '''iter all ports of the JACK graph, with the names of the
+        ports connected to it if it is an output port (else None).'''
         if self.client is None:
             return
 
-        #get all currents Jack ports and connections
         for port in list_ports(self.client):
             flags = jack._lib.jack_port_flags(port._ptr) #type:ignore
-            port_name = port.name
-            port_uuid = port.uuid
             port_type = PortType.NULL
             if port.is_audio:
                 port_type = PortType.AUDIO_JACK
             elif port.is_midi:
                 port_type = PortType.MIDI_JACK
 
-            known_uuids.add(port_uuid)
-
-            self.ports.append(
-                PortData(port_name, port_type, flags, port_uuid))
-
-            client_names.add(port_name.partition(':')[0])
+            port_data = PortData(port.name, port_type, flags, port.uuid)
 
             if port.is_input:
+                yield port_data, None
                 continue
 
             # this port is output, list its connections
-            for conn_port in list_all_connections(self.client, port):
-                self.connections.append((port_name, conn_port.name))
+            yield port_data, [
+                p.name for p in list_all_connections(self.client, port)]
 
-        for client_name in client_names:
-            try:
-                client_uuid = int(
-                    self.client.get_uuid_for_client_name(client_name))
-            except jack.JackError:
-                continue
-            except ValueError:
-                _logger.warning(
-                    f"uuid for client name {client_name} is not digit")
-                continue
+    def _read_client_uuid(self, client_name: str) -> Optional[int]:
+        if self.client is None:
+            return None
 
-            self.client_name_uuids[client_name] = client_uuid
-            known_uuids.add(client_uuid)
+        try:
+            return int(self.client.get_uuid_for_client_name(client_name))
+        except jack.JackError:
+            return None
+        except ValueError:
+            _logger.warning(
+                f"uuid for client name {client_name} is not digit")
+            return None
+
+    def _read_client_name(self, uuid: int) -> Optional[str]:
+        if self.client is None:
+            return None
+
+        try:
+            return self.client.get_client_name_by_uuid(str(uuid))
+        except:
+            return None
 
+    def _read_properties(self) -> dict[int, dict[str, str]]:
         try:
             jack_properties = jack.get_all_properties()
         except:
@@ -856,48 +980,211 @@ class PatchEngine:
                 "Failed to get JACK properties, "
                 "JACK seems to be compiled without Metadatas support, "
                 "you can't rename ports in the graph.")
-            jack_properties = {}
+            return {}
+
+        return {uuid: {key: valuetype[0].decode()
+                       for key, valuetype in uuid_dict.items()}
+                for uuid, uuid_dict in jack_properties.items()}
+
+    def _check_locker(self, uuid: int, key: str, value: str):
+        if key != METADATA_LOCKER or uuid == self._client_uuid:
+            return
 
-        for uuid, uuid_dict in jack_properties.items():
+        if value.isdigit():
+            if self.auto_export_pretty_names.active:
+                self.auto_export_pretty_names = AutoExportPretty.ZOMBIE
+            self.pretty_names_lockers.add(uuid)
+            self.peo.send_pretty_names_locked(True) # type:ignore
+
+        elif not value and uuid in self.pretty_names_lockers:
+            self.pretty_names_lockers.discard(uuid)
+            self.peo.send_pretty_names_locked( # type:ignore
+                bool(self.pretty_names_lockers))
+
+    def _collect_graph(self):
+        if self.peo is None:
+            raise PatchEngineOuterMissing
+
+        self.ports.clear()
+        self.connections.clear()
+        self.metadatas.clear()
+        with self._registrations_lock:
+            self._registered_ports.clear()
+
+        if self.client is None:
+            return
+
+        if self.stream_graph:
+            # engine state is empty, all the graph will be sent
+            self._reconcile_graph()
+            return
+
+        client_names = set[str]()
+        known_uuids = set[int]()
+
+        #get all currents Jack ports and connections
+        for port_data, conn_names in self._read_ports():
+            port_name = port_data.name
+            known_uuids.add(port_data.uuid)
+            self.ports.append(port_data)
+            client_names.add(port_name.partition(':')[0])
+
+            for conn_name in conn_names or ():
+                self.connections.append((port_name, conn_name))
+
+        for client_name in client_names:
+            client_uuid = self._read_client_uuid(client_name)
+            if client_uuid is None:
+                continue
+
+            self.client_name_uuids[client_name] = client_uuid
+            known_uuids.add(client_uuid)
+
+        for uuid, uuid_dict in self._read_properties().items():
             if uuid not in known_uuids:
                 # uuid seems to not belong to a port,
                 # or to a client containing ports.
                 # It very probably belongs to a client without ports.
-                try:
-                    client_name = \
-                        self.client.get_client_name_by_uuid(str(uuid))
-                except:
-                    ...
-                else:
+                client_name = self._read_client_name(uuid)
+                if client_name is not None:
                     self.client_name_uuids[client_name] = uuid
 
-            for key, valuetype in uuid_dict.items():
-                value = valuetype[0].decode()
+            for key, value in uuid_dict.items():
+                self.metadatas.add(uuid, key, value)
+                self._check_locker(uuid, key, value)
+
+    def _reconcile_metadatas(self, uuid: int, uuid_dict: dict[str, str]):
+        '''send metadatas of uuid which differ from the engine state'''
+        old_dict = dict(self.metadatas.get(uuid, {}))
+
+        for key in old_dict:
+            if key not in uuid_dict:
+                self.metadatas.add(uuid, key, '')
+                self.peo.metadata_updated(uuid, key, '') # type:ignore
+                self._check_locker(uuid, key, '')
+
+        for key, value in uuid_dict.items():
+            if old_dict.get(key) != value:
                 self.metadatas.add(uuid, key, value)
+                self.peo.metadata_updated(uuid, key, value) # type:ignore
+                self._check_locker(uuid, key, value)
+
+    def _reconcile_graph(self):
+        '''Read the JACK graph and send to the outer interface
+        only differences with the engine state.
+
+        Differences are sent while the graph is read,
+        `peo.graph_chunk_sent` is called every GRAPH_CHUNK ports.
+        With an empty engine state, it streams all the graph.'''
+        if self.client is None:
+            return
+        if self.peo is None:
+            raise PatchEngineOuterMissing
+
+        start = time.perf_counter()
+
+        with self._registrations_lock:
+            self._registered_ports.clear()
+
+        # properties are read first, so metadatas of a port or a client
+        # can be sent just after it.
+        properties = self._read_properties()
+        seen_uuids = set[int]()
+        seen_ports = set[str]()
+        seen_clients = set[str]()
+        waiting_conns = list[tuple[str, str]]()
+        n_ports = 0
+
+        for port_data, conn_names in self._read_ports():
+            port_name = port_data.name
+            seen_ports.add(port_name)
+
+            client_name = port_name.partition(':')[0]
+            if client_name not in seen_clients:
+                seen_clients.add(client_name)
+                client_uuid = self._read_client_uuid(client_name)
+                if client_uuid is not None:
+                    seen_uuids.add(client_uuid)
+                    if self.client_name_uuids.get(client_name) != client_uuid:
+                        self.client_name_uuids[client_name] = client_uuid
+                        self.peo.associate_client_name_and_uuid(
+                            client_name, client_uuid)
+                    self._reconcile_metadatas(
+                        client_uuid, properties.pop(client_uuid, {}))
+
+            port = self.ports.from_name(port_name)
+            if port is not None and (port.uuid != port_data.uuid
+                                     or port.type is not port_data.type
+                                     or port.flags != port_data.flags):
+                # not the same port, re-created with the same name
+                self._forget_port(port)
+                port = None
+
+            if port is None:
+                self.ports.append(port_data)
+                self.peo.port_added(
+                    port_name, port_data.type, port_data.flags,
+                    port_data.uuid)
+
+            seen_uuids.add(port_data.uuid)
+            self._reconcile_metadatas(
+                port_data.uuid, properties.pop(port_data.uuid, {}))
+
+            if conn_names is not None:
+                conns = [(port_name, conn_name) for conn_name in conn_names]
+                for conn in list(self.connections.from_port(port_name)):
+                    if conn not in conns:
+                        self.connections.remove(conn)
+                        self.peo.connection_removed(conn)
+
+                for conn in conns:
+                    if conn[1] not in seen_ports:
+                        # input port not read yet, it may be re-created
+                        # and forgotten with its connections.
+                        waiting_conns.append(conn)
+                    elif self.connections.append(conn):
+                        self.peo.connection_added(conn)
+
+            n_ports += 1
+            if not n_ports % GRAPH_CHUNK:
+                self.peo.graph_chunk_sent()
+
+        for port in [p for p in self.ports if p.name not in seen_ports]:
+            self._forget_port(port)
+
+        for conn in waiting_conns:
+            if (conn[1] in seen_ports
+                    and self.connections.append(conn)):
+                self.peo.connection_added(conn)
+
+        for uuid, uuid_dict in properties.items():
+            if self.client_name_uuids.name_from_uuid(uuid) is None:
+                # uuid very probably belongs to a client without ports.
+                client_name = self._read_client_name(uuid)
+                if client_name is not None:
+                    self.client_name_uuids[client_name] = uuid
+                    self.peo.associate_client_name_and_uuid(
+                        client_name, uuid)
+
+            seen_uuids.add(uuid)
+            self._reconcile_metadatas(uuid, uuid_dict)
 
-                if (key == METADATA_LOCKER
-                        and uuid != self._client_uuid and value.isdigit()):
-                    if self.auto_export_pretty_names.active:
-                        self.auto_export_pretty_names = \
-                            AutoExportPretty.ZOMBIE
-                    self.pretty_names_lockers.add(uuid)
-                    self.peo.send_pretty_names_locked(True)
+        for uuid in [u for u in self.metadatas if u not in seen_uuids]:
+            self._reconcile_metadatas(uuid, {})
+            self.metadatas.remove_uuid(uuid)
+
+        self.peo.graph_chunk_sent()
+        _logger.debug(
+            f'graph reconciled, {n_ports} ports read in '
+            f'{time.perf_counter() - start:.3f}s')
 
     def _save_uuid_pretty_names(self):
-        '''save the contents of self.uuid_pretty_names in /tmp
+        '''save the changes of self.uuid_pretty_names in /tmp
 
         In order to recognize which JACK pretty names have been set
         by this program (in this process or not), pretty names are
         saved somewhere in the /tmp directory.'''
-        if self.pretty_tmp_path is None:
-            return
-
-        try:
-            self.pretty_tmp_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.pretty_tmp_path, 'w') as f:
-                json.dump(self.uuid_pretty_names, f)
-        except:
-            _logger.warning(f'Failed to save {self.pretty_tmp_path}')
+        self.uuid_pretty_names.save()
 
     def _set_jack_pretty_name(self, uuid: int, pretty_name: str):
         'write pretty-name metadata, or remove it if value is empty'
@@ -994,17 +1281,15 @@ class PatchEngine:
         self._set_jack_pretty_name(port.uuid, pretty_name)
         self._save_uuid_pretty_names()
 
-    def set_jack_pretty_name_conditionally(
-            self, for_client: bool, name: str, uuid: int) -> bool:
-        '''set jack pretty name if checks are ok.
+    def _pretty_name_to_export(
+            self, for_client: bool, name: str, uuid: int,
+            mdata_pretty_name: str) -> str:
+        '''return the custom name to write as jack pretty name
+        if checks are ok, else an empty string.
         checks are :
         - a custom name exists for this item
         - this custom name is not the current pretty name
-        - the current pretty name is empty or known to be overwritable
-
-        return False if one of theses checks fails.'''
-
-        mdata_pretty_name = jack_pretty_name(uuid)
+        - the current pretty name is empty or known to be overwritable'''
         if for_client:
             ptov = self.custom_names.groups.get(name)
         else:
@@ -1013,7 +1298,7 @@ class PatchEngine:
         if (ptov is None
                 or not ptov.custom
                 or ptov.custom == mdata_pretty_name):
-            return False
+            return ''
 
         if (mdata_pretty_name
                 and ptov.above_pretty
@@ -1027,11 +1312,49 @@ class PatchEngine:
                 f"  wanted   : '{ptov.custom}'\n"
                 f"  above    : '{ptov.above_pretty}'\n"
                 f"  existing : '{mdata_pretty_name}'\n")
+            return ''
+
+        return ptov.custom
+
+    def set_jack_pretty_name_conditionally(
+            self, for_client: bool, name: str, uuid: int) -> bool:
+        '''set jack pretty name if checks are ok
+        (see _pretty_name_to_export).
+
+        return False if one of theses checks fails.'''
+        pretty_name = self._pretty_name_to_export(
+            for_client, name, uuid, jack_pretty_name(uuid))
+        if not pretty_name:
             return False
 
-        self._set_jack_pretty_name(uuid, ptov.custom)
+        self._set_jack_pretty_name(uuid, pretty_name)
         return True
 
+    def _export_pretty_names(
+            self, pretty_names: dict[int, str],
+            jack_pretties: dict[int, str]) -> int:
+        '''write pretty_names ('uuid: pretty_name', empty pretty_name
+        to remove it) to JACK metadatas, except those already having
+        this value in jack_pretties, in one batch.
+
+        return the number of writes.'''
+        stats = self.pretty_export_stats
+        writes = 0
+
+        for uuid, pretty_name in pretty_names.items():
+            if jack_pretties.get(uuid, '') == pretty_name:
+                stats.unchanged += 1
+                continue
+
+            self._set_jack_pretty_name(uuid, pretty_name)
+            writes += 1
+
+        stats.exports += 1
+        stats.writes += writes
+        stats.last_writes = writes
+        _logger.info(f'pretty-names export: {writes} writes')
+        return writes
+
     def set_pretty_names_auto_export(self, active: bool, force=False):
         if self.pretty_names_lockers:
             if active:
@@ -1048,22 +1371,34 @@ class PatchEngine:
         if self.client is None:
             return
 
+        jack_pretties = jack_pretty_names()
+        pretty_names = dict[int, str]()
+
         if active:
             self.auto_export_pretty_names = AutoExportPretty.YES
             self._write_locker_mdata()
 
             for client_name, client_uuid in self.client_name_uuids.items():
-                self.set_jack_pretty_name_conditionally(
-                    True, client_name, client_uuid)
-
+                pretty_name = self._pretty_name_to_export(
+                    True, client_name, client_uuid,
+                    jack_pretties.get(client_uuid, ''))
+                if pretty_name:
+                    pretty_names[client_uuid] = pretty_name
+
+            # ports not known yet will be exported
+            # by check_pretty_names_export once registered.
             for port_name in self.custom_names.ports:
-                try:
-                    port = self.client.get_port_by_name(port_name)
-                except jack.JackError:
+                port_data = self.ports.from_name(port_name)
+                if port_data is None:
                     continue
 
-                self.set_jack_pretty_name_conditionally(
-                    False, port_name, port.uuid)
+                pretty_name = self._pretty_name_to_export(
+                    False, port_name, port_data.uuid,
+                    jack_pretties.get(port_data.uuid, ''))
+                if pretty_name:
+                    pretty_names[port_data.uuid] = pretty_name
+
+            self._export_pretty_names(pretty_names, jack_pretties)
 
         else:
             self.auto_export_pretty_names = AutoExportPretty.NO
@@ -1075,22 +1410,21 @@ class PatchEngine:
                 if client_uuid not in self.uuid_pretty_names:
                     continue
 
-                mdata_pretty_name = jack_pretty_name(client_uuid)
+                mdata_pretty_name = jack_pretties.get(client_uuid, '')
                 custom_name = self.custom_names.custom_group(client_name)
                 if custom_name == mdata_pretty_name:
-                    self._set_jack_pretty_name(client_uuid, '')
+                    pretty_names[client_uuid] = ''
 
-            for port in list_ports(self.client):
-                port_uuid = port.uuid
-                if port_uuid not in self.uuid_pretty_names:
+            for port_data in self.ports:
+                if port_data.uuid not in self.uuid_pretty_names:
                     continue
 
-                port_name = port.name
-                mdata_pretty_name = jack_pretty_name(port_uuid)
-                custom_name = self.custom_names.custom_port(port_name)
+                mdata_pretty_name = jack_pretties.get(port_data.uuid, '')
+                custom_name = self.custom_names.custom_port(port_data.name)
                 if custom_name == mdata_pretty_name:
-                    self._set_jack_pretty_name(port_uuid, '')
+                    pretty_names[port_data.uuid] = ''
 
+            self._export_pretty_names(pretty_names, jack_pretties)
             self.uuid_pretty_names.clear()
 
         self._save_uuid_pretty_names()
@@ -1099,9 +1433,10 @@ class PatchEngine:
             self) -> tuple[dict[str, str], dict[str, str]]:
         clients_dict = dict[str, str]()
         ports_dict = dict[str, str]()
+        jack_pretties = jack_pretty_names()
 
         for client_name, uuid in self.client_name_uuids.items():
-            jack_pretty = jack_pretty_name(uuid)
+            jack_pretty = jack_pretties.get(uuid, '')
             if not jack_pretty:
                 continue
 
@@ -1111,7 +1446,7 @@ class PatchEngine:
                 clients_dict[client_name] = jack_pretty
 
         for jport in self.ports:
-            jack_pretty = jack_pretty_name(jport.uuid)
+            jack_pretty = jack_pretties.get(jport.uuid, '')
             if not jack_pretty:
                 continue
 
@@ -1123,20 +1458,28 @@ class PatchEngine:
         return clients_dict, ports_dict
 
     def export_all_custom_names_to_jack_now(self):
+        pretty_names = dict[int, str]()
+
         for client_name, uuid in self.client_name_uuids.items():
             pretty_name = self.custom_names.custom_group(client_name)
             if pretty_name:
-                self._set_jack_pretty_name(uuid, pretty_name)
+                pretty_names[uuid] = pretty_name
 
         for jport in self.ports:
             pretty_name = self.custom_names.custom_port(jport.name)
             if pretty_name:
-                self._set_jack_pretty_name(jport.uuid, pretty_name)
+                pretty_names[jport.uuid] = pretty_name
+
+        self._export_pretty_names(pretty_names, jack_pretty_names())
 
     def clear_all_pretty_names_from_jack(self):
+        pretty_names = dict[int, str]()
+
         for uuid, uuid_dict in self.metadatas.items():
             if JackMetadata.PRETTY_NAME in uuid_dict:
-                self._set_jack_pretty_name(uuid, '')
+                pretty_names[uuid] = ''
+
+        self._export_pretty_names(pretty_names, jack_pretty_names())
 
         if self.auto_export_pretty_names.active:
             self.set_pretty_names_auto_export(True, force=True)
@@ -1149,6 +1492,7 @@ class PatchEngine:
             self.client.transport_start()
         else:
             self.client.transport_stop()
+        self._transport_poll.wake_up()
 
     def transport_stop(self):
         if self.client is None:
@@ -1156,8 +1500,10 @@ class PatchEngine:
 
         self.client.transport_stop()
         self.client.transport_locate(0)
+        self._transport_poll.wake_up()
 
     def transport_relocate(self, frame: int):
         if self.client is None:
             return
-        self.client.transport_locate(frame)
\ No newline at end of file
+        self.client.transport_locate(frame)
+        self._transport_poll.wake_up()
\ No newline at end of file
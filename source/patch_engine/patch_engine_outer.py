@@ -19,6 +19,7 @@ class PatchEngineOuter:
     def metadata_updated(self, uuid: int, key: str, value: str):...
     def connection_added(self, connection: tuple[str, str]):...
     def connection_removed(self, connection: tuple[str, str]):...
+    def graph_chunk_sent(self):...
     def server_stopped(self):...
     def send_transport_position(self, tpos: TransportPosition):...
     def send_dsp_load(self, dsp_load: int):...
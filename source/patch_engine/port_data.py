@@ -5,6 +5,8 @@ from patshared import PortType
 
 
 class PortData:
+    __slots__ = ('name', 'type', 'flags', 'uuid')
+
     name: str
     type: PortType
     flags: int
@@ -17,7 +19,9 @@ class PortData:
         self.uuid = uuid
 
 
-class PortDataList(list[PortData]):
+class PortDataList(dict[PortData, None]):
+    '''Insertion ordered set of PortData, indexed by name and uuid.
+    Iteration yields PortData.'''
     def __init__(self):
         super().__init__()
         self._name_d = dict[str, PortData]()
@@ -26,12 +30,12 @@ class PortDataList(list[PortData]):
     def append(self, port_data: PortData):
         self._name_d[port_data.name] = port_data
         self._uuid_d[port_data.uuid] = port_data
-        super().append(port_data)
+        self[port_data] = None
 
     def remove(self, port_data: PortData):
         self._name_d.pop(port_data.name)
         self._uuid_d.pop(port_data.uuid)
-        super().remove(port_data)
+        del self[port_data]
 
     def clear(self):
         self._name_d.clear()
@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+
+_logger = logging.getLogger(__name__)
+
+JOURNAL_MIN_COMPACT = 256
+'''the file is compacted when its journal has more lines than this
+and than the number of pretty-names.'''
+
+
+class UuidPrettyNames(dict[int, str]):
+    '''Contains pairs of 'uuid: pretty_name' of all pretty_names
+    exported to JACK metadatas by this program.
+
+    They are saved in a file, in order to recognize which JACK
+    pretty names have been set by this program (in this process or not).
+    The first line of the file is a JSON dict of all pretty-names,
+    following lines are a journal of changes, one JSON list
+    [uuid, pretty_name] per line, with a null pretty_name
+    when it has been removed.
+
+    Only changes since last save are appended to the file,
+    it is rewritten (atomically) when the journal becomes too long.'''
+
+    def __init__(self, path: Optional[Path]=None):
+        super().__init__()
+        self.path = path
+        self._changes = dict[int, Optional[str]]()
+        self._must_compact = True
+        self._journal_len = 0
+        self.written_bytes = 0
+        'number of bytes written to the file since start'
+        self.compactions = 0
+        'number of whole file rewrites since start'
+
+    def __setitem__(self, uuid: int, pretty_name: str):
+        super().__setitem__(uuid, pretty_name)
+        self._changes[uuid] = pretty_name
+
+    def __delitem__(self, uuid: int):
+        super().__delitem__(uuid)
+        self._changes[uuid] = None
+
+    def pop(self, uuid: int, *default):
+        if uuid in self:
+            self._changes[uuid] = None
+        return super().pop(uuid, *default)
+
+    def clear(self):
+        super().clear()
+        self._changes.clear()
+        self._must_compact = True
+
+    def load(self):
+        '''read the file, replaying its journal'''
+        if self.path is None or not self.path.exists():
+            return
+
+        super().clear()
+        self._changes.clear()
+
+        # a file not ending with a new line (written by an older version,
+        # or with an interrupted write) can not be appended.
+        clean_end = True
+
+        try:
+            with open(self.path, 'r') as f:
+                line = f.readline()
+                clean_end = line.endswith('\n')
+                pretty_dict = json.loads(line)
+                if not isinstance(pretty_dict, dict):
+                    raise ValueError
+                for key, value in pretty_dict.items():
+                    super().__setitem__(int(key), value)
+
+                self._journal_len = 0
+                for line in f:
+                    self._journal_len += 1
+                    clean_end = line.endswith('\n')
+                    try:
+                        uuid, pretty_name = json.loads(line)
+                    except (ValueError, TypeError):
+                        # probably an interrupted write
+                        _logger.warning(
+                            f'{self.path} has a bad journal line, ignored.')
+                        clean_end = False
+                        continue
+
+                    if pretty_name is None:
+                        super().pop(uuid, None)
+                    else:
+                        super().__setitem__(uuid, pretty_name)
+
+        except ValueError:
+            _logger.warning(f'{self.path} badly written, ignored.')
+            super().clear()
+            self._must_compact = True
+        except:
+            _logger.warning(f'Failed to read {self.path}, ignored.')
+            super().clear()
+            self._must_compact = True
+        else:
+            self._must_compact = not clean_end
+
+    def _compact(self):
+        assert self.path is not None
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        contents = json.dumps(self) + '\n'
+
+        with open(tmp_path, 'w') as f:
+            f.write(contents)
+        os.replace(tmp_path, self.path)
+
+        self.written_bytes += len(contents)
+        self.compactions += 1
+        self._journal_len = 0
+
+    def _append_changes(self):
+        assert self.path is not None
+        contents = ''.join(
+            json.dumps([uuid, pretty_name]) + '\n'
+            for uuid, pretty_name in self._changes.items())
+
+        with open(self.path, 'a') as f:
+            f.write(contents)
+
+        self.written_bytes += len(contents)
+        self._journal_len += len(self._changes)
+
+    def save(self):
+        if self.path is None:
+            return
+
+        if not self._changes and not self._must_compact:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            if (self._must_compact
+                    or not self.path.exists()
+                    or (self._journal_len + len(self._changes)
+                        > max(JOURNAL_MIN_COMPACT, len(self)))):
+                self._compact()
+            else:
+                self._append_changes()
+        except:
+            _logger.warning(f'Failed to save {self.path}')
+            # next save will rewrite all the file
+            self._must_compact = True
+        else:
+            self._must_compact = False
+
+        self._changes.clear()
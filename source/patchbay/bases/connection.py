@@ -59,32 +59,49 @@ class Connection:
         self.in_canvas = False
         
 
-class Connections(list[Connection]):
+class Connections(dict[Connection, None]):
+    '''Insertion ordered set of connections, indexed by groups.
+    Iteration yields connections.'''
     def __init__(self):
         super().__init__()
-        self._group_out: 'dict[Group, list[Connection]]' = {}
-        self._group_in: 'dict[Group, list[Connection]]' = {}
+        self._group_out: 'dict[Group, dict[Connection, None]]' = {}
+        self._group_in: 'dict[Group, dict[Connection, None]]' = {}
     
     def append(self, conn: Connection):
-        super().append(conn)
+        self[conn] = None
         
         group_ins = self._group_in.get(conn.port_in.group)
         if group_ins is None:
             group_ins = self._group_in[conn.port_in.group] = \
-                list[Connection]()
+                dict[Connection, None]()
                 
         group_outs = self._group_out.get(conn.port_out.group)
         if group_outs is None:
             group_outs = self._group_out[conn.port_out.group] = \
-                list[Connection]()
+                dict[Connection, None]()
 
-        group_ins.append(conn)
-        group_outs.append(conn)
+        group_ins[conn] = None
+        group_outs[conn] = None
         
     def remove(self, conn: Connection):
-        super().remove(conn)
-        self._group_in[conn.port_in.group].remove(conn)
-        self._group_out[conn.port_out.group].remove(conn)
+        del self[conn]
+
+        group_in = conn.port_in.group
+        group_ins = self._group_in[group_in]
+        del group_ins[conn]
+        if not group_ins:
+            del self._group_in[group_in]
+
+        group_out = conn.port_out.group
+        group_outs = self._group_out[group_out]
+        del group_outs[conn]
+        if not group_outs:
+            del self._group_out[group_out]
+
+    def clear(self):
+        super().clear()
+        self._group_in.clear()
+        self._group_out.clear()
 
     def from_group(self, group: 'Group') -> Iterator[Connection]:
         group_out = self._group_out.get(group)
@@ -103,14 +120,14 @@ class Connections(list[Connection]):
             yield conn
             
     def with_group(self, group: 'Group') -> Iterator[Connection]:
-        already = set[Connection]()
         group_out = self._group_out.get(group)
         if group_out is not None:
             for conn in group_out:
-                already.add(conn)
                 yield conn
+
         group_in = self._group_in.get(group)
         if group_in is not None:
             for conn in group_in:
-                if conn not in already:
-                    yield conn
\ No newline at end of file
+                # connections from group to itself are already yielded
+                if conn.port_out.group is not group:
+                    yield conn
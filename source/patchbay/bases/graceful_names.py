@@ -0,0 +1,214 @@
+'''Rules to make port names more readable, for known programs.
+
+Each rule takes the port short name and returns the graceful name,
+and the last digit to add to it if the next port of the portgroup
+is found (else an empty string).'''
+
+from functools import lru_cache
+from typing import Callable, TypeAlias
+
+
+GracefulRule: TypeAlias = Callable[[str], tuple[str, str]]
+
+
+def _split_end_digits(name: str) -> tuple[str, str]:
+    num = ''
+    while name and name[-1].isdigit():
+        num = name[-1] + num
+        name = name[:-1]
+
+    if num.startswith('0') and num not in ('0', '09'):
+        num = num[1:]
+
+    return (name, num)
+
+def _cut_end(name: str, *ends: str) -> str:
+    for end in ends:
+        if name.endswith(end):
+            return name.rsplit(end)[0]
+    return name
+
+def _numbered_rule(ends: tuple[str, ...], first_num='1') -> GracefulRule:
+    '''rule for names like "track/audio_out 1", "track/audio_out 2".
+    The first number is not displayed until the next port appears.'''
+    def rule(display_name: str) -> tuple[str, str]:
+        display_name, num = _split_end_digits(display_name)
+        if not num:
+            return display_name, ''
+
+        display_name = _cut_end(display_name, *ends)
+        if num == first_num:
+            return display_name, first_num
+        return display_name + ' ' + num, ''
+
+    return rule
+
+def _firewire_pcm(display_name: str) -> tuple[str, str]:
+    if '(' in display_name and ')' in display_name:
+        after_para = display_name.partition('(')[2]
+        display_name = after_para.rpartition(')')[0]
+        display_name, num = _split_end_digits(display_name)
+
+        if num:
+            if display_name.endswith(':'):
+                display_name = display_name[:-1]
+            display_name += ' ' + num
+    else:
+        display_name = display_name.partition('_')[2]
+        display_name = _cut_end(display_name, '_in', '_out')
+        display_name = display_name.replace(':', ' ')
+        display_name, num = _split_end_digits(display_name)
+        display_name = display_name + num
+
+    return display_name, ''
+
+def _hydrogen(display_name: str) -> tuple[str, str]:
+    if display_name.startswith('Track_'):
+        display_name = display_name.replace('Track_', '', 1)
+
+        num, udsc, name = display_name.partition('_')
+        if num.isdigit():
+            display_name = num + ' ' + name
+
+    if display_name.endswith('_Main_L'):
+        display_name = display_name.replace('_Main_L', ' L', 1)
+    elif display_name.endswith('_Main_R'):
+        display_name = display_name.replace('_Main_R', ' R', 1)
+
+    return display_name, ''
+
+def _a2j(display_name: str) -> tuple[str, str]:
+    display_name, num = _split_end_digits(display_name)
+    if not num:
+        return display_name, ''
+
+    if display_name.endswith(' MIDI '):
+        display_name = _cut_end(display_name, ' MIDI ')
+        if num == '1':
+            return display_name, '1'
+        return display_name + ' ' + num, ''
+
+    if display_name.endswith(' Port-'):
+        display_name = _cut_end(display_name, ' Port-')
+        if num == '0':
+            return display_name, '0'
+        return display_name + ' ' + num, ''
+
+    return display_name, ''
+
+_ardour_numbered = _numbered_rule(
+    ('/audio_out ', '/audio_in ', '/midi_out ', '/midi_in '))
+
+def _ardour(display_name: str) -> tuple[str, str]:
+    if '/TriggerBox/' in display_name:
+        display_name = '▸ ' + display_name.replace('/TriggerBox/', '/', 1)
+
+    if display_name in ('physical_audio_input_monitor_enable',
+                        'physical_midi_input_monitor_enable'):
+        return 'physical monitor', ''
+
+    return _ardour_numbered(display_name)
+
+def _jack_mixer(display_name: str) -> tuple[str, str]:
+    prefix, out, side = display_name.rpartition(' Out')
+    if out and side in (' L', ' R', ''):
+        display_name = prefix + side
+    return display_name, ''
+
+def _luppp(display_name: str) -> tuple[str, str]:
+    if display_name.endswith('\n'):
+        display_name = display_name[:-1]
+    return display_name.replace('_', ' '), ''
+
+def _seq64(display_name: str) -> tuple[str, str]:
+    return display_name.replace('seq64 midi ', '', 1), ''
+
+def _seq192(display_name: str) -> tuple[str, str]:
+    return display_name.replace('seq192 ', '', 1), ''
+
+def _calfjackhost(display_name: str) -> tuple[str, str]:
+    display_name, num = _split_end_digits(display_name)
+    if num:
+        display_name = _cut_end(display_name, ' Out #', ' In #')
+        display_name += ' ' + num
+    return display_name, ''
+
+def _rakarrack_plus(display_name: str) -> tuple[str, str]:
+    if display_name.startswith(('rakarrack-plus ', 'rakarrack-plus.')):
+        display_name = display_name[15:]
+    return display_name.replace('_', ' '), ''
+
+def _zrythm(display_name: str) -> tuple[str, str]:
+    if '/' in display_name:
+        if display_name.endswith((' L', ' R')):
+            display_name = (display_name.rpartition('/')[0]
+                            + ' ' + display_name.rpartition(' ')[2])
+        else:
+            display_name = display_name.rpartition('/')[0]
+    return display_name, ''
+
+def _default(display_name: str) -> tuple[str, str]:
+    display_name = display_name.replace('_', ' ')
+    match display_name.lower():
+        case s if s.endswith(('-left', ' left')):
+            display_name = display_name[:-5] + ' L'
+        case s if s.endswith(('-right', ' right')):
+            display_name = display_name[:-6] + ' R'
+        case 'left in':
+            display_name = 'In L'
+        case 'right in':
+            display_name = 'In R'
+        case 'left out':
+            display_name = 'Out L'
+        case 'right out':
+            display_name = 'Out R'
+
+    if display_name.startswith('Audio'):
+        display_name = display_name.replace('Audio ', '')
+
+    return display_name, ''
+
+
+GRACEFUL_RULES: dict[str, GracefulRule] = {
+    'firewire_pcm': _firewire_pcm,
+    'Hydrogen': _hydrogen,
+    'a2j': _a2j,
+    'ardour': _ardour,
+    'Ardour': _ardour,
+    'Mixbus': _ardour,
+    'mixbus': _ardour,
+    'Qtractor': _numbered_rule(('/in_', '/out_')),
+    'Non-Mixer': _numbered_rule(('/in-', '/out-')),
+    'Non-Mixer-XT': _numbered_rule(('/in-', '/out-')),
+    'jack_mixer': _jack_mixer,
+    'SooperLooper': _numbered_rule(('_in_', '_out_')),
+    'sooperlooper': _numbered_rule(('_in_', '_out_')),
+    'Luppp': _luppp,
+    'seq64': _seq64,
+    'seq192': _seq192,
+    'calfjackhost': _calfjackhost,
+    'rakarrack-plus': _rakarrack_plus,
+    'Zrythm': _zrythm,
+}
+'''graceful rule for each program name,
+programs not in this dict use the default rule.'''
+
+
+@lru_cache(maxsize=16384)
+def graceful_port_name(
+        program_name: str, short_name: str,
+        midi_bridge: bool) -> tuple[str, str]:
+    '''return the graceful name of a port and the last digit to add
+    to it (or an empty string). midi_bridge is True for ports
+    of the PipeWire Midi-Bridge.'''
+    display_name, last_digit = \
+        GRACEFUL_RULES.get(program_name, _default)(short_name)
+
+    # reduce graceful name for pipewire Midi-Bridge with
+    # option jack.filter_name = true
+    if midi_bridge and display_name.startswith(('capture_', 'playback_')):
+        display_name = display_name.partition('_')[2]
+
+    if not display_name:
+        return short_name, last_digit
+    return display_name, last_digit
@@ -18,6 +18,7 @@ from icon_finder import get_icon_name_for
 from .elements import (
     JackPortFlag, CanvasOptimizeIt, Tracks, port_full_type_to_ptv_flag)
 from .port import Port
+from .graceful_names import graceful_port_name
 from .portgroup import Portgroup
 from .connection import Connection
 
@@ -308,10 +309,16 @@ class Group:
             for port in self.ports:
                 port.remove_from_canvas()
 
+        ports_by_ids = self.manager._ports_by_ids
+        for port in self.ports:
+            ports_by_ids.pop((self.group_id, port.port_id), None)
+
         self.portgroups.clear()
         self.ports.clear()
 
         for track in self.tracks:
+            for port in track.ports:
+                ports_by_ids.pop((track.group_id, port.port_id), None)
             track.portgroups.clear()
             track.ports.clear()
 
@@ -352,17 +359,25 @@ class Group:
 
         self.manager._ports_by_name[port.full_name] = port
         self.manager._ports_by_uuid[port.uuid] = port
+        self.manager._ports_by_ids[(self.group_id, port.port_id)] = port
         self.check_port_track(port)
 
     def remove_port(self, port: Port):
+        ports_by_ids = self.manager._ports_by_ids
+        if port.track is not None:
+            # port may already have been removed from its track
+            ports_by_ids.pop((port.track.group_id, port.port_id), None)
+
         for track in self.tracks:
             if port in track.ports:
                 track.ports.remove(port)
+                ports_by_ids.pop((track.group_id, port.port_id), None)
                 break
 
         if port in self.ports:
             port.remove_from_canvas()
             self.ports.remove(port)
+            ports_by_ids.pop((self.group_id, port.port_id), None)
 
     def remove_portgroup(self, portgroup: Portgroup):
         # remove portgroup from track if any
@@ -585,23 +600,6 @@ class Group:
         return ''
 
     def graceful_port(self, port: Port):
-        def split_end_digits(name: str) -> tuple[str, str]:
-            num = ''
-            while name and name[-1].isdigit():
-                num = name[-1] + num
-                name = name[:-1]
-
-            if num.startswith('0') and num not in ('0', '09'):
-                num = num[1:]
-
-            return (name, num)
-
-        def cut_end(name: str, *ends: str) -> str:
-            for end in ends:
-                if name.endswith(end):
-                    return name.rsplit(end)[0]
-            return name
-
         program_name = self.program_name
 
         if (not program_name
@@ -612,186 +610,24 @@ class Group:
                 and port.flags & JackPortFlag.IS_PHYSICAL):
             program_name = 'a2j'
 
-        display_name = port.short_name
-        s_display_name = display_name
-
-        match program_name:
-            case 'firewire_pcm':
-                if '(' in display_name and ')' in display_name:
-                    after_para = display_name.partition('(')[2]
-                    display_name = after_para.rpartition(')')[0]
-                    display_name, num = split_end_digits(display_name)
-
-                    if num:
-                        if display_name.endswith(':'):
-                            display_name = display_name[:-1]
-                        display_name += ' ' + num
-                else:
-                    display_name = display_name.partition('_')[2]
-                    display_name = cut_end(display_name, '_in', '_out')
-                    display_name = display_name.replace(':', ' ')
-                    display_name, num = split_end_digits(display_name)
-                    display_name = display_name + num
-
-            case 'Hydrogen':
-                if display_name.startswith('Track_'):
-                    display_name = display_name.replace('Track_', '', 1)
-
-                    num, udsc, name = display_name.partition('_')
-                    if num.isdigit():
-                        display_name = num + ' ' + name
-
-                if display_name.endswith('_Main_L'):
-                    display_name = display_name.replace('_Main_L', ' L', 1)
-                elif display_name.endswith('_Main_R'):
-                    display_name = display_name.replace('_Main_R', ' R', 1)
-
-            case 'a2j':
-                display_name, num = split_end_digits(display_name)
-                if num:
-                    if display_name.endswith(' MIDI '):
-                        display_name = cut_end(display_name, ' MIDI ')
-
-                        if num == '1':
-                            port.last_digit_to_add = '1'
-                        else:
-                            display_name += ' ' + num
-
-                    elif display_name.endswith(' Port-'):
-                        display_name = cut_end(display_name, ' Port-')
-
-                        if num == '0':
-                            port.last_digit_to_add = '0'
-                        else:
-                            display_name += ' ' + num
-
-            case 'ardour'|'Ardour'|'Mixbus'|'mixbus':
-                if '/TriggerBox/' in display_name:
-                    display_name = \
-                        '▸ ' + display_name.replace('/TriggerBox/', '/', 1)
-
-                for pt in ('audio', 'midi'):
-                    if display_name == f"physical_{pt}_input_monitor_enable":
-                        display_name = "physical monitor"
-                        break
-                else:
-                    display_name, num = split_end_digits(display_name)
-                    if num:
-                        display_name = cut_end(
-                            display_name,
-                            '/audio_out ', '/audio_in ',
-                            '/midi_out ', '/midi_in ')
-                        if num == '1':
-                            port.last_digit_to_add = '1'
-                        else:
-                            display_name += ' ' + num
-
-            case 'Qtractor':
-                display_name, num = split_end_digits(display_name)
-                if num:
-                    display_name = cut_end(display_name,
-                                        '/in_', '/out_')
-                    if num == '1':
-                        port.last_digit_to_add = '1'
-                    else:
-                        display_name += ' ' + num
-
-            case 'Non-Mixer'|'Non-Mixer-XT':
-                display_name, num = split_end_digits(display_name)
-                if num:
-                    display_name = cut_end(display_name, '/in-', '/out-')
-
-                    if num == '1':
-                        port.last_digit_to_add = '1'
-                    else:
-                        display_name += ' ' + num
-
-            case 'jack_mixer':
-                prefix, out, side = display_name.rpartition(' Out')
-                if out and side in (' L', ' R', ''):
-                    display_name = prefix + side
-
-            case 'SooperLooper'|'sooperlooper':
-                display_name, num = split_end_digits(display_name)
-                if num:
-                    display_name = cut_end(display_name,
-                                        '_in_', '_out_')
-                    if num == '1':
-                        port.last_digit_to_add = '1'
-                    else:
-                        display_name += ' ' + num
-
-            case 'Luppp':
-                if display_name.endswith('\n'):
-                    display_name = display_name[:-1]
-
-                display_name = display_name.replace('_', ' ')
-
-            case 'seq64':
-                display_name = display_name.replace('seq64 midi ', '', 1)
+        graceful_name, last_digit = graceful_port_name(
+            program_name, port.short_name,
+            port.full_name.startswith('Midi-Bridge'))
 
-            case 'seq192':
-                display_name = display_name.replace('seq192 ', '', 1)
-
-            case 'calfjackhost':
-                display_name, num = split_end_digits(display_name)
-                if num:
-                    display_name = cut_end(display_name,
-                                        ' Out #', ' In #')
-
-                    display_name += " " + num
-
-            case 'rakarrack-plus':
-                if display_name.startswith(
-                        ('rakarrack-plus ', 'rakarrack-plus.')):
-                    display_name = display_name[15:]
-                display_name = display_name.replace('_', ' ')
-
-            case 'Zrythm':
-                if '/' in display_name:
-                    if display_name.endswith((' L', ' R')):
-                        display_name = (
-                            display_name.rpartition('/')[0]
-                            + ' ' + display_name.rpartition(' ')[2])
-                    else:
-                        display_name = display_name.rpartition('/')[0]
-
-            case _:
-                display_name = display_name.replace('_', ' ')
-                match display_name.lower():
-                    case s if s.endswith(('-left', ' left')):
-                        display_name = display_name[:-5] + ' L'
-                    case s if s.endswith(('-right', ' right')):
-                        display_name = display_name[:-6] + ' R'
-                    case 'left in':
-                        display_name = 'In L'
-                    case 'right in':
-                        display_name = 'In R'
-                    case 'left out':
-                        display_name = 'Out L'
-                    case 'right out':
-                        display_name = 'Out R'
-
-                if display_name.startswith('Audio'):
-                    display_name = display_name.replace('Audio ', '')
-
-        # reduce graceful name for pipewire Midi-Bridge with
-        # option jack.filter_name = true
-        if (port.full_name.startswith('Midi-Bridge')
-                and display_name.startswith(('capture_', 'playback_'))):
-            display_name = display_name.partition('_')[2]
-
-        port.graceful_name = display_name if display_name else s_display_name
+        port.graceful_name = graceful_name
+        if last_digit:
+            port.last_digit_to_add = last_digit
 
     def add_portgroup(self, portgroup: Portgroup):
-        for track in self.tracks:
-            if (len([p for p in portgroup.ports if p in track.ports])
-                    == len(portgroup.ports)):
-                track.portgroups.append(portgroup)
-                if track.is_active:
-                    portgroup.track_id = track.group_id
-                break
-        
+        # a port is in one track at most,
+        # only the track of the first port can contain all ports.
+        track = portgroup.ports[0].track if portgroup.ports else None
+        if (track is not None
+                and all(p in track.ports for p in portgroup.ports)):
+            track.portgroups.append(portgroup)
+            if track.is_active:
+                portgroup.track_id = track.group_id
+
         self.portgroups.append(portgroup)
 
     def change_port_types_view(self):
@@ -999,16 +835,128 @@ class Group:
             if track.is_active:
                 track.add_to_canvas()
 
+    def _free_ports_indexes(
+            self) -> dict[tuple[PortType, PortMode, str], list[int]]:
+        '''indexes in self.ports of ports without portgroup,
+        by type, mode and short name, in reverse order.'''
+        free_ports = dict[tuple[PortType, PortMode, str], list[int]]()
+        for i in range(len(self.ports) - 1, -1, -1):
+            port = self.ports[i]
+            if port.portgroup is None:
+                free_ports.setdefault(
+                    (port.type, port.mode, port.short_name), []).append(i)
+        return free_ports
+
+    def _add_portgroups_from_memory(
+            self, above_metadatas: bool,
+            free_ports: dict[tuple[PortType, PortMode, str], list[int]]):
+        '''add portgroups remembered for this group, when their ports
+        are consecutive and without portgroup.'''
+        for port_type, ptype_dict in self.manager.portgroups_memory.items():
+            gp_dict = ptype_dict.get(self.name)
+            if gp_dict is None:
+                continue
+
+            for port_mode, pg_mem_list in gp_dict.items():
+                for portgroup_mem in pg_mem_list:
+                    if bool(portgroup_mem.above_metadatas) != above_metadatas:
+                        continue
+
+                    port_names = portgroup_mem.port_names
+                    if not port_names:
+                        continue
+
+                    indexes = free_ports.get(
+                        (port_type, port_mode, port_names[0]))
+                    if not indexes:
+                        continue
+
+                    # forget ports which got a portgroup since free_ports
+                    # has been built.
+                    while (indexes
+                            and self.ports[indexes[-1]].portgroup is not None):
+                        indexes.pop()
+                    if not indexes:
+                        continue
+
+                    start = indexes[-1]
+                    founded_ports = self.ports[start:start + len(port_names)]
+                    if len(founded_ports) < len(port_names):
+                        continue
+
+                    for port, port_name in zip(founded_ports, port_names):
+                        if not (port.portgroup is None
+                                and port.type is port_type
+                                and port.mode is port_mode
+                                and port.short_name == port_name):
+                            break
+                    else:
+                        new_portgroup = self.manager.new_portgroup(
+                            self.group_id, port_mode, founded_ports)
+                        self.add_portgroup(new_portgroup)
+
+    def _portgroup_is_still_valid(
+            self, portgroup: Portgroup, port_indexes: dict[Port, int]) -> bool:
+        '''check that portgroup ports are still consecutive
+        and that metadatas do not change the portgroup.'''
+        start = port_indexes.get(portgroup.ports[0])
+        if start is None:
+            return False
+
+        search_index = 0
+        previous_port = self.ports[start - 1] if start else None
+        seems_ok = False
+
+        for port in self.ports[start:]:
+            if not seems_ok and port is portgroup.ports[search_index]:
+                if (port.mdata_portgroup != portgroup.mdata_portgroup
+                        and not portgroup.above_metadatas):
+                    return False
+
+                if (not portgroup.above_metadatas and not search_index
+                        and previous_port is not None
+                        and previous_port.mdata_portgroup
+                        and previous_port.mdata_portgroup == port.mdata_portgroup):
+                    # previous port had the same portgroup metadata
+                    # that this port. we need to remove this portgroup.
+                    return False
+
+                search_index += 1
+                if search_index == len(portgroup.ports):
+                    # all ports of portgroup are consecutive
+                    # but still exists the risk that metadatas says
+                    # that the portgroup has now more ports
+                    seems_ok = True
+                    if (portgroup.above_metadatas
+                            or not portgroup.mdata_portgroup):
+                        return True
+
+            else:
+                if (seems_ok
+                        and ((previous_port is not None
+                                and port.mdata_portgroup
+                                    != previous_port.mdata_portgroup)
+                             or port.type is not portgroup.type
+                             or port.mode is not portgroup.port_mode)):
+                    # port after the portgroup has not to make
+                    # the portgroup higher. We keep this portgroup
+                    return True
+
+                # this port breaks portgroup ports consecutivity.
+                # note that ports have been just sorted by type and mode
+                # so no risk that this port is falsely breaking portgroup
+                return False
+
+            previous_port = port
+
+        return seems_ok
+
     def sort_ports_in_canvas(self):
         conn_list = list[Connection]()
 
         with CanvasOptimizeIt(self.manager, auto_redraw=True):
             if not self.manager.very_fast_operation:
-                for conn in self.manager.connections:
-                    for port in self.ports:
-                        if (port in (conn.port_out, conn.port_in)
-                                and conn not in conn_list):
-                            conn_list.append(conn)
+                conn_list = list(self.manager.connections.with_group(self))
 
                 for connection in conn_list:
                     connection.remove_from_canvas()
@@ -1020,97 +968,20 @@ class Group:
                     port.remove_from_canvas()
 
             self.ports.sort()
+            port_indexes = {port: i for i, port in enumerate(self.ports)}
 
             # search and remove existing portgroups with non consecutive ports
-            portgroups_to_remove = list[Portgroup]()
-
-            for portgroup in self.portgroups:
-                search_index = 0
-                previous_port = None
-                seems_ok = False
-
-                for port in self.ports:
-                    if not seems_ok and port is portgroup.ports[search_index]:
-                        if (port.mdata_portgroup != portgroup.mdata_portgroup
-                                and not portgroup.above_metadatas):
-                            portgroups_to_remove.append(portgroup)
-                            break
-
-                        if (not portgroup.above_metadatas and not search_index
-                                and previous_port is not None
-                                and previous_port.mdata_portgroup
-                                and previous_port.mdata_portgroup == port.mdata_portgroup):
-                            # previous port had the same portgroup metadata
-                            # that this port. we need to remove this portgroup.
-                            portgroups_to_remove.append(portgroup)
-                            break
-
-                        search_index += 1
-                        if search_index == len(portgroup.ports):
-                            # all ports of portgroup are consecutive
-                            # but still exists the risk that metadatas says
-                            # that the portgroup has now more ports
-                            seems_ok = True
-                            if (portgroup.above_metadatas
-                                    or not portgroup.mdata_portgroup):
-                                break
-
-                    elif search_index:
-                        if (seems_ok
-                                and ((previous_port is not None
-                                        and port.mdata_portgroup
-                                            != previous_port.mdata_portgroup)
-                                     or port.type is not portgroup.type
-                                     or port.mode is not portgroup.port_mode)):
-                            # port after the portgroup has not to make
-                            # the portgroup higher. We keep this portgroup
-                            break
-
-                        # this port breaks portgroup ports consecutivity.
-                        # note that ports have been just sorted by type and mode
-                        # so no risk that this port is falsely breaking portgroup
-                        portgroups_to_remove.append(portgroup)
-                        break
-
-                    previous_port = port
-                else:
-                    if not seems_ok:
-                        portgroups_to_remove.append(portgroup)
+            portgroups_to_remove = [
+                pg for pg in self.portgroups
+                if not self._portgroup_is_still_valid(pg, port_indexes)]
 
             for portgroup in portgroups_to_remove:
                 self.remove_portgroup(portgroup)
 
-            # add missing portgroups aboving metadatas from portgroup memory
-            for port_type in self.manager.portgroups_memory.keys():
-                ptype_dict = self.manager.portgroups_memory[port_type]
-                gp_dict = ptype_dict.get(self.name)
-                if gp_dict is None:
-                    continue
-
-                for port_mode in gp_dict.keys():
-                    pg_mem_list = gp_dict[port_mode]
-
-                    for portgroup_mem in pg_mem_list:
-                        if not portgroup_mem.above_metadatas:
-                            continue
-
-                        founded_ports = list[Port]()
-
-                        for port in self.ports:
-                            if (port.portgroup is None
-                                    and port.type is port_type
-                                    and port.mode is port_mode
-                                    and port.short_name
-                                        == portgroup_mem.port_names[len(founded_ports)]):
-                                founded_ports.append(port)
-                                if len(founded_ports) == len(portgroup_mem.port_names):
-                                    new_portgroup = self.manager.new_portgroup(
-                                        self.group_id, port.mode, founded_ports)
-                                    self.add_portgroup(new_portgroup)
-                                    break
+            free_ports = self._free_ports_indexes()
 
-                            elif founded_ports:
-                                break
+            # add missing portgroups aboving metadatas from portgroup memory
+            self._add_portgroups_from_memory(True, free_ports)
 
             # detect and add portgroups given from metadatas
             portgroups_mdata = list[dict]() # list of dicts
@@ -1144,36 +1015,7 @@ class Group:
                 self.add_portgroup(new_portgroup)
 
             # add missing portgroups from portgroup memory
-            for port_type in self.manager.portgroups_memory.keys():
-                ptype_dict = self.manager.portgroups_memory[port_type]
-                gp_dict = ptype_dict.get(self.name)
-                if gp_dict is None:
-                    continue
-
-                for port_mode in gp_dict.keys():
-                    pg_mem_list = gp_dict[port_mode]
-
-                    for portgroup_mem in pg_mem_list:
-                        if portgroup_mem.above_metadatas:
-                            continue
-
-                        founded_ports = list[Port]()
-
-                        for port in self.ports:
-                            if (port.portgroup is None
-                                    and port.type is port_type
-                                    and port.mode is port_mode
-                                    and port.short_name
-                                        == portgroup_mem.port_names[len(founded_ports)]):
-                                founded_ports.append(port)
-                                if len(founded_ports) == len(portgroup_mem.port_names):
-                                    new_portgroup = self.manager.new_portgroup(
-                                        self.group_id, port.mode, founded_ports)
-                                    self.add_portgroup(new_portgroup)
-                                    break
-
-                            elif founded_ports:
-                                break
+            self._add_portgroups_from_memory(False, free_ports)
 
             if not self.manager.very_fast_operation:
                 # ok for re-adding all items to canvas
@@ -1278,6 +1120,7 @@ class Track(Group):
         elif port.mode is PortMode.INPUT:
             self.ins_ptv |= ptv
         self.ports.append(port)
+        self.manager._ports_by_ids[(self.group_id, port.port_id)] = port
         
     def _get_box_type_and_icon(self) -> tuple[BoxType, str]:
         box_type, icon_name = self.parent_group._get_box_type_and_icon()
@@ -12,15 +12,18 @@ if TYPE_CHECKING:
 
 
 class Port:
-    graceful_name = ''
+    __slots__ = (
+        'manager', 'port_id', '_full_name', 'type', 'flags', 'uuid',
+        'subtype', 'mode', 'group', 'track', 'portgroup', 'graceful_name',
+        'prevent_stereo', 'last_digit_to_add', 'in_canvas', 'order',
+        'conns_hidden_in_canvas',
+        '_short_name', '_full_name_id_free', '_alsa_client_id', '_mdatas')
+
     group: 'Group'
     track: 'Track | None'
     portgroup: 'Portgroup | None'
-    prevent_stereo = False
-    last_digit_to_add = ''
-    in_canvas = False
-    order: Optional[int] = None
-    uuid = 0
+    order: Optional[int]
+    uuid: int
     'contains the real JACK uuid'
 
     def __init__(self, manager: 'PatchbayManager', port_id: int, name: str,
@@ -34,6 +37,19 @@ class Port:
         self.subtype = PortSubType.REGULAR
         self.portgroup = None
         self.track = None
+        self.graceful_name = ''
+        self.prevent_stereo = False
+        self.last_digit_to_add = ''
+        self.in_canvas = False
+        self.order = None
+        self._mdatas: Optional[tuple[str, str, str]] = None
+
+        if flags & JackPortFlag.IS_OUTPUT:
+            self.mode = PortMode.OUTPUT
+        elif flags & JackPortFlag.IS_INPUT:
+            self.mode = PortMode.INPUT
+        else:
+            self.mode = PortMode.NULL
 
         match port_type:
             case PortType.AUDIO_JACK:
@@ -49,6 +65,18 @@ class Port:
     def __repr__(self) -> str:
         return f"Port({self.full_name})"
 
+    @property
+    def full_name(self) -> str:
+        return self._full_name
+
+    @full_name.setter
+    def full_name(self, full_name: str):
+        self._full_name = full_name
+        # names derived from full_name are computed again when needed
+        self._short_name: Optional[str] = None
+        self._full_name_id_free: Optional[str] = None
+        self._alsa_client_id: Optional[int] = None
+
     @property
     def group_id(self) -> int:
         if self.track is not None and self.track.is_active:
@@ -61,20 +89,17 @@ class Port:
             return 0
         return self.portgroup.portgroup_id
 
-    @property
-    def mode(self) -> PortMode:
-        if self.flags & JackPortFlag.IS_OUTPUT:
-            return PortMode.OUTPUT
-        if self.flags & JackPortFlag.IS_INPUT:
-            return PortMode.INPUT
-        return PortMode.NULL
-
     @property
     def full_type(self) -> tuple[PortType, PortSubType]:
         return (self.type, self.subtype)
 
     @property
     def short_name(self) -> str:
+        if self._short_name is None:
+            self._short_name = self._get_short_name()
+        return self._short_name
+
+    def _get_short_name(self) -> str:
         if (self.type is PortType.MIDI_ALSA
                 and self.full_name.startswith((':ALSA_IN:', ':ALSA_OUT:'))):
             return ':'.join(self.full_name.split(':')[5:])
@@ -117,25 +142,36 @@ class Port:
 
         return self.short_name
 
+    def metadata_changed(self):
+        '''Has to be called when JACK metadatas of this port change.'''
+        self._mdatas = None
+
+    def _get_mdatas(self) -> tuple[str, str, str]:
+        '''pretty name, portgroup and signal type metadatas'''
+        if self._mdatas is None:
+            if not self.uuid:
+                self._mdatas = ('', '', '')
+            else:
+                jack_metadatas = self.manager.jack_metadatas
+                self._mdatas = (
+                    jack_metadatas.pretty_name(self.uuid),
+                    jack_metadatas.str_for_key(
+                        self.uuid, JackMetadata.PORT_GROUP),
+                    jack_metadatas.str_for_key(
+                        self.uuid, JackMetadata.SIGNAL_TYPE))
+        return self._mdatas
+
     @property
     def mdata_pretty_name(self) -> str:
-        if not self.uuid:
-            return ''
-        return self.manager.jack_metadatas.pretty_name(self.uuid)
+        return self._get_mdatas()[0]
 
     @property
     def mdata_portgroup(self) -> str:
-        if not self.uuid:
-            return ''
-        return self.manager.jack_metadatas.str_for_key(
-            self.uuid, JackMetadata.PORT_GROUP)
+        return self._get_mdatas()[1]
 
     @property
     def mdata_signal_type(self) -> str:
-        if not self.uuid:
-            return ''
-        return self.manager.jack_metadatas.str_for_key(
-            self.uuid, JackMetadata.SIGNAL_TYPE)
+        return self._get_mdatas()[2]
 
     @property
     def custom_name(self) -> str:
@@ -144,6 +180,11 @@ class Port:
 
     @property
     def alsa_client_id(self) -> int:
+        if self._alsa_client_id is None:
+            self._alsa_client_id = self._get_alsa_client_id()
+        return self._alsa_client_id
+
+    def _get_alsa_client_id(self) -> int:
         if self.type is not PortType.MIDI_ALSA:
             return -1
         splitted_name = self.full_name.split(':')
@@ -157,10 +198,13 @@ class Port:
     @property
     def full_name_id_free(self) -> str:
         'full_name without alsa client or port id, useful for pretty_names'
-        if self.type is PortType.MIDI_ALSA:
-            names = self.full_name.split(':')
-            return ':'.join(names[0:2] + names[4:])
-        return self.full_name
+        if self._full_name_id_free is None:
+            if self.type is PortType.MIDI_ALSA:
+                names = self.full_name.split(':')
+                self._full_name_id_free = ':'.join(names[0:2] + names[4:])
+            else:
+                self._full_name_id_free = self.full_name
+        return self._full_name_id_free
 
     def set_cv_from_metadata(self, signal_type: str):
         if self.type is not PortType.AUDIO_JACK:
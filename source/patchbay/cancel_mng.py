@@ -2,7 +2,8 @@ from enum import Enum, auto
 import logging
 from typing import TYPE_CHECKING, Callable, Optional
 
-from patshared import ViewData, ViewsDictEnsureOne, PortTypesViewFlag
+from patshared import (
+    GroupPos, ViewData, ViewsDict, ViewsDictEnsureOne, PortTypesViewFlag)
 
 if TYPE_CHECKING:
     from patchbay_manager import PatchbayManager
@@ -28,6 +29,149 @@ class CancelOp(Enum):
     'save all the views, without group positions'
 
 
+_ViewState = tuple[str, PortTypesViewFlag, bool]
+_GposKey = tuple[int, PortTypesViewFlag, str]
+
+
+def _view_state(view_data: Optional[ViewData]) -> Optional[_ViewState]:
+    if view_data is None:
+        return None
+    return (view_data.name, view_data.default_port_types_view,
+            view_data.is_white_list)
+
+def _gpos_state(gpos: Optional[GroupPos]) -> Optional[tuple]:
+    if gpos is None:
+        return None
+    return (gpos.flags, gpos.hidden_sides, gpos.fully_set,
+            gpos.has_sure_existence, gpos.auto_split_tracks,
+            frozenset(gpos.joined_tracks),
+            tuple((pm, b.pos, b.zone, b.layout_mode, b.flags)
+                  for pm, b in gpos.boxes.items()),
+            tuple((tn, _gpos_state(tp)) for tn, tp in gpos.tracks.items()))
+
+
+class ViewsDelta:
+    '''Reversible changes of the views made by one action.
+    Only the views properties and the GroupPos which changed are stored,
+    each one with its state before and after the action
+    (None if absent).'''
+    def __init__(self):
+        self.views = dict[
+            int, tuple[Optional[_ViewState], Optional[_ViewState]]]()
+        self.ptvs = dict[tuple[int, PortTypesViewFlag], tuple[bool, bool]]()
+        self.gposes = dict[
+            _GposKey, tuple[Optional[GroupPos], Optional[GroupPos]]]()
+
+    def __len__(self) -> int:
+        return len(self.views) + len(self.ptvs) + len(self.gposes)
+
+    @staticmethod
+    def from_views(bef: dict[int, ViewData], aft: dict[int, ViewData],
+                   with_positions=True) -> 'ViewsDelta':
+        '''compare `bef` views, a copy made at action start, and `aft`,
+        the current views. GroupPos of `bef` are kept by the delta,
+        GroupPos of `aft` are copied.'''
+        delta = ViewsDelta()
+
+        for view_num in bef.keys() | aft.keys():
+            vd_bef = bef.get(view_num)
+            vd_aft = aft.get(view_num)
+
+            if not with_positions:
+                # as ViewsDict.eat_views_dict_datas,
+                # views are not created or removed.
+                if vd_bef is None or vd_aft is None:
+                    continue
+
+            state_bef, state_aft = _view_state(vd_bef), _view_state(vd_aft)
+            if state_bef != state_aft:
+                delta.views[view_num] = (state_bef, state_aft)
+
+            if not with_positions:
+                continue
+
+            ptvs_bef = vd_bef.ptvs if vd_bef is not None else {}
+            ptvs_aft = vd_aft.ptvs if vd_aft is not None else {}
+
+            for ptv in ptvs_bef.keys() | ptvs_aft.keys():
+                ptv_bef = ptvs_bef.get(ptv)
+                ptv_aft = ptvs_aft.get(ptv)
+                if (ptv_bef is None) is not (ptv_aft is None):
+                    delta.ptvs[(view_num, ptv)] = (
+                        ptv_bef is not None, ptv_aft is not None)
+
+                if ptv_bef is None:
+                    ptv_bef = {}
+                if ptv_aft is None:
+                    ptv_aft = {}
+
+                for gp_name in ptv_bef.keys() | ptv_aft.keys():
+                    gpos_bef = ptv_bef.get(gp_name)
+                    gpos_aft = ptv_aft.get(gp_name)
+                    if _gpos_state(gpos_bef) == _gpos_state(gpos_aft):
+                        continue
+
+                    delta.gposes[(view_num, ptv, gp_name)] = (
+                        gpos_bef,
+                        gpos_aft.copy() if gpos_aft is not None else None)
+
+        return delta
+
+    def apply(self, views: ViewsDict, forward: bool):
+        '''set the changed parts of `views` to their state
+        after the action if `forward`, before the action otherwise.'''
+        side = 1 if forward else 0
+        views_added = False
+
+        for view_num, states in self.views.items():
+            state = states[side]
+            if state is None:
+                continue
+
+            view_data = views.get(view_num)
+            if view_data is None:
+                view_data = views[view_num] = ViewData(state[1])
+                views_added = True
+
+            (view_data.name, view_data.default_port_types_view,
+             view_data.is_white_list) = state
+
+        for (view_num, ptv), exists in self.ptvs.items():
+            view_data = views.get(view_num)
+            if exists[side] and view_data is not None:
+                view_data.ptvs.setdefault(ptv, dict[str, GroupPos]())
+
+        for (view_num, ptv, gp_name), gposes in self.gposes.items():
+            view_data = views.get(view_num)
+            if view_data is None:
+                continue
+
+            gpos = gposes[side]
+            ptv_dict = view_data.ptvs.get(ptv)
+
+            if gpos is None:
+                if ptv_dict is not None:
+                    ptv_dict.pop(gp_name, None)
+                continue
+
+            if ptv_dict is None:
+                ptv_dict = view_data.ptvs[ptv] = dict[str, GroupPos]()
+            ptv_dict[gp_name] = gpos.copy()
+
+        for (view_num, ptv), exists in self.ptvs.items():
+            view_data = views.get(view_num)
+            if not exists[side] and view_data is not None:
+                view_data.ptvs.pop(ptv, None)
+
+        for view_num, states in self.views.items():
+            if states[side] is None:
+                views.pop(view_num, None)
+
+        if views_added:
+            for view_num in sorted(views.keys()):
+                views[view_num] = views.pop(view_num)
+
+
 class ActionRestorer:
     def __init__(self, op_type: CancelOp):
         self.type = op_type
@@ -35,12 +179,14 @@ class ActionRestorer:
 
         self.view_num_bef = 1
         self.view_num_aft = 1
-        self.view_data_bef: Optional[ViewData] = None
-        self.view_data_aft: Optional[ViewData] = None
-        self.views_bef : Optional[ViewsDictEnsureOne] = None
-        self.views_aft: Optional[ViewsDictEnsureOne] = None
         self.ptv_bef: Optional[PortTypesViewFlag] = None
         self.ptv_aft: Optional[PortTypesViewFlag] = None
+        self.delta: Optional[ViewsDelta] = None
+
+        # copies of the views at action start,
+        # dropped once the delta is computed.
+        self.view_data_bef: Optional[ViewData] = None
+        self.views_bef : Optional[ViewsDictEnsureOne] = None
 
         self.undo_func: Optional[Callable] = None
         self.undo_args: tuple = ()
@@ -68,6 +214,13 @@ class CancelMng:
         self.actions = list[ActionRestorer]()
         self.canceled_acts = list[ActionRestorer]()
 
+        self.max_actions = 500
+        'oldest actions are forgotten when there are more actions'
+
+        self.max_stored_changes = 100_000
+        '''oldest actions are forgotten when the sum of stored changes
+        (views and GroupPos) in all actions is greater'''
+
         self.new_pos_created = False
         '''In VIEW_CHOICE action, GroupPos can be be created in a view
         , in this case, cancel_mng considers finally this action
@@ -118,7 +271,7 @@ class CancelMng:
                 if self.new_pos_created:
                     action.type = CancelOp.ALL_VIEWS
                 else:
-                    action.view_data_bef = None
+                    action.views_bef = None
 
             case CancelOp.PTV_CHOICE:
                 if self.new_pos_created:
@@ -132,16 +285,54 @@ class CancelMng:
 
         match action.type:
             case CancelOp.VIEW:
-                action.view_data_aft = self.mng.view().copy()
+                if action.view_data_bef is not None:
+                    view_num = action.view_num_bef
+                    views_aft = dict[int, ViewData]()
+                    view_data_aft = self.mng.views.get(view_num)
+                    if view_data_aft is not None:
+                        views_aft[view_num] = view_data_aft
+                    action.delta = ViewsDelta.from_views(
+                        {view_num: action.view_data_bef}, views_aft)
 
             case CancelOp.ALL_VIEWS:
-                action.views_aft = self.mng.views.copy()
+                if action.views_bef is not None:
+                    action.delta = ViewsDelta.from_views(
+                        action.views_bef, self.mng.views)
 
             case CancelOp.ALL_VIEWS_NO_POS:
-                action.views_aft = self.mng.views.copy(with_positions=False)
+                if action.views_bef is not None:
+                    action.delta = ViewsDelta.from_views(
+                        action.views_bef, self.mng.views,
+                        with_positions=False)
 
+        action.view_data_bef = None
+        action.views_bef = None
+
+        self._forget_oldest_actions()
         self.mng.sg.undo_redo_changed.emit()
 
+    def _forget_oldest_actions(self):
+        n_changes = sum(
+            len(a.delta) for a in self.actions if a.delta is not None)
+
+        while self.actions and (
+                len(self.actions) > self.max_actions
+                or (n_changes > self.max_stored_changes
+                    and len(self.actions) > 1)):
+            action = self.actions.pop(0)
+            if action.delta is not None:
+                n_changes -= len(action.delta)
+
+    def _apply_delta(self, action: ActionRestorer, forward: bool):
+        if action.delta is None:
+            _logger.error(f"action {action.name} has no delta")
+            return
+
+        action.delta.apply(self.mng.views, forward)
+        self.mng.set_views_changed()
+        self.mng.change_view(
+            action.view_num_aft if forward else action.view_num_bef)
+
     def undo(self):
         if not self.actions:
             return
@@ -162,29 +353,9 @@ class CancelMng:
             case CancelOp.VIEW_CHOICE:
                 self.mng.change_view(action.view_num_bef)
 
-            case CancelOp.VIEW:
-                if action.view_data_bef is None:
-                    _logger.error(f"action {action.name} has no view_data_bef")
-                    return
-                self.mng.views[action.view_num_bef] = action.view_data_bef.copy()
-                self.mng.set_views_changed()
-                self.mng.change_view(action.view_num_bef)
-
-            case CancelOp.ALL_VIEWS:
-                if action.views_bef is None:
-                    _logger.error(f"action {action.name} has no views_bef")
-                    return
-                self.mng.views = action.views_bef.copy()
-                self.mng.set_views_changed()
-                self.mng.change_view(action.view_num_bef)
-
-            case CancelOp.ALL_VIEWS_NO_POS:
-                if action.views_bef is None:
-                    _logger.error(f"action {action.name} has no views_bef")
-                    return
-                self.mng.views.eat_views_dict_datas(action.views_bef)
-                self.mng.set_views_changed()
-                self.mng.change_view(action.view_num_bef)
+            case CancelOp.VIEW | CancelOp.ALL_VIEWS | \
+                    CancelOp.ALL_VIEWS_NO_POS:
+                self._apply_delta(action, forward=False)
 
         self.mng.sg.undo_redo_changed.emit()
 
@@ -198,30 +369,19 @@ class CancelMng:
         if action.redo_func is not None:
             action.redo_func(*action.redo_args)
 
-        if action.type is CancelOp.VIEW_CHOICE:
-            self.mng.change_view(action.view_num_aft)
-
-        elif action.type is CancelOp.PTV_CHOICE:
-            if action.ptv_aft is None:
-                _logger.error(f"action {action.name} has no ptv_aft")
-                return
-            self.mng.change_port_types_view(action.ptv_aft)
-
-        elif action.type is CancelOp.VIEW:
-            if action.view_data_aft is None:
-                _logger.error(f"action {action.name} has no ptv_aft")
-                return
-            self.mng.views[action.view_num_aft] = action.view_data_aft.copy()
-            self.mng.set_views_changed()
-            self.mng.change_view(action.view_num_aft)
-
-        elif action.type is CancelOp.ALL_VIEWS:
-            if action.views_aft is None:
-                _logger.error(f"action {action.name} has no ptv_aft")
-                return
-            self.mng.views = action.views_aft.copy()
-            self.mng.set_views_changed()
-            self.mng.change_view(action.view_num_aft)
+        match action.type:
+            case CancelOp.PTV_CHOICE:
+                if action.ptv_aft is None:
+                    _logger.error(f"action {action.name} has no ptv_aft")
+                    return
+                self.mng.change_port_types_view(action.ptv_aft)
+
+            case CancelOp.VIEW_CHOICE:
+                self.mng.change_view(action.view_num_aft)
+
+            case CancelOp.VIEW | CancelOp.ALL_VIEWS | \
+                    CancelOp.ALL_VIEWS_NO_POS:
+                self._apply_delta(action, forward=True)
 
         self.mng.sg.undo_redo_changed.emit()
 
@@ -229,4 +389,3 @@ class CancelMng:
         self.actions.clear()
         self.canceled_acts.clear()
         self.mng.sg.undo_redo_changed.emit()
-
@@ -70,7 +70,7 @@ def set_group_uuid_from_name(
 
     group = mng.get_group_from_name(client_name)
     if group is not None:
-        group.uuid = uuid
+        mng._set_group_uuid(group, uuid)
 
 @later_by_batch(draw_group=True)
 def add_port(mng: 'PatchbayManager', name: str, port_type: PortType,
@@ -302,6 +302,15 @@ def metadata_update(
     # first store metadata
     mng.jack_metadatas.add(uuid, key, value)
 
+    if uuid:
+        port = mng.get_port_from_uuid(uuid)
+        if port is not None:
+            port.metadata_changed()
+    else:
+        for group in mng.groups:
+            for port in group.ports:
+                port.metadata_changed()
+
     if not uuid:
         # all JACK metadatas removed
         mng.pretty_diff_checker.full_update()
@@ -316,9 +325,9 @@ def metadata_update(
                 port.rename_in_canvas()
                 return port.group_id
 
-            for group in mng.groups:
-                if group.uuid == uuid:
-                    return group.group_id
+            group = mng.get_group_from_uuid(uuid)
+            if group is not None:
+                return group.group_id
 
         case JackMetadata.ORDER:
             port = mng.get_port_from_uuid(uuid)
@@ -343,10 +352,10 @@ def metadata_update(
                 port.rename_in_canvas()
                 return port.group_id
 
-            for group in mng.groups:
-                if group.uuid == uuid:
-                    group.rename_in_canvas()
-                    return group.group_id
+            group = mng.get_group_from_uuid(uuid)
+            if group is not None:
+                group.rename_in_canvas()
+                return group.group_id
 
         case JackMetadata.PORT_GROUP:
             port = mng.get_port_from_uuid(uuid)
@@ -356,10 +365,10 @@ def metadata_update(
             return port.group_id
 
         case JackMetadata.ICON_NAME:
-            for group in mng.groups:
-                if group.uuid == uuid:
-                    group.set_client_icon(value, from_metadata=True)
-                    return group.group_id
+            group = mng.get_group_from_uuid(uuid)
+            if group is not None:
+                group.set_client_icon(value, from_metadata=True)
+                return group.group_id
 
         case JackMetadata.SIGNAL_TYPE:
             port = mng.get_port_from_uuid(uuid)
@@ -69,8 +69,11 @@ class PatchbayManager:
     connections = Connections()
     _groups_by_name = dict[str, Group]()
     _groups_by_id = dict[int, Group]()
+    _groups_by_uuid = dict[int, Group]()
     _ports_by_name = dict[str, Port]()
     _ports_by_uuid = dict[int, Port]()
+    _ports_by_ids = dict[tuple[int, int], Port]()
+    'ports from (group_id, port_id), group_id may be a track id'
 
     view_number = 1
     views = ViewsDictEnsureOne()
@@ -265,12 +268,34 @@ class PatchbayManager:
         self.groups.append(group)
         self._groups_by_id[group.group_id] = group
         self._groups_by_name[group.name] = group
+        if group.uuid:
+            self._groups_by_uuid.setdefault(group.uuid, group)
 
     def _remove_group(self, group: Group):
         if group in self.groups:
             self.groups.remove(group)
             self._groups_by_id.pop(group.group_id)
             self._groups_by_name.pop(group.name)
+            self._unindex_group_uuid(group)
+
+    def _unindex_group_uuid(self, group: Group):
+        '''remove group from the uuid index, another group
+        with the same uuid (should be rare) takes its place.'''
+        if self._groups_by_uuid.get(group.uuid) is not group:
+            return
+
+        self._groups_by_uuid.pop(group.uuid)
+        for other in self.groups:
+            if other is not group and other.uuid == group.uuid:
+                self._groups_by_uuid[group.uuid] = other
+                break
+
+    def _set_group_uuid(self, group: Group, uuid: int):
+        self._unindex_group_uuid(group)
+
+        group.uuid = uuid
+        if uuid and group in self.groups:
+            self._groups_by_uuid.setdefault(uuid, group)
 
     def new_portgroup(self, group_id: int, port_mode: PortMode,
                       ports: tuple[Port, ...] | list[Port]) -> Portgroup:
@@ -375,6 +400,9 @@ class PatchbayManager:
     def get_group_from_id(self, group_id: int) -> Group | None:
         return self._groups_by_id.get(group_id)
 
+    def get_group_from_uuid(self, uuid: int) -> Group | None:
+        return self._groups_by_uuid.get(uuid)
+
     def get_port_from_name(self, port_name: str) -> Port | None:
         return self._ports_by_name.get(port_name)
 
@@ -382,11 +410,7 @@ class PatchbayManager:
         return self._ports_by_uuid.get(uuid)
 
     def get_port_from_id(self, group_id: int, port_id: int) -> Port | None:
-        group = self.get_group_from_id(group_id)
-        if group is not None:
-            for port in group.ports:
-                if port.port_id == port_id:
-                    return port
+        return self._ports_by_ids.get((group_id, port_id))
 
     def save_group_position(self, gpos: GroupPos):
         'reimplement this to save a group position elsewhere'
@@ -483,8 +507,10 @@ class PatchbayManager:
         self.groups.clear()
         self._groups_by_id.clear()
         self._groups_by_name.clear()
+        self._groups_by_uuid.clear()
         self._ports_by_name.clear()
         self._ports_by_uuid.clear()
+        self._ports_by_ids.clear()
 
         self._next_group_id = 0
         self._next_port_id = 0
@@ -1,25 +1,63 @@
 import logging
-from typing import TypeVar
-
-
-class LogStr:
-    func_args = ''
+from typing import Any, TypeVar
 
 
 _logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+
+def _format_call(
+        func_name: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    args_strs = [str(arg) for arg in args]
+    args_strs += [f"{k}={v}" for k, v in kwargs.items()]
+    return f"{func_name}({', '.join(args_strs)})"
+
+
+class ApiCall:
+    '''One logged API call, arguments are stringified
+    only if a log handler formats the record.
+    Handlers can read func_name, args and kwargs from the record args.'''
+    __slots__ = ('func_name', 'args', 'kwargs')
+
+    def __init__(self, func_name: str,
+                 args: tuple[Any, ...], kwargs: dict[str, Any]):
+        self.func_name = func_name
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return _format_call(self.func_name, self.args, self.kwargs)
+
+
+class _LastApiCall:
+    def __str__(self) -> str:
+        return _format_call(*LogStr.last_call)
+
+
+class LogStr:
+    last_call: tuple[str, tuple[Any, ...], dict[str, Any]] = ('', (), {})
+    'func name, args and kwargs of the last API call'
+
+    func_args = _LastApiCall()
+    '''string of the last API call, formatted only when used
+    in f-strings of error messages'''
+
+
 def patchbay_api(func: T) -> T:
     '''decorator for API callable functions.
     It makes debug logs and also a global logging string
-    usable directly in the functions'''
+    usable directly in the functions.
 
-    def wrapper(*args, **kwargs):
-        args_strs = [str(arg) for arg in args]
-        args_strs += [f"{k}={v}" for k, v in kwargs.items()]
+    Arguments are never stringified if debug logs are disabled.'''
+    func_name: str = func.__name__ # type:ignore
 
-        LogStr.func_args = f"{func.__name__}({', '.join(args_strs)})" # type:ignore
-        _logger.debug(LogStr.func_args)
+    def wrapper(*args, **kwargs):
+        LogStr.last_call = (func_name, args, kwargs)
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug('%s', ApiCall(func_name, args, kwargs))
         return func(*args, **kwargs) # type:ignore
+
+    wrapper.__name__ = func_name
+    wrapper.__doc__ = func.__doc__
     return wrapper # type:ignore
@@ -8,7 +8,7 @@ from qtpy.QtWidgets import QGraphicsItem
 from patshared import (
     BoxLayoutMode, PortMode, PortType, PortSubType, BoxType)
 
-from ..init_values import canvas, options, InlineDisplay
+from ..init_values import canvas, options, InlineDisplay, PortObject
 from ..utils import get_portgroup_name_from_ports_names
 
 from .box_layout import PortsMinSizes, TitleOn, BoxLayout
@@ -147,9 +147,28 @@ def split_in_two(string: str, n_lines: int) -> list[str]:
     return_list.append(string[last_index:])
     return polished_list(return_list)
 
-def _get_portgroup_name(box: 'BoxWidget', portgrp_id: int):
-    return get_portgroup_name_from_ports_names(
-        [p.port_name for p in box._port_list if p.portgrp_id == portgrp_id])
+def _ports_by_type_and_sub(box: 'BoxWidget') -> list[
+        tuple[tuple[PortType, PortSubType], list[PortObject]]]:
+    '''box ports sorted in one pass, for each PortType and PortSubType
+    couple in list_port_types_and_subs order (empty lists included).'''
+    by_type_and_sub = {type_and_sub: list[PortObject]()
+                       for type_and_sub in list_port_types_and_subs()}
+
+    for port in box._port_list:
+        ports = by_type_and_sub.get((port.port_type, port.port_subtype))
+        if ports is not None:
+            ports.append(port)
+
+    return list(by_type_and_sub.items())
+
+def _get_portgroups_names(box: 'BoxWidget') -> dict[int, str]:
+    ports_names = dict[int, list[str]]()
+    for port in box._port_list:
+        if port.portgrp_id:
+            ports_names.setdefault(port.portgrp_id, []).append(port.port_name)
+
+    return {portgrp_id: get_portgroup_name_from_ports_names(names)
+            for portgrp_id, names in ports_names.items()}
 
 def _should_align_port_types(box: 'BoxWidget') -> bool:
     '''check if we can align port types
@@ -159,18 +178,16 @@ def _should_align_port_types(box: 'BoxWidget') -> bool:
 
     port_types_aligner = list[tuple[int, int]]()
 
-    for port_type, port_subtype in list_port_types_and_subs():
+    for type_and_sub, ports in _ports_by_type_and_sub(box):
         n_ins = 0
         n_outs = 0
 
-        for port in box._port_list:
-            if (port.port_type is port_type
-                    and port.port_subtype is port_subtype):
-                match port.port_mode:
-                    case PortMode.INPUT:
-                        n_ins += 1
-                    case PortMode.OUTPUT:
-                        n_outs += 1
+        for port in ports:
+            match port.port_mode:
+                case PortMode.INPUT:
+                    n_ins += 1
+                case PortMode.OUTPUT:
+                    n_outs += 1
 
         port_types_aligner.append((n_ins, n_outs))
 
@@ -188,8 +205,33 @@ def _should_align_port_types(box: 'BoxWidget') -> bool:
 
     return True
 
+def _ports_min_sizes_key(box: 'BoxWidget', align_port_types: bool) -> tuple:
+    '''everything the ports min sizes depend on.
+    Widgets are part of the key because their print names are set
+    while computing the min sizes.'''
+    return (
+        canvas.theme,
+        options.max_port_width,
+        align_port_types,
+        box._current_port_mode,
+        tuple((port.widget, port.port_name, port.port_type,
+               port.port_subtype, port.port_mode, port.portgrp_id,
+               port.pg_pos, port.pg_len) for port in box._port_list),
+        tuple(portgrp.widget for portgrp in box._portgrp_list))
+
 def _get_ports_min_sizes(
         box: 'BoxWidget', align_port_types: bool) -> PortsMinSizes:
+    key = _ports_min_sizes_key(box, align_port_types)
+    if (box._ports_min_sizes_memo is not None
+            and box._ports_min_sizes_memo[0] == key):
+        return box._ports_min_sizes_memo[1]
+
+    ports_min_sizes = _calculate_ports_min_sizes(box, align_port_types)
+    box._ports_min_sizes_memo = (key, ports_min_sizes)
+    return ports_min_sizes
+
+def _calculate_ports_min_sizes(
+        box: 'BoxWidget', align_port_types: bool) -> PortsMinSizes:
     max_in_width = max_out_width = 0.0
 
     thm = box.get_theme()
@@ -201,15 +243,16 @@ def _get_ports_min_sizes(
     n_out_type_and_subs = 0
     last_port_mode = PortMode.NULL
 
-    for port_type, port_subtype in list_port_types_and_subs():
-        for port in box._port_list:
-            if (port.port_type is not port_type
-                    or port.port_subtype is not port_subtype):
-                continue
+    ports_by_type_and_sub = _ports_by_type_and_sub(box)
+    portgrps_names = _get_portgroups_names(box)
+    max_pwidth = options.max_port_width
+    port_height = canvas.theme.port_height
+    port_grouped_width = canvas.theme.port_grouped_width
 
+    for type_and_sub, ports in ports_by_type_and_sub:
+        for port in ports:
             last_of_portgrp = bool(port.pg_pos + 1 == port.pg_len)
             size = 0
-            max_pwidth = options.max_port_width
 
             if port.port_mode is PortMode.INPUT:
                 port_offset = thm.port_in_offset
@@ -218,17 +261,16 @@ def _get_ports_min_sizes(
 
             if port.portgrp_id:
                 portgrp = canvas.get_portgroup(box._group_id, port.portgrp_id)
-                if port.pg_pos == 0:
-                    portgrp_name = _get_portgroup_name(box, port.portgrp_id)
+                portgrp_name = portgrps_names[port.portgrp_id]
 
+                if port.pg_pos == 0:
                     if portgrp is not None and portgrp.widget is not None:
                         portgrp.widget.set_print_name(
                             portgrp_name,
-                            max_pwidth - canvas.theme.port_grouped_width - 5)
+                            max_pwidth - port_grouped_width - 5)
 
                 port.widget.set_print_name(
-                    port.port_name.replace(
-                        _get_portgroup_name(box, port.portgrp_id), '', 1),
+                    port.port_name.replace(portgrp_name, '', 1),
                     int(max_pwidth / 2))
 
                 if portgrp is None or portgrp.widget is None:
@@ -236,24 +278,23 @@ def _get_ports_min_sizes(
                                     'no portgrp or no portgrp.widget')
                     continue
 
+                port_text_width = port.widget.get_text_width()
+
                 if (portgrp.widget.get_text_width() + 5
-                        > max_pwidth - port.widget.get_text_width()):
+                        > max_pwidth - port_text_width):
                     portgrp.widget.reduce_print_name(
-                        max_pwidth - int(port.widget.get_text_width()) - 5)
+                        max_pwidth - int(port_text_width) - 5)
 
                 # the port_grouped_width is also used to define
                 # the portgroup minimum width
                 size = (max(portgrp.widget.get_text_width() + 6.0,
-                            canvas.theme.port_grouped_width)
-                        + max(port.widget.get_text_width() + 6.0,
-                                canvas.theme.port_grouped_width)
+                            port_grouped_width)
+                        + max(port_text_width + 6.0, port_grouped_width)
                         + port_offset)
             else:
                 port.widget.set_print_name(port.port_name, max_pwidth)
                 size = max(port.widget.get_text_width() + 6.0 + port_offset, 20.0)
 
-            type_and_sub = (port.port_type, port.port_subtype)
-
             if port.port_mode is PortMode.INPUT:
                 max_in_width = max(max_in_width, size)
                 if type_and_sub != last_in_type_and_sub:
@@ -263,7 +304,7 @@ def _get_ports_min_sizes(
                     last_in_type_and_sub = type_and_sub
                     n_in_type_and_subs += 1
 
-                last_in_pos += canvas.theme.port_height
+                last_in_pos += port_height
                 if last_of_portgrp:
                     last_in_pos += thm.port_spacing
 
@@ -277,7 +318,7 @@ def _get_ports_min_sizes(
                     last_out_type_and_sub = type_and_sub
                     n_out_type_and_subs += 1
 
-                last_out_pos += canvas.theme.port_height
+                last_out_pos += port_height
                 if last_of_portgrp:
                     last_out_pos += thm.port_spacing
 
@@ -298,22 +339,18 @@ def _get_ports_min_sizes(
     n_inout_types_and_sub = 0
 
     if box.current_port_mode is PortMode.BOTH:
-        for port_type, port_subtype in list_port_types_and_subs():
-            for port in box._port_list:
-                if (port.port_type is not port_type
-                        or port.port_subtype is not port_subtype):
-                    continue
-
-                if (port.port_type, port.port_subtype) != last_type_and_sub:
+        for type_and_sub, ports in ports_by_type_and_sub:
+            for port in ports:
+                if type_and_sub != last_type_and_sub:
                     if last_type_and_sub != (PortType.NULL, PortSubType.REGULAR):
                         last_inout_pos += thm.port_type_spacing
-                    last_type_and_sub = (port.port_type, port.port_subtype)
+                    last_type_and_sub = type_and_sub
                     n_inout_types_and_sub += 1
 
                 if port.pg_pos:
                     continue
 
-                last_inout_pos += port.pg_len * canvas.theme.port_height
+                last_inout_pos += port.pg_len * port_height
                 last_inout_pos += thm.port_spacing
 
                 last_port_mode = port.port_mode
@@ -322,8 +359,8 @@ def _get_ports_min_sizes(
         final_last_in_pos,
         final_last_out_pos,
         last_inout_pos,
-        max_in_width + canvas.theme.port_height / 2.0,
-        max_out_width + canvas.theme.port_height / 2.0,
+        max_in_width + port_height / 2.0,
+        max_out_width + port_height / 2.0,
         n_in_type_and_subs,
         n_out_type_and_subs,
         n_inout_types_and_sub,
@@ -1112,6 +1149,7 @@ def update_positions(
         # update_positions will be called when animation is finished
         return
 
+    canvas.placeholder_boxes.pop(box, None)
     box.prepareGeometryChange()
 
     if (box._wrapping_state
@@ -1275,6 +1313,34 @@ def get_dummy_rect(box: 'BoxWidget') -> QRectF:
     return QRectF(-hwr, -hwr,
                     box_layout.full_width, box_layout.full_height)
 
+def set_placeholder(box: 'BoxWidget'):
+    '''Give to the box its size, but not its ports positions, painter
+    paths and connections positions, the box is not painted
+    until update_positions is called.
+    Used for boxes out of the view with options.lazy_boxes.'''
+    rect = get_dummy_rect(box)
+
+    if options.auto_hide_groups and not box._port_list:
+        box.setVisible(False)
+        return
+
+    box.setVisible(True)
+
+    if box.is_hardware:
+        hwr = float(canvas.theme.hardware_rack_width)
+    else:
+        hwr = 0.0
+
+    box.prepareGeometryChange()
+    box._width = rect.width() - 2 * hwr
+    box._height = rect.height() - 2 * hwr
+    # paint nothing until update_positions
+    box._layout = None
+    box._alter_layout = None
+    # update_positions is needed at the end of a move animation
+    box.update_positions_pending = True
+    canvas.placeholder_boxes[box] = None
+
 def get_layout(box: 'BoxWidget',
                layout_mode: BoxLayoutMode | None =None) -> BoxLayout:
     if box._layout is None:
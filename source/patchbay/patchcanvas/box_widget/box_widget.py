@@ -43,7 +43,7 @@ from ..theme import UslStyleAttributer
 
 from . import box_painters, box_positions
 from .box_hidder import BoxHidder
-from .box_layout import BoxLayout
+from .box_layout import BoxLayout, PortsMinSizes
 from .box_shadow import BoxWidgetShadow
 from .box_utils import (
     BoxStyler, PaintElement, TitleLine, UnwrapButton, WrappingState)
@@ -115,6 +115,8 @@ class BoxWidget(QGraphicsItem):
 
         self._port_list = list[PortObject]()
         self._portgrp_list = list[PortgrpObject]()
+        self._ports_min_sizes_memo: \
+            Optional[tuple[tuple, PortsMinSizes]] = None
 
         # Icon
         match group.box_type:
@@ -404,6 +406,9 @@ class BoxWidget(QGraphicsItem):
                          in (WrappingState.WRAPPED, WrappingState.WRAPPING)):
             return
 
+        # wrap animation needs the box sizes
+        self.draw_if_placeholder()
+
         if yesno:
             self.hide_ports_for_wrap(True)
 
@@ -491,6 +496,13 @@ class BoxWidget(QGraphicsItem):
     def get_dummy_rect(self) -> QRectF:
         return box_positions.get_dummy_rect(self)
 
+    def set_placeholder(self):
+        box_positions.set_placeholder(self)
+
+    def draw_if_placeholder(self):
+        if self in canvas.placeholder_boxes:
+            self.update_positions(scene_checks=False)
+
     def get_layout(self,
                    layout_mode: BoxLayoutMode | None =None) -> BoxLayout:
         return box_positions.get_layout(self, layout_mode)
@@ -160,6 +160,29 @@ class GroupedLinesWidget(QGraphicsPathItem):
             GroupedLinesWidget.connections_changed(*gp_outin)
         _groups_to_check.clear()
 
+    @staticmethod
+    def all_connections_changed():
+        '''update the lines widgets of all pairs of existing groups
+        with connections or lines widgets between them,
+        and of all pairs prepared for changes.'''
+        gp_outins = set[tuple[int, int]]()
+        for gp_outin in canvas.list_connected_group_pairs():
+            gp_outins.add(gp_outin)
+
+        for gp_outin in _all_lines_widgets.keys():
+            if gp_outin in gp_outins:
+                continue
+            group_out_id, group_in_id = gp_outin
+            if (canvas.get_group(group_out_id) is not None
+                    and canvas.get_group(group_in_id) is not None):
+                gp_outins.add(gp_outin)
+
+        gp_outins |= _groups_to_check
+        _groups_to_check.clear()
+
+        for gp_outin in gp_outins:
+            GroupedLinesWidget.connections_changed(*gp_outin)
+
     @staticmethod
     def connections_changed(group_out_id: int, group_in_id: int):
         gp_dict = _all_lines_widgets.get((group_out_id, group_in_id))
@@ -218,6 +241,10 @@ class GroupedLinesWidget(QGraphicsPathItem):
             for attr_to_del in attrs_to_del:
                 pt_dict.__delitem__(attr_to_del)
 
+        if not any(gp_dict.values()):
+            # no more lines between these groups
+            _all_lines_widgets.pop((group_out_id, group_in_id), None)
+
     @staticmethod
     def port_removed(port: PortObject):
         if port.port_mode is PortMode.OUTPUT:
@@ -17,7 +17,7 @@
 #
 # For a full copy of the GNU General Public License see the doc/GPL.txt file.
 
-from typing import TYPE_CHECKING, Iterator, Optional, Callable
+from typing import TYPE_CHECKING, Iterator, KeysView, Optional, Callable
 from enum import Enum, Flag, IntEnum, auto
 import logging
 
@@ -180,6 +180,7 @@ class CanvasOptionsObject:
     box_grouped_auto_layout_ratio = 1.0
     cell_width = 16
     cell_height = 12
+    lazy_boxes = False
 
     def set_from_settings(self, settings: QSettings):
         for key, value in CanvasOptionsObject.__dict__.items():
@@ -377,7 +378,7 @@ class Canvas:
         self.group_list = list[GroupObject]()
 
         self._groups_dict = dict[int, GroupObject]()
-        self._all_boxes = list['BoxWidget']()
+        self._all_boxes = dict['BoxWidget', None]()
         self._ports_dict = dict[int, dict[int, PortObject]]()
         self._portgrps_dict = dict[int, dict[int, PortgrpObject]]()
         self._conns_dict = dict[int, ConnectionObject]()
@@ -388,6 +389,9 @@ class Canvas:
 
         self.groups_to_redraw_in = set[int]()
         self.groups_to_redraw_out = set[int]()
+        self.placeholder_boxes = dict['BoxWidget', None]()
+        '''boxes out of the view when all boxes were redrawn, with
+        options.lazy_boxes. They have their size but are not drawn yet.'''
 
         self.clipboard = list[ClipboardElement]()
         self.clipboard_cut = True
@@ -448,6 +452,7 @@ class Canvas:
         self.group_list.clear()
         self._groups_dict.clear()
         self._all_boxes.clear()
+        self.placeholder_boxes.clear()
         self._ports_dict.clear()
         self._portgrps_dict.clear()
         self._conns_dict.clear()
@@ -463,14 +468,14 @@ class Canvas:
         self.group_list.append(group)
         self._groups_dict[group.group_id] = group
         for widget in group.widgets:
-            self._all_boxes.append(widget)
+            self._all_boxes[widget] = None
 
     def add_box(self, box: 'BoxWidget'):
-        self._all_boxes.append(box)
+        self._all_boxes[box] = None
 
     def remove_box(self, box: 'BoxWidget'):
-        if box in self._all_boxes:
-            self._all_boxes.remove(box)
+        self._all_boxes.pop(box, None)
+        self.placeholder_boxes.pop(box, None)
 
     def add_port(self, port: PortObject):
         gp_dict = self._ports_dict.get(port.group_id)
@@ -521,8 +526,8 @@ class Canvas:
             self._groups_dict.pop(group.group_id)
 
         for widget in group.widgets:
-            if widget in self._all_boxes:
-                self._all_boxes.remove(widget)
+            self._all_boxes.pop(widget, None)
+            self.placeholder_boxes.pop(widget, None)
 
         if self._qobject is not None:
             self._qobject.rm_group_to_join(group.group_id)
@@ -544,12 +549,23 @@ class Canvas:
     def remove_connection(self, conn: ConnectionObject):
         try:
             self._conns_dict.pop(conn.connection_id)
-            self._conns_outin_dict[conn.group_out_id][conn.group_in_id].pop(
-                conn.connection_id)
-            self._conns_inout_dict[conn.group_in_id][conn.group_out_id].pop(
-                conn.connection_id)
+            gp_outin_out_dict = self._conns_outin_dict[conn.group_out_id]
+            gp_outin_out_dict[conn.group_in_id].pop(conn.connection_id)
+            gp_inout_in_dict = self._conns_inout_dict[conn.group_in_id]
+            gp_inout_in_dict[conn.group_out_id].pop(conn.connection_id)
         except:
-            pass
+            return
+
+        # keep only pairs of connected groups in adjacency dicts
+        if not gp_outin_out_dict[conn.group_in_id]:
+            del gp_outin_out_dict[conn.group_in_id]
+            if not gp_outin_out_dict:
+                del self._conns_outin_dict[conn.group_out_id]
+
+        if not gp_inout_in_dict[conn.group_out_id]:
+            del gp_inout_in_dict[conn.group_out_id]
+            if not gp_inout_in_dict:
+                del self._conns_inout_dict[conn.group_in_id]
 
     def get_group(self, group_id: int) -> Optional[GroupObject]:
         return self._groups_dict.get(group_id)
@@ -571,8 +587,16 @@ class Canvas:
         if connection_id in self._conns_dict.keys():
             return self._conns_dict[connection_id]
 
-    def list_boxes(self) -> list['BoxWidget']:
-        return self._all_boxes
+    def list_connected_group_pairs(self) -> Iterator[tuple[int, int]]:
+        '''yield (group_out_id, group_in_id) for each pair of groups
+        with at least one connection from group_out to group_in.'''
+        for group_out_id, gp_outin in self._conns_outin_dict.items():
+            for group_in_id, conns in gp_outin.items():
+                if conns:
+                    yield (group_out_id, group_in_id)
+
+    def list_boxes(self) -> KeysView['BoxWidget']:
+        return self._all_boxes.keys()
 
     def list_ports(
             self, group_id: Optional[int]=None) -> Iterator[PortObject]:
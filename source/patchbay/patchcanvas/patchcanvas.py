@@ -110,6 +110,33 @@ def init(view: PatchGraphicsView, callbacker: ProtoCallbacker,
 
     canvas._scene.zoom_reset()
 
+def _lazy_rect() -> QRectF | None:
+    '''scene rect out of which boxes are not drawn yet,
+    None if all boxes have to be drawn.'''
+    if not options.lazy_boxes:
+        return None
+    return canvas.scene.visible_rect()
+
+def _draw_box(box: BoxWidget, lazy_rect: QRectF | None,
+              without_connections=False):
+    '''draw the box, or only set it as placeholder
+    if it is out of lazy_rect.'''
+    # the current box rect is checked first, it is not exact
+    # but costs nothing, the placeholder has the exact size.
+    if (lazy_rect is not None
+            and not box.sceneBoundingRect().intersects(lazy_rect)):
+        box.set_placeholder()
+        if (not box.isVisible()
+                or not box.sceneBoundingRect().intersects(lazy_rect)):
+            return
+
+    box.update_positions(
+        without_connections=without_connections, scene_checks=False)
+
+def _draw_placeholders():
+    for box in list(canvas.placeholder_boxes):
+        box.update_positions(scene_checks=False)
+
 @patchbay_api
 def set_loading_items(yesno: bool, auto_redraw=False, prevent_overlap=True):
     '''while canvas is loading items (groups or ports, connections...)
@@ -123,6 +150,7 @@ def set_loading_items(yesno: bool, auto_redraw=False, prevent_overlap=True):
     if not yesno and auto_redraw:
         both_done = set[int]()
         boxes = list[BoxWidget]()
+        lazy_rect = _lazy_rect()
 
         for group_id in canvas.groups_to_redraw_out:
             group = canvas.get_group(group_id)
@@ -132,7 +160,7 @@ def set_loading_items(yesno: bool, auto_redraw=False, prevent_overlap=True):
             for box in group.widgets:
                 port_mode = box.port_mode
                 if port_mode & PortMode.OUTPUT:
-                    box.update_positions(scene_checks=False)
+                    _draw_box(box, lazy_rect)
                     if box.isVisible():
                         boxes.append(box)
 
@@ -150,7 +178,7 @@ def set_loading_items(yesno: bool, auto_redraw=False, prevent_overlap=True):
             for box in group.widgets:
                 port_mode = box.port_mode
                 if port_mode & PortMode.INPUT:
-                    box.update_positions(scene_checks=False)
+                    _draw_box(box, lazy_rect)
                     if box.isVisible():
                         boxes.append(box)
 
@@ -302,16 +330,18 @@ def redraw_all_groups(force_no_prevent_overlap=False, theme_change=False):
     options.elastic = False
     options.prevent_overlap = False
 
-    for box in canvas.list_boxes():
-        box.update_positions(
-            without_connections=True,
-            scene_checks=False,
-            theme_change=theme_change)
+    if theme_change:
+        for box in canvas.list_boxes():
+            box.update_positions(
+                without_connections=True,
+                scene_checks=False,
+                theme_change=True)
+    else:
+        lazy_rect = _lazy_rect()
+        for box in canvas.list_boxes():
+            _draw_box(box, lazy_rect, without_connections=True)
 
-    for group_out in canvas.group_list:
-        for group_in in canvas.group_list:
-            GroupedLinesWidget.connections_changed(
-                group_out.group_id, group_in.group_id)
+    GroupedLinesWidget.all_connections_changed()
 
     if elastic:
         canvas.scene.set_elastic(True)
@@ -1036,6 +1066,7 @@ def get_box_true_layout(group_id: int, port_mode: PortMode) -> BoxLayoutMode:
 
     for box in group.widgets:
         if box.port_mode is port_mode:
+            box.draw_if_placeholder()
             return box.current_layout_mode
 
     return BoxLayoutMode.AUTO
@@ -1077,10 +1108,12 @@ def set_optional_gui_state(group_id: int, visible: bool):
 
 @patchbay_api
 def arrange_follow_signal():
+    _draw_placeholders()
     arranger.arrange_follow_signal()
     
 @patchbay_api
 def arrange_face_to_face():
+    _draw_placeholders()
     arranger.arrange_face_to_face()
 
 @patchbay_api
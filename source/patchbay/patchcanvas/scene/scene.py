@@ -133,6 +133,19 @@ class PatchScene(QGraphicsScene):
         self._borders_nav_timer = QTimer()
         self._borders_nav_timer.setInterval(50)
         self._borders_nav_timer.timeout.connect(self._cursor_view_navigation)
+
+        # placeholder boxes entering the view are drawn
+        # after a scroll, a zoom or a view resize.
+        self._placeholders_timer = QTimer()
+        self._placeholders_timer.setSingleShot(True)
+        self._placeholders_timer.setInterval(0)
+        self._placeholders_timer.timeout.connect(
+            self.draw_visible_placeholders)
+        self.scale_changed.connect(self.schedule_placeholders_draw)
+        self._view.horizontalScrollBar().valueChanged.connect(
+            self.schedule_placeholders_draw)
+        self._view.verticalScrollBar().valueChanged.connect(
+            self.schedule_placeholders_draw)
         self._last_view_cpos = QPointF()
         self._allowed_nav_directions = set[Direction]()
 
@@ -153,19 +166,17 @@ class PatchScene(QGraphicsScene):
 
         self._grid_widget: Optional[GridWidget] = None
 
-        self._full_repulse_boxes = set[BoxWidget]()
-
         self.sceneRectChanged.connect(self.update_grid_widget)
         # self.selectionChanged.connect(self._slot_selection_changed)
 
     def deplace_boxes_from_repulsers(
             self, repulser_boxes: list[BoxWidget],
             wanted_direction=Direction.NONE,
-            mov_repulsables: list[MovingBox] | None =None):
+            repulsables: 'scene_repulse.Repulsables | None' =None):
         '''Change the place of boxes in order to have no
         box overlapping other boxes.'''
         scene_repulse.deplace_boxes_from_repulsers(
-            self, repulser_boxes, wanted_direction, mov_repulsables)
+            self, repulser_boxes, wanted_direction, repulsables)
 
     def full_repulse(self):
         scene_repulse.full_repulse(self)
@@ -368,6 +379,28 @@ class PatchScene(QGraphicsScene):
         self._view.setVerticalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAsNeeded)
 
+    def visible_rect(self) -> QRectF:
+        'scene rect visible in the view'
+        return self._view.mapToScene(
+            self._view.viewport().rect()).boundingRect()
+
+    def schedule_placeholders_draw(self, *args):
+        '''draw placeholder boxes entering the view once back in the
+        event loop, not during a view change or paint.'''
+        if canvas.placeholder_boxes:
+            self._placeholders_timer.start()
+
+    def draw_visible_placeholders(self):
+        '''draw placeholder boxes (see options.lazy_boxes)
+        which are now in the view.'''
+        if canvas.loading_items or not canvas.placeholder_boxes:
+            return
+
+        visible_rect = self.visible_rect()
+        for box in list(canvas.placeholder_boxes):
+            if box.sceneBoundingRect().intersects(visible_rect):
+                box.update_positions(scene_checks=False)
+
     def list_boxes_at(self, rect: QRectF) -> list[BoxWidget]:
         return [item for item in self.items(rect)
                 if isinstance(item, BoxWidget)]
@@ -10,7 +10,7 @@ from ..box_widget import BoxWidget
 from ..init_values import canvas, options, Direction, BoxHidding
 from .. import grid
 
-from .scene_utils import MovingBox
+from .scene_utils import MovingBox, RectsIndex
 
 if TYPE_CHECKING:
     from . import PatchScene
@@ -148,18 +148,64 @@ def _rect_has_to_move_from(
             - left_spacing, - canvas.theme.box_spacing,
             right_spacing, canvas.theme.box_spacing))
 
+class Repulsables:
+    '''Moving boxes not placed yet during a full repulse,
+    indexed by their final rect.'''
+    def __init__(self, moving_boxes: list[MovingBox]):
+        self._moving_boxes = dict[BoxWidget, MovingBox]()
+        self._index = RectsIndex()
+
+        for moving_box in moving_boxes:
+            self._moving_boxes[moving_box.widget] = moving_box
+            self._index.insert(moving_box.widget, moving_box.final_rect)
+
+    def __bool__(self) -> bool:
+        return bool(self._moving_boxes)
+
+    def first(self) -> MovingBox:
+        return next(iter(self._moving_boxes.values()))
+
+    def place(self, box: BoxWidget):
+        '''The final position of this box is now decided,
+        it can not be repulsed anymore.'''
+        self._moving_boxes.pop(box, None)
+        self._index.remove(box)
+
+    def near(self, rect: QRectF) -> list[MovingBox]:
+        '''moving boxes not placed yet with a final rect intersecting rect'''
+        return [self._moving_boxes[b] for b in self._index.intersecting(rect)]
+
+
+def _search_margins() -> QMarginsF:
+    '''margins containing all the zone where a box
+    could have to move from another one'''
+    spacing = max(canvas.theme.box_spacing,
+                  canvas.theme.box_spacing_horizontal)
+    return QMarginsF(spacing, spacing, spacing, spacing)
+
+def _moving_boxes_index(scene: 'PatchScene') -> RectsIndex:
+    '''index boxes already moving with their final rect,
+    joining or hidding boxes (with a null final rect) are not indexed.'''
+    index = RectsIndex()
+    for box, moving_box in scene.move_boxes.items():
+        index.insert(box, moving_box.final_rect)
+    return index
+
 def _get_to_move_boxes_from_repulse_boxes(
         scene: 'PatchScene', pusher_boxes: list[BoxWidget],
-        wanted_direction: Direction) -> \
+        wanted_direction: Direction, moving_index: RectsIndex) -> \
             tuple[list[ToMoveBox], dict[BoxWidget, QRectF]]:
     box_spacing = canvas.theme.box_spacing
     box_spacing_hor = canvas.theme.box_spacing_horizontal
     normal_margins = QMarginsF(
         box_spacing_hor,box_spacing,
         box_spacing_hor, box_spacing)
+    search_margins = _search_margins()
 
     to_move_boxes = list[ToMoveBox]()
+    to_move_set = set[BoxWidget]()
     pushers = dict[BoxWidget, QRectF]()
+    pusher_set = set(pusher_boxes)
     wanted_directions = [wanted_direction]
     
     for pusher_box in pusher_boxes:
@@ -188,8 +234,8 @@ def _get_to_move_boxes_from_repulse_boxes(
             if not isinstance(candidate_box, BoxWidget):
                 continue
 
-            if (candidate_box in pusher_boxes
-                    or candidate_box in [b.box for b in to_move_boxes]
+            if (candidate_box in pusher_set
+                    or candidate_box in to_move_set
                     or candidate_box in scene.move_boxes):
                 continue
 
@@ -202,13 +248,13 @@ def _get_to_move_boxes_from_repulse_boxes(
                 pusheds[candidate_box] = pushed_rect
 
         # search intersections in moving boxes
-        for candidate_box, moving_box in scene.move_boxes.items():
-            if (candidate_box in pusher_boxes
-                    or moving_box.final_rect.isNull()
-                    or candidate_box in [b.box for b in to_move_boxes]):
+        for candidate_box in moving_index.intersecting(
+                pusher_rect.marginsAdded(search_margins)):
+            if (candidate_box in pusher_set
+                    or candidate_box in to_move_set):
                 continue
 
-            pushed_rect = moving_box.final_rect
+            pushed_rect = moving_index.rect(candidate_box)
 
             if _rect_has_to_move_from(
                     pusher_rect, pushed_rect,
@@ -223,12 +269,13 @@ def _get_to_move_boxes_from_repulse_boxes(
             to_move_boxes.append(
                 ToMoveBox([direction], pushed_box, pushed_rect,
                           pusher_box, pusher_rect))
+            to_move_set.add(pushed_box)
 
     to_move_boxes.sort()
     return to_move_boxes, pushers
 
 def _get_to_move_boxes_in_full_repulse(
-        scene: 'PatchScene', mov_repulsables: list[MovingBox]) -> \
+        repulsables: Repulsables) -> \
             tuple[list[ToMoveBox], dict[BoxWidget, QRectF]]:
     box_spacing = canvas.theme.box_spacing
     box_spacing_hor = canvas.theme.box_spacing_horizontal
@@ -236,23 +283,17 @@ def _get_to_move_boxes_in_full_repulse(
         box_spacing_hor, box_spacing,
         box_spacing_hor, box_spacing)
 
-    # in full repulse, the moving box for this box
-    # is the first of the list (optimisation).
-    pusher_box = mov_repulsables[0].widget
-    pusher_rect = mov_repulsables[0].final_rect
-    scene._full_repulse_boxes.add(pusher_box)
+    # in full repulse, the pusher is the first repulsable box
+    pusher_moving_box = repulsables.first()
+    pusher_box = pusher_moving_box.widget
+    pusher_rect = pusher_moving_box.final_rect
+    repulsables.place(pusher_box)
 
     pusheds = dict[BoxWidget, QRectF]()
     to_move_boxes = list[ToMoveBox]()
 
-    for moving_box in mov_repulsables[1:]:
-        if moving_box.widget in [b.box for b in to_move_boxes]:
-            continue
-
-        if not moving_box.final_rect.intersects(
-                pusher_rect.marginsAdded(normal_margins)):
-            continue
-
+    for moving_box in repulsables.near(
+            pusher_rect.marginsAdded(normal_margins)):
         if _rect_has_to_move_from(
                 pusher_rect, moving_box.final_rect,
                 pusher_box.current_port_mode,
@@ -272,26 +313,34 @@ def _get_to_move_boxes_in_full_repulse(
 def deplace_boxes_from_repulsers(
         scene: 'PatchScene', repulser_boxes: list[BoxWidget],
         wanted_direction=Direction.NONE,
-        mov_repulsables: list[MovingBox] | None =None):
+        repulsables: Repulsables | None =None):
     '''Change the place of boxes in order to have no box overlapping
-    other boxes.'''
+    other boxes.
+
+    repulsables is given only by full_repulse, in this case
+    repulser_boxes is ignored, the first repulsable box is the repulser.'''
     if not options.prevent_overlap:
         return
 
     box_spacing = canvas.theme.box_spacing
     box_spacing_hor = canvas.theme.box_spacing_horizontal
 
-    if mov_repulsables is not None:
+    if repulsables is not None:
+        moving_index = None
         to_move_boxes, pushers = _get_to_move_boxes_in_full_repulse(
-            scene, mov_repulsables)
+            repulsables)
     else:
         _logger.debug(f'move boxes from {repulser_boxes}')
+        moving_index = _moving_boxes_index(scene)
         to_move_boxes, pushers = _get_to_move_boxes_from_repulse_boxes(
-            scene, repulser_boxes, wanted_direction)
+            scene, repulser_boxes, wanted_direction, moving_index)
+
+    to_move_set = {b.box for b in to_move_boxes}
 
     normal_margins = QMarginsF(
         box_spacing_hor, box_spacing,
         box_spacing_hor, box_spacing)
+    search_margins = _search_margins()
 
     # !!! to_move_boxes list is dynamic
     # elements can be added to the list while iteration !!!
@@ -345,22 +394,19 @@ def deplace_boxes_from_repulsers(
         # Now we know where the box will be definitely positioned
         # So, this is now a pusher for other boxes
         pushers[box] = pushed_rect
-        scene._full_repulse_boxes.add(box)
 
         # check which existing boxes exists at the new place of the box
         # and add them to this to_move_boxes iteration
         adding_list = list[ToMoveBox]()
 
-        if mov_repulsables is not None:
-            for moving_box in mov_repulsables:
-                mv_box = moving_box.widget
+        if repulsables is not None:
+            repulsables.place(box)
 
-                if (mv_box in pushers
-                        or mv_box in [b.box for b in to_move_boxes]):
-                    continue
+            for moving_box in repulsables.near(
+                    pushed_rect.marginsAdded(normal_margins)):
+                mv_box = moving_box.widget
 
-                if not pushed_rect.intersects(
-                        moving_box.final_rect.marginsAdded(normal_margins)):
+                if mv_box in to_move_set:
                     continue
 
                 if _rect_has_to_move_from(
@@ -370,13 +416,14 @@ def deplace_boxes_from_repulsers(
                     adding_list.append(
                         ToMoveBox(directions, moving_box.widget,
                                   moving_box.final_rect, box, pushed_rect))
-        else:
+
+        elif moving_index is not None:
             search_rect = pushed_rect.marginsAdded(normal_margins)
             for candidate_box in scene.items(search_rect):
                 if not isinstance(candidate_box, BoxWidget):
                     continue
                 if (candidate_box in pushers
-                        or candidate_box in [b.box for b in to_move_boxes]
+                        or candidate_box in to_move_set
                         or candidate_box in scene.move_boxes):
                     continue
 
@@ -389,54 +436,52 @@ def deplace_boxes_from_repulsers(
                         ToMoveBox(directions, candidate_box, candidate_rect,
                                   box, pushed_rect))
 
-            for mv_box, moving_box in scene.move_boxes.items():
-                if (mv_box in pushers
-                        or moving_box.final_rect.isNull()
-                        or mv_box in [b.box for b in to_move_boxes]):
+            for mv_box in moving_index.intersecting(
+                    pushed_rect.marginsAdded(search_margins)):
+                if mv_box in pushers or mv_box in to_move_set:
                     continue
 
+                mv_rect = moving_index.rect(mv_box)
                 if _rect_has_to_move_from(
-                        pushed_rect, moving_box.final_rect,
+                        pushed_rect, mv_rect,
                         to_move_box.box.current_port_mode,
                         mv_box.current_port_mode):
                     adding_list.append(
-                        ToMoveBox(directions, moving_box.widget,
-                                  moving_box.final_rect, box, pushed_rect))
+                        ToMoveBox(directions, mv_box,
+                                  mv_rect, box, pushed_rect))
 
         adding_list.sort()
 
         for to_move_box in adding_list:
             to_move_boxes.append(to_move_box)
+            to_move_set.add(to_move_box.box)
 
         # now we decide where the box is moved
         scene.add_box_to_animation(
             box, int(pushed_rect.left()), int(pushed_rect.top()))
 
+        if moving_index is not None:
+            # box is now moving, keep its final rect in the index
+            moving_index.insert(box, scene.move_boxes[box].final_rect)
+
 def full_repulse(scene: 'PatchScene'):
     if not options.prevent_overlap:
         return
 
-    scene._full_repulse_boxes.clear()
-
     # add all boxes to animation (this optimize the repulse algorythm)
     for box in canvas.list_boxes():
         if box.isVisible() and box not in scene.move_boxes:
             scene.add_box_to_animation(box, *box.top_left())
 
     # Now, all boxes are in self.move_boxes
-    moving_boxes = [mb for b, mb in scene.move_boxes.items()
-                    if (not mb.final_rect.isNull()
-                        and b.isVisible())]
+    repulsables = Repulsables(
+        [mb for b, mb in scene.move_boxes.items()
+         if (not mb.final_rect.isNull()
+             and b.isVisible())])
 
-    while moving_boxes:
+    while repulsables:
         deplace_boxes_from_repulsers(
-            scene, [moving_boxes[0].widget], mov_repulsables=moving_boxes)
-        to_rm_movboxes = [mb for mb in moving_boxes
-                          if mb.widget in scene._full_repulse_boxes]
-        for to_rm_mb in to_rm_movboxes:
-            moving_boxes.remove(to_rm_mb)
-
-    scene._full_repulse_boxes.clear()
+            scene, [repulsables.first().widget], repulsables=repulsables)
 
 def bring_neighbors_and_deplace_boxes(
         scene: 'PatchScene', box_widget: BoxWidget, ex_rect: QRectF):
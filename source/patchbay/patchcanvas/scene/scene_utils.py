@@ -1,3 +1,6 @@
+from math import floor
+from typing import Iterator
+
 from qtpy.QtCore import QPointF, QRectF
 
 from ..box_widget import BoxWidget
@@ -34,3 +37,75 @@ class MovingBox:
     def max_distance(self) -> float:
         return max(abs(self.to_pt.x() - self.from_pt.x()),
                    abs(self.to_pt.y() - self.from_pt.y()))
+
+
+class RectsIndex:
+    '''Spatial index of box rects on a uniform grid.
+    Each rect is registered in all the cells it covers,
+    so finding boxes near a rect only checks boxes of the same cells.'''
+    def __init__(self, cell_size=256.0):
+        self._cell_size = cell_size
+        self._rects = dict[BoxWidget, QRectF]()
+        self._cells = dict[tuple[int, int], set[BoxWidget]]()
+        self._order = dict[BoxWidget, int]()
+        'insertion order, to give results in a deterministic order'
+
+    def __contains__(self, box: BoxWidget) -> bool:
+        return box in self._rects
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def _cells_of(self, rect: QRectF) -> Iterator[tuple[int, int]]:
+        cs = self._cell_size
+        for i in range(floor(rect.left() / cs), floor(rect.right() / cs) + 1):
+            for j in range(floor(rect.top() / cs),
+                           floor(rect.bottom() / cs) + 1):
+                yield (i, j)
+
+    def _unregister(self, box: BoxWidget):
+        rect = self._rects.pop(box, None)
+        if rect is None:
+            return
+
+        for cell in self._cells_of(rect):
+            cell_boxes = self._cells[cell]
+            cell_boxes.discard(box)
+            if not cell_boxes:
+                del self._cells[cell]
+
+    def insert(self, box: BoxWidget, rect: QRectF):
+        '''insert the box with its rect, or update its rect
+        if box is already in the index. Null rects are not indexed.'''
+        self._unregister(box)
+        if box not in self._order:
+            self._order[box] = len(self._order)
+
+        if rect.isNull():
+            return
+
+        self._rects[box] = rect
+        for cell in self._cells_of(rect):
+            cell_boxes = self._cells.get(cell)
+            if cell_boxes is None:
+                cell_boxes = self._cells[cell] = set[BoxWidget]()
+            cell_boxes.add(box)
+
+    def remove(self, box: BoxWidget):
+        self._unregister(box)
+
+    def rect(self, box: BoxWidget) -> QRectF:
+        return self._rects[box]
+
+    def intersecting(self, rect: QRectF) -> list[BoxWidget]:
+        '''returns boxes with a rect intersecting rect,
+        in their insertion order'''
+        boxes = set[BoxWidget]()
+        for cell in self._cells_of(rect):
+            cell_boxes = self._cells.get(cell)
+            if cell_boxes is not None:
+                boxes |= cell_boxes
+
+        return sorted(
+            [b for b in boxes if self._rects[b].intersects(rect)],
+            key=self._order.__getitem__)
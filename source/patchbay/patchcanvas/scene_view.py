@@ -61,6 +61,12 @@ class PatchGraphicsView(QGraphicsView):
         self._panning = False
         self.setDragMode(QGraphicsView.DragMode.NoDrag)
 
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        # boxes not drawn yet may enter the view
+        if canvas.placeholder_boxes:
+            canvas.scene.schedule_placeholders_draw()
+
     def wheelEvent(self, ev: QWheelEvent) -> None:
         if (ev.modifiers() & Qt.KeyboardModifier.ShiftModifier
                 or (not ev.modifiers() & Qt.KeyboardModifier.AltModifier
@@ -452,7 +452,7 @@ class StyleAttributer:
             font_name, font_size, font_width)
 
     @cached_property
-    def _font_metrics_cache(self) -> dict[str, float]:
+    def _font_metrics_cache(self) -> theme_cache.FontMetrics:
         font_name = str(self.get_value_of('font-name'))
         font_size = str(self.get_value_of('font-size'))
         font_width = str(self.get_value_of('font-weight'))
@@ -461,33 +461,36 @@ class StyleAttributer:
             font_name, font_size, font_width)
 
     def get_text_width(self, string: str) -> float:
-        if string in self._font_metrics_cache.keys():
-            return self._font_metrics_cache[string]
+        font_metrics = self._font_metrics_cache
+        tot_size = font_metrics.texts.lookup(string)
+        if tot_size is not None:
+            return tot_size
 
+        letters = font_metrics.letters
         tot_size = 0.0
         for s in string:
-            if s in self._font_metrics_cache.keys():
-                tot_size += self._font_metrics_cache[s]
-            else:
+            letter_size = letters.get(s)
+            if letter_size is None:
                 letter_size = QFontMetricsF(self.font).horizontalAdvance(s)
-                self._font_metrics_cache[s] = letter_size
-                tot_size += letter_size
+                letters[s] = letter_size
+            tot_size += letter_size
 
-        self._font_metrics_cache[string] = tot_size
+        font_metrics.texts.store(string, tot_size)
 
         return tot_size
     
     def save_title_templates(
             self, title: str, icon_size: int, templates: list):
-        if not title in self._titles_templates_cache:
-            self._titles_templates_cache[title] = {}
-
-        self._titles_templates_cache[title][icon_size] = templates
+        title_templates = self._titles_templates_cache.get(title)
+        if title_templates is None:
+            title_templates = {}
+        title_templates[icon_size] = templates
+        self._titles_templates_cache.store(title, title_templates)
 
     def get_title_templates(
             self, title: str, icon_size: int) -> list[dict[str, int]]:
-        if (title in self._titles_templates_cache
-                and icon_size in self._titles_templates_cache[title]):
-            return self._titles_templates_cache[title][icon_size]
+        title_templates = self._titles_templates_cache.lookup(title)
+        if title_templates is not None and icon_size in title_templates:
+            return title_templates[icon_size]
         return []
 
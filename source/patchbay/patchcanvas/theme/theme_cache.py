@@ -1,93 +1,233 @@
 import logging
 import pickle
-from typing import TypeAlias
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Generic, TypeAlias, TypeVar
 
 import xdg
 
 
 _logger = logging.getLogger(__name__)
 
-TitleCache: TypeAlias = dict[str, dict[int, list[dict[str, int]]]]
+_T = TypeVar('_T')
+
+FontKey: TypeAlias = tuple[str, str, str]
+'font name, font size, font weight'
 
 # if for some reason cache may be incompatible with this version
 # of the patchbay, we need to discard the cache files.
-CACHE_VERSION = (1, 4)
+CACHE_VERSION = (1, 5)
+
+CACHE_FILE_NAME = 'patchbay_metrics'
+_LEGACY_FILE_NAMES = ('patchbay_titles', 'patchbay_fonts')
+
+MAX_TEXTS_PER_FONT = 4096
+'max number of whole strings widths kept for one font'
+
+MAX_TITLES_PER_FONT = 1024
+'max number of box titles templates kept for one font'
+
+MAX_FONT_AGE = 90 * 24 * 3600
+'a font not used since this time (in seconds) is dropped from the file'
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    loaded_fonts: int = 0
+    'number of font partitions unpickled since file load'
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset(self):
+        self.hits = self.misses = self.evictions = self.loaded_fonts = 0
+
+
+stats = CacheStats()
+
+
+class LruCache(OrderedDict[str, _T], Generic[_T]):
+    '''str keyed cache, least recently used keys are evicted
+    once max_size is reached.'''
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+
+    def lookup(self, key: str) -> _T | None:
+        value = self.get(key)
+        if value is None:
+            stats.misses += 1
+            return None
+
+        stats.hits += 1
+        self.move_to_end(key)
+        return value
+
+    def store(self, key: str, value: _T):
+        self[key] = value
+        self.move_to_end(key)
+
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+            stats.evictions += 1
+
+
+class FontMetrics:
+    '''text widths for one font. Letters widths are always kept,
+    whole strings widths are kept in a LRU cache.'''
+    def __init__(self):
+        self.letters = dict[str, float]()
+        self.texts = LruCache[float](MAX_TEXTS_PER_FONT)
+
+    def to_state(self) -> tuple[dict[str, float], list[tuple[str, float]]]:
+        return self.letters, list(self.texts.items())
+
+    @staticmethod
+    def from_state(state: tuple) -> 'FontMetrics':
+        letters, texts = state
+        font_metrics = FontMetrics()
+        font_metrics.letters.update(letters)
+        for text, width in texts[-MAX_TEXTS_PER_FONT:]:
+            font_metrics.texts[text] = width
+        return font_metrics
+
+
+TitleCache: TypeAlias = LruCache[dict[int, list[dict[str, int]]]]
+'templates for each icon size for each title'
+
+
+class _Partitions(Generic[_T]):
+    '''per font caches. Partitions read from the cache file are kept
+    pickled until a font needs them.'''
+    def __init__(self):
+        self.loaded = dict[FontKey, _T]()
+        self.pickled = dict[FontKey, tuple[float, bytes]]()
+        self.last_used = dict[FontKey, float]()
+
+    def clear(self):
+        self.loaded.clear()
+        self.pickled.clear()
+        self.last_used.clear()
 
-title_templates_cache: dict[str, dict[str, dict[str, TitleCache]]] = \
-    {'CACHE_VERSION': CACHE_VERSION} # type:ignore
-font_metrics_cache: dict[str, dict[str, dict[str, dict[str, float]]]] = \
-    {'CACHE_VERSION': CACHE_VERSION} # type:ignore
+    def get(self, font_key: FontKey) -> tuple[_T | None, Any]:
+        '''return the loaded partition (or None),
+        and the unpickled state if the partition was pickled.'''
+        self.last_used[font_key] = time.time()
+        partition = self.loaded.get(font_key)
+        if partition is not None:
+            return partition, None
 
+        pickled = self.pickled.pop(font_key, None)
+        if pickled is None:
+            return None, None
+
+        try:
+            state = pickle.loads(pickled[1])
+        except BaseException as e:
+            _logger.warning(f'failed to load cache for font {font_key}, {e}')
+            return None, None
+
+        stats.loaded_fonts += 1
+        return None, state
+
+    def eat_file_data(self, file_data: dict[FontKey, tuple[float, bytes]]):
+        self.clear()
+        self.pickled.update(file_data)
+
+    def file_data(self, to_state) -> dict[FontKey, tuple[float, bytes]]:
+        now = time.time()
+        data = dict[FontKey, tuple[float, bytes]]()
+
+        for font_key, (last_used, pickled) in self.pickled.items():
+            if now - last_used < MAX_FONT_AGE:
+                data[font_key] = (last_used, pickled)
+
+        for font_key, partition in self.loaded.items():
+            data[font_key] = (
+                self.last_used.get(font_key, now),
+                pickle.dumps(to_state(partition)))
+
+        return data
+
+
+_font_metrics = _Partitions[FontMetrics]()
+_title_templates = _Partitions[TitleCache]()
+
+
+def _cache_dir():
+    return xdg.xdg_cache_home() / 'HoustonPatchbay'
 
 def load():
-    cache_file = xdg.xdg_cache_home() / 'HoustonPatchbay' / 'patchbay_titles'
+    '''read the cache file. Font partitions are unpickled
+    only when used.'''
+    cache_file = _cache_dir() / CACHE_FILE_NAME
     if not cache_file.is_file():
         return
 
     with open(cache_file, 'rb') as f:
         try:
-            title_templates_cache_ = pickle.load(f)
-            assert title_templates_cache_['CACHE_VERSION'] == CACHE_VERSION
-            title_templates_cache.clear()
-            title_templates_cache.update(title_templates_cache_)
+            file_data = pickle.load(f)
+            assert file_data['CACHE_VERSION'] == CACHE_VERSION
+            _font_metrics.eat_file_data(file_data['fonts'])
+            _title_templates.eat_file_data(file_data['titles'])
         except:
             _logger.warning(f"failed to load cache {cache_file}")
-            return
-
-    font_cache_file = xdg.xdg_cache_home() / 'HoustonPatchbay' / 'patchbay_fonts'
-    if not font_cache_file.is_file():
-        return
-
-    with open(font_cache_file, 'rb') as f:
-        try:
-            font_metrics_cache_ = pickle.load(f)
-            assert font_metrics_cache_['CACHE_VERSION'] == CACHE_VERSION
-            font_metrics_cache.clear()
-            font_metrics_cache.update(font_metrics_cache_)
-        except:
-            _logger.error(f"failed to load font cache {font_cache_file}")
-            return
 
 def save():
-    cache_dir = xdg.xdg_cache_home() / 'HoustonPatchbay'
+    cache_dir = _cache_dir()
     if not cache_dir.is_dir():
         try:
             cache_dir.mkdir(parents=True, exist_ok=True)
         except:
             return
 
-    with open(cache_dir / 'patchbay_titles', 'wb') as f:
-        pickle.dump(title_templates_cache, f)
+    file_data = {
+        'CACHE_VERSION': CACHE_VERSION,
+        'fonts': _font_metrics.file_data(FontMetrics.to_state),
+        'titles': _title_templates.file_data(
+            lambda title_cache: list(title_cache.items()))}
 
-    with open(cache_dir / 'patchbay_fonts', 'wb') as f:
-        pickle.dump(font_metrics_cache, f)
-        
-def get_font_metrics_cache(
-        font_name: str, font_size: str, font_width: str) -> dict[str, float]:
-    if not font_name in font_metrics_cache.keys():
-        font_metrics_cache[font_name] = \
-            dict[str, dict[str, dict[str, float]]]()
+    with open(cache_dir / CACHE_FILE_NAME, 'wb') as f:
+        pickle.dump(file_data, f)
 
-    if not font_size in font_metrics_cache[font_name].keys():
-        font_metrics_cache[font_name][font_size] = \
-            dict[str, dict[str, float]]()
+    for legacy_file_name in _LEGACY_FILE_NAMES:
+        try:
+            (cache_dir / legacy_file_name).unlink(missing_ok=True)
+        except BaseException as e:
+            _logger.info(f'failed to remove old cache file, {e}')
+
+def get_font_metrics_cache(
+        font_name: str, font_size: str, font_width: str) -> FontMetrics:
+    font_key = (font_name, font_size, font_width)
+    font_metrics, state = _font_metrics.get(font_key)
+    if font_metrics is not None:
+        return font_metrics
 
-    if not font_width in font_metrics_cache[font_name][font_size].keys():
-        font_metrics_cache[font_name][font_size][font_width] = \
-            dict[str, float]()
+    if state is None:
+        font_metrics = FontMetrics()
+    else:
+        font_metrics = FontMetrics.from_state(state)
 
-    return font_metrics_cache[font_name][font_size][font_width]
+    _font_metrics.loaded[font_key] = font_metrics
+    return font_metrics
 
 def get_title_templates_cache(
         font_name: str, font_size: str, font_width: str) -> TitleCache:
-    if not font_name in title_templates_cache.keys():
-        title_templates_cache[font_name] = \
-            dict[str, dict[str, TitleCache]]()
-
-    if not font_size in title_templates_cache[font_name].keys():
-        title_templates_cache[font_name][font_size] = dict[str, TitleCache]()
-
-    if not font_width in title_templates_cache[font_name][font_size].keys():
-        title_templates_cache[font_name][font_size][font_width] = TitleCache()
-
-    return title_templates_cache[font_name][font_size][font_width]
\ No newline at end of file
+    font_key = (font_name, font_size, font_width)
+    title_cache, state = _title_templates.get(font_key)
+    if title_cache is not None:
+        return title_cache
+
+    title_cache = TitleCache(MAX_TITLES_PER_FONT)
+    if state is not None:
+        for title, templates in state[-MAX_TITLES_PER_FONT:]:
+            title_cache[title] = templates
+
+    _title_templates.loaded[font_key] = title_cache
+    return title_cache
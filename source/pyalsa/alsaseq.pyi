@@ -17,6 +17,7 @@ SEQ_USER_CLIENT: AlsaConstant = 1
 SEQ_PORT_SYSTEM_ANNOUNCE: AlsaConstant = 1
 SEQ_EVENT_CLIENT_START: AlsaConstant = 60
 SEQ_EVENT_CLIENT_EXIT: AlsaConstant = 61
+SEQ_EVENT_CLIENT_CHANGE: AlsaConstant = 62
 SEQ_EVENT_PORT_START: AlsaConstant = 63
 SEQ_EVENT_PORT_EXIT: AlsaConstant = 64
 SEQ_EVENT_PORT_SUBSCRIBED: AlsaConstant = 66
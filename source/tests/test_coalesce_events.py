@@ -0,0 +1,51 @@
+import unittest
+
+from patshared import PortType
+from patch_engine.jack_bases import PatchEvent, coalesce_events
+from patch_engine.port_data import PortData
+
+
+IS_INPUT = 0x01
+IS_OUTPUT = 0x02
+
+
+def port_added(name: str, flags=IS_OUTPUT):
+    return (PatchEvent.PORT_ADDED,
+            PortData(name, PortType.AUDIO_JACK, flags, 1))
+
+def port_removed(name: str):
+    return (PatchEvent.PORT_REMOVED, name)
+
+def conn_added(port_out: str, port_in: str):
+    return (PatchEvent.CONNECTION_ADDED, (port_out, port_in))
+
+
+class CoalesceEventsTest(unittest.TestCase):
+    def test_connection_after_readded_port(self):
+        added = port_added('a:out')
+        readded = port_added('a:out')
+        events = [added,
+                  conn_added('a:out', 'b:in'),
+                  port_removed('a:out'),
+                  readded]
+
+        self.assertEqual(coalesce_events(events),
+                         [readded, conn_added('a:out', 'b:in')])
+
+    def test_remove_add_connect(self):
+        events = [port_removed('a:out'),
+                  port_added('a:out'),
+                  conn_added('a:out', 'b:in')]
+
+        self.assertEqual(coalesce_events(events), events)
+
+    def test_port_added_then_removed(self):
+        events = [port_added('a:out'),
+                  conn_added('a:out', 'b:in'),
+                  port_removed('a:out')]
+
+        self.assertEqual(coalesce_events(events), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
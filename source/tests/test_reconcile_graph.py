@@ -0,0 +1,82 @@
+import unittest
+
+from patshared import PortType
+from patch_engine import PatchEngineOuter
+from patch_engine.patch_engine import PatchEngine
+from patch_engine.port_data import PortData
+
+
+IS_INPUT = 0x01
+IS_OUTPUT = 0x02
+
+
+class RecordingOuter(PatchEngineOuter):
+    def __init__(self):
+        self.events = list[tuple]()
+
+    def port_added(self, pname: str, ptype: PortType, pflags: int,
+                   puuid: int):
+        self.events.append(('port_added', pname, puuid))
+
+    def port_removed(self, port_name: str):
+        self.events.append(('port_removed', port_name))
+
+    def connection_added(self, connection: tuple[str, str]):
+        self.events.append(('connection_added', connection))
+
+    def connection_removed(self, connection: tuple[str, str]):
+        self.events.append(('connection_removed', connection))
+
+    def graph_chunk_sent(self):
+        ...
+
+
+class ReconcileGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = PatchEngine('test')
+        self.engine.client = object() # type:ignore
+        self.engine.peo = self.outer = RecordingOuter()
+        self.graph = list[tuple[PortData, list[str] | None]]()
+
+        self.engine._read_ports = lambda: iter(self.graph) # type:ignore
+        self.engine._read_properties = lambda: {} # type:ignore
+        self.engine._read_client_uuid = lambda name: None # type:ignore
+
+    def _set_graph(self, in_uuid: int, in_first=False):
+        out_port = (PortData('a:out', PortType.AUDIO_JACK, IS_OUTPUT, 1),
+                    ['b:in'])
+        in_port = (PortData('b:in', PortType.AUDIO_JACK, IS_INPUT, in_uuid),
+                   None)
+        self.graph = [in_port, out_port] if in_first else [out_port, in_port]
+
+    def _check_recreated_input(self, in_first: bool):
+        self._set_graph(2, in_first)
+        self.engine._reconcile_graph()
+        self.assertEqual(list(self.engine.connections), [('a:out', 'b:in')])
+
+        # b:in re-created with the same name, still connected
+        self._set_graph(3, in_first)
+        self.outer.events.clear()
+        self.engine._reconcile_graph()
+
+        self.assertEqual(list(self.engine.connections), [('a:out', 'b:in')])
+        self.assertEqual(self.engine.ports.from_name('b:in').uuid, 3)
+        self.assertEqual(
+            self.outer.events[-1], ('connection_added', ('a:out', 'b:in')))
+
+    def test_recreated_input_read_last(self):
+        self._check_recreated_input(in_first=False)
+
+    def test_recreated_input_read_first(self):
+        self._check_recreated_input(in_first=True)
+
+    def test_unchanged_graph(self):
+        self._set_graph(2)
+        self.engine._reconcile_graph()
+        self.outer.events.clear()
+        self.engine._reconcile_graph()
+        self.assertEqual(self.outer.events, [])
+
+
+if __name__ == '__main__':
+    unittest.main()